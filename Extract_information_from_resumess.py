@@ -1,98 +1,149 @@
 import os
 import re
-import docx
-import requests
+from itertools import islice
+import metrics
+from resume_loader import load_document
+from file_discovery import stream_resumes
+from url_validator import validate_urls
+from candidate_store import CandidateStore
 
 
-# Extract specific information from text
+# Combined pattern for every field, compiled once. A single finditer pass tries
+# the alternatives left to right at each position. The address alternative is
+# anchored to a line start, cannot cross lines and has comma-free segments, so
+# it cannot backtrack catastrophically on long resumes. It is tried before the
+# name so "Baker Street, London" is read as an address, not a name; names on a
+# consumed address line are recovered with NAME_PATTERN. Names and addresses
+# never span lines.
+RESUME_FIELDS_PATTERN = re.compile(r"""
+    (?<![A-Za-z0-9._%+-])                                 # Only try at token starts
+  (?:
+    (?P<github>https?://(?:www\.)?github\.com/[a-zA-Z0-9_-]+)
+  | (?P<linkedin>https?://(?:www\.)?linkedin\.com/in/[a-zA-Z0-9_-]+)
+  | (?P<email>[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})
+  | (?P<phone>\+\d{1,4}\s?\d{7,14})                      # Supports international phone numbers
+  | ^[ \t]*(?P<address>[A-Za-z0-9][A-Za-z0-9 \t.-]{0,80}(?:,[ \t]*[A-Za-z0-9][A-Za-z0-9 \t.-]{0,40}){1,5})
+  | (?P<name>[A-Z][a-z]+(?:[ \t][A-Z][a-z]+)+)            # Supports multi-word names on one line
+  )
+""", re.VERBOSE | re.MULTILINE)
+NAME_PATTERN = re.compile(r"[A-Z][a-z]+(?:[ \t][A-Z][a-z]+)+")
+
+SINGLE_FIELDS = ("name", "address", "email", "github", "linkedin")
+
+# Extract specific information from text in one scan
 def extract_info(text):
-    # Patterns for extracting data
-    name_pattern = r"([A-Z][a-z]+(?:\s[A-Z][a-z]+)+)"  # Supports multi-word names
-    email_pattern = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
-    phone_pattern = r"(\+\d{1,4}\s?\d{7,14})"  # Supports international phone numbers
-    address_pattern = r"[A-Za-z0-9\s,.-]+(?:,\s[A-Za-z\s]+)+"
-    github_pattern = r"https?://(?:www\.)?github\.com/[a-zA-Z0-9_-]+"
-    linkedin_pattern = r"https?://(?:www\.)?linkedin\.com/in/[a-zA-Z0-9_-]+"
-
-    # Extracting data
-    name = re.search(name_pattern, text)
-    address = re.search(address_pattern, text)
-    phones = re.findall(phone_pattern, text)
-    email = re.search(email_pattern, text)
-    github = re.search(github_pattern, text)
-    linkedin = re.search(linkedin_pattern, text)
+    found = {}
+    phones = []
+    for match in RESUME_FIELDS_PATTERN.finditer(text):
+        field = match.lastgroup
+        if field == "phone":
+            if len(phones) < 2:
+                phones.append(match.group(field))
+        elif field not in found:
+            found[field] = match.group(field)
+
+        # The address consumed its line, so look for the first name inside it too
+        if field == "address" and "name" not in found:
+            name = NAME_PATTERN.search(match.group(field))
+            if name:
+                found["name"] = name.group(0)
+
+        # Stop as soon as every field has been filled
+        if len(found) == len(SINGLE_FIELDS) and len(phones) == 2:
+            break
 
     # Organize extracted data
     primary_phone = phones[0] if len(phones) > 0 else None
     secondary_phone = phones[1] if len(phones) > 1 else None
 
     return {
-        "name": name.group(1) if name else None,
-        "address": address.group(0).strip() if address else None,
+        "name": found.get("name"),
+        "address": found["address"].strip() if "address" in found else None,
         "primary_phone": primary_phone,
         "secondary_phone": secondary_phone,
-        "email": email.group(0) if email else None,
-        "github": github.group(0) if github else None,
-        "linkedin": linkedin.group(0) if linkedin else None,
+        "email": found.get("email"),
+        "github": found.get("github"),
+        "linkedin": found.get("linkedin"),
     }
 
-# Validate URLs
+# Number of resumes whose URLs are validated together in one concurrent round
+VALIDATION_BATCH_SIZE = 200
+
+# Set to a path to also upsert every batch into the SQLite candidate store (see candidate_store.py)
+STORE_PATH = None
+
+# Validate a single URL (shares the validator's TTL cache)
 def validate_url(url):
-    if not url:
-        return "No URL provided"
-    try:
-        response = requests.head(url, timeout=5)
-        if response.status_code == 200:
-            return "Valid"
-        else:
-            return "Invalid"
-    except requests.RequestException:
-        return "Invalid"
+    return validate_urls([url])[url]
+
+# Print the formatted output for one resume
+def print_result(file_path, data, statuses):
+    print(f"File: {file_path}")
+    print(f"Name: {data['name']}")
+    print(f"Address: {data['address']}")
+    print(f"Primary Mobile No: {data['primary_phone']}")
+    print(f"Secondary Mobile No: {data['secondary_phone']}")
+    print(f"Primary Email: {data['email']}")
+    print(f"GitHub: {data['github']} ({statuses[data['github']]})")
+    print(f"LinkedIn: {data['linkedin']} ({statuses[data['linkedin']]})")
+    print('-' * 50)
+
+# Shape one resume's fields like the other scripts' records so the candidate store can index them
+def store_record(file_path, data, statuses):
+    return {
+        "File Name": os.path.basename(file_path),
+        "Name": data['name'],
+        "Email": data['email'],
+        "Phones": [phone for phone in (data['primary_phone'], data['secondary_phone']) if phone],
+        "Address": data['address'],
+        "GitHub": {data['github']: statuses[data['github']]} if data['github'] else {},
+        "LinkedIn": {data['linkedin']: statuses[data['linkedin']]} if data['linkedin'] else {},
+    }
 
 # Process resumes
 def process_resumes(input_path):
     # Check if input is a file or folder
-    if os.path.isfile(input_path):
-        docx_files = [input_path]
-    elif os.path.isdir(input_path):
-        docx_files = [os.path.join(input_path, file) for file in os.listdir(input_path) if file.endswith('.docx')]
-    else:
+    if not (os.path.isfile(input_path) or os.path.isdir(input_path)):
         print("Invalid path provided.")
         return
 
-    if not docx_files:
-        print("No .docx files found.")
-        return
+    # Process files in batches as discovery finds them (subfolders included): extract
+    # everything first, then validate the batch's GitHub and LinkedIn URLs concurrently
+    files = stream_resumes(input_path)
+    store = CandidateStore(STORE_PATH) if STORE_PATH else None
+    found = 0
+    while True:
+        batch = list(islice(files, VALIDATION_BATCH_SIZE))
+        if not batch:
+            break
+        found += len(batch)
+        extracted = []
+        for file_path in batch:
+            try:
+                with metrics.stage("file", file_path):
+                    # Open and read the document; body paragraphs only, as this script always read them
+                    text = load_document(file_path).body_text
+
+                    # Extract and format the information
+                    with metrics.stage("regex"):
+                        extracted.append((file_path, extract_info(text)))
+            except Exception as e:
+                print(f"Error processing file {file_path}: {e}")
+
+        statuses = validate_urls([url for _, data in extracted for url in (data['github'], data['linkedin'])])
+        for file_path, data in extracted:
+            print_result(file_path, data, statuses)
+        if store:
+            # One transaction per batch
+            store.upsert_many([(os.path.abspath(file_path), store_record(file_path, data, statuses))
+                               for file_path, data in extracted])
 
-    # Process each file
-    for file_path in docx_files:
-        try:
-            # Open and read the document
-            doc = docx.Document(file_path)
-            text = '\n'.join([para.text for para in doc.paragraphs])
-
-            # Extract and format the information
-            data = extract_info(text)
-            
-            # Validate GitHub and LinkedIn URLs
-            github_status = validate_url(data['github'])
-            linkedin_status = validate_url(data['linkedin'])
-
-            # Print the formatted output
-            print(f"File: {file_path}")
-            print(f"Name: {data['name']}")
-            print(f"Address: {data['address']}")
-            print(f"Primary Mobile No: {data['primary_phone']}")
-            print(f"Secondary Mobile No: {data['secondary_phone']}")
-            print(f"Primary Email: {data['email']}")
-            print(f"GitHub: {data['github']} ({github_status})")
-            print(f"LinkedIn: {data['linkedin']} ({linkedin_status})")
-            print('-' * 50)
-
-        except Exception as e:
-            print(f"Error processing file {file_path}: {e}")
+    if store:
+        store.close()
+    if not found:
+        print("No resume files found.")
 
 # Main process
 if __name__ == "__main__":
-    input_path = input("Enter the path to the folder or .docx file: ").strip()
+    input_path = input("Enter the path to the folder or a resume file (.pdf, .docx, .txt): ").strip()
     process_resumes(input_path)
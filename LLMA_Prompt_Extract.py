@@ -1,36 +1,71 @@
 import os
 import re
-import csv
-import pdfplumber
-import docx2txt
-from llama_cpp import Llama
-from concurrent.futures import ThreadPoolExecutor
+import json
+import metrics
+from resume_loader import load_document, detect_extension
+from file_discovery import stream_resumes
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from result_cache import cached_result, hash_file
+from near_duplicates import canonical_result, print_cluster_report
+from result_writers import CsvWriter, TextWriter, JsonLinesWriter, ParquetWriter, ResultSink
+from candidate_store import CandidateStoreWriter, DEFAULT_STORE_NAME
+from structured_extract import (RESUME_SCHEMA, STRUCTURED_PROMPT, STRUCTURED_MAX_TOKENS, STRUCTURED_SECTIONS,
+                                extract_fields, format_experience)
 
-# Load the LLaMA model locally
-llm = Llama(model_path="E:\\LLMa\\llama-2-7b.Q2_K.gguf", n_ctx=1024)
+# Local LLaMA model, loaded once per process on first use
+MODEL_PATH = "E:\\LLMa\\llama-2-7b.Q2_K.gguf"
+N_CTX = 1024
+llm = None
+
+# Worker pool settings (None = derive from the machine's core count)
+WORKERS = None
+THREADS_PER_WORKER = None
+MIN_THREADS_PER_WORKER = 4
+_model_threads = None
+
+# "summary": a free-text summary per chunk; "structured": one grammar-constrained JSON
+# pass per resume (name, contacts, links, experience, skills; see structured_extract.py)
+EXTRACTION_MODE = "summary"
+
+# Skip parsing and summarizing files whose content was already processed
+USE_CACHE = True
+
+# Reuse the cached result of an already-processed near-duplicate (resubmitted or lightly edited CV)
+# instead of running the model again; needs USE_CACHE
+DEDUP = True
+
+# Also write results as a Parquet dataset (requires pyarrow)
+WRITE_PARQUET = False
+
+# Also upsert results into the indexed SQLite candidate store (query it with candidate_store.py)
+WRITE_STORE = True
+
+# Function to load the LLaMA model (each worker process keeps its own copy)
+def load_model(n_threads=None):
+    global llm
+    if llm is None:
+        # Imported here so the parsing and link helpers work without llama-cpp installed
+        from llama_cpp import Llama
+        with metrics.stage("model_load"):
+            llm = Llama(model_path=MODEL_PATH, n_ctx=N_CTX, n_threads=n_threads or _model_threads)
+    return llm
 
 # Regular expressions to detect GitHub & LinkedIn links (full URLs)
 GITHUB_PATTERN = r"https?://(?:www\.)?github\.com/[a-zA-Z0-9_-]+"
 LINKEDIN_PATTERN = r"https?://(?:www\.)?linkedin\.com/in/[a-zA-Z0-9_-]+"
 
-# Function to extract text from a PDF
+# Function to extract text from a PDF (page-parallel for large files, see pdf_text.py)
 def extract_text_from_pdf(pdf_path):
-    text = ""
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            extracted_text = page.extract_text()
-            if extracted_text:
-                text += extracted_text + "\n"
-    return text
+    return load_document(pdf_path).text
 
 # Function to extract text from a DOCX file
 def extract_text_from_docx(docx_path):
-    return docx2txt.process(docx_path)
+    return load_document(docx_path).spaced_text
 
 # Function to extract text from a TXT file
 def extract_text_from_txt(txt_path):
-    with open(txt_path, "r", encoding="utf-8") as file:
-        return file.read()
+    return load_document(txt_path).text
 
 # Function to validate extracted links
 def validate_linkedin(link):
@@ -49,84 +84,259 @@ def extract_links(text):
 
     return {"GitHub": github_results, "LinkedIn": linkedin_results}
 
+# Instruction prefix shared by every summary prompt. It always comes first so
+# llama.cpp can keep its evaluated KV state and only evaluate the new chunk.
+SUMMARY_PROMPT = ("Summarize the following resume content concisely. Extract key skills, experiences, "
+                  "and important details. Keep it within a short paragraph.\n\n"
+                  "Resume Text:\n")
+SUMMARY_MAX_TOKENS = 128
+CHUNK_SEPARATOR = "\n\n"
+CHUNK_MARGIN_TOKENS = 8  # Slack for BOS and tokenization differences at chunk joins
+
+# Function to count tokens with the model's own tokenizer
+def count_tokens(model, text):
+    return len(model.tokenize(text.encode("utf-8"), add_bos=False))
+
+# Function to split text into section/paragraph blocks that fit the token budget
+def split_blocks(model, text, budget):
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        tokens = count_tokens(model, paragraph)
+        if tokens <= budget:
+            yield paragraph, tokens
+            continue
+
+        # Oversized section: fall back to lines, then to raw token windows
+        for line in paragraph.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            line_tokens = model.tokenize(line.encode("utf-8"), add_bos=False)
+            for i in range(0, len(line_tokens), budget):
+                piece = line_tokens[i:i + budget]
+                yield model.detokenize(piece).decode("utf-8", errors="ignore"), len(piece)
+
+# Function to pack blocks into as few chunks as possible under the token budget
+def chunk_text(model, text, budget):
+    separator_tokens = count_tokens(model, CHUNK_SEPARATOR)
+    chunks, current, used = [], [], 0
+    for block, tokens in split_blocks(model, text, budget):
+        if current and used + separator_tokens + tokens > budget:
+            chunks.append(CHUNK_SEPARATOR.join(current))
+            current, used = [], 0
+        if current:
+            used += separator_tokens
+        current.append(block)
+        used += tokens
+    if current:
+        chunks.append(CHUNK_SEPARATOR.join(current))
+    return chunks
+
 # Function to extract full summary using LLaMA model
 def extract_summary(text):
-    chunk_size = 500  # Process smaller chunks for faster processing
-    chunks = [text[i:i+chunk_size] for i in range(0, len(text), chunk_size)]
-    
+    model = load_model()
+    budget = model.n_ctx() - count_tokens(model, SUMMARY_PROMPT) - SUMMARY_MAX_TOKENS - CHUNK_MARGIN_TOKENS
+
     full_summary = ""
-    for chunk in chunks:
-        prompt = ("Summarize the following resume content concisely. Extract key skills, experiences, "
-                  "and important details. Keep it within a short paragraph.\n\n"
-                  f"Resume Text:\n{chunk}")
-        response = llm(prompt)
+    for chunk in chunk_text(model, text, budget):
+        with metrics.stage("llm"):
+            response = model(SUMMARY_PROMPT + chunk, max_tokens=SUMMARY_MAX_TOKENS)
+        usage = response.get("usage") or {}
+        metrics.count("llm_tokens", usage.get("prompt_tokens", 0), direction="in")
+        metrics.count("llm_tokens", usage.get("completion_tokens", 0), direction="out")
         if "choices" in response:
             full_summary += response["choices"][0]["text"].strip() + " "
-    
+
     return full_summary.strip() if full_summary else "Summary not available"
 
-# Function to process a single resume or multiple resumes from a given folder
+# Function to process a single resume, reusing the cached result for unchanged files
 def process_resume(file_path):
-    text = ""
-    if file_path.lower().endswith(".pdf"):
-        text = extract_text_from_pdf(file_path)
-    elif file_path.lower().endswith(".docx"):
-        text = extract_text_from_docx(file_path)
-    elif file_path.lower().endswith(".txt"):
-        text = extract_text_from_txt(file_path)
-    
+    with metrics.stage("file", file_path):
+        return _process_resume(file_path)
+
+def _process_resume(file_path):
+    if not USE_CACHE:
+        return extract_resume(file_path)
+
+    result = cached_result(file_path, extract_resume, *cache_key_parts())
+    if result:
+        result["File Name"] = os.path.basename(file_path)
+    return result
+
+# Cached results are only reused for the same model, mode, prompt and output budget
+def cache_key_parts():
+    if EXTRACTION_MODE == "structured":
+        return ("LLMA_Prompt_Extract", "structured", os.path.basename(MODEL_PATH), N_CTX,
+                STRUCTURED_PROMPT, json.dumps(RESUME_SCHEMA, sort_keys=True), STRUCTURED_MAX_TOKENS, STRUCTURED_SECTIONS)
+    return ("LLMA_Prompt_Extract", os.path.basename(MODEL_PATH), N_CTX, SUMMARY_PROMPT, SUMMARY_MAX_TOKENS)
+
+# Function to extract links and a summary (or the structured fields) from a single resume
+def extract_resume(file_path):
+    # One shared parse per file, whatever its format
+    text = load_document(file_path).spaced_text
+
     if text:
         extracted_links = extract_links(text)
+        if DEDUP and USE_CACHE:
+            result, canonical_path = canonical_result(file_path, hash_file(file_path), text, *cache_key_parts())
+            if result is not None:
+                # The model output is shared with the canonical copy; links always come from this file
+                return {**result, "File Name": os.path.basename(file_path), **extracted_links,
+                        "Duplicate Of": canonical_path}
+        if EXTRACTION_MODE == "structured":
+            fields = extract_fields(load_model(), text)
+            return {"File Name": os.path.basename(file_path), "Fields": fields, **extracted_links}
         summary = extract_summary(text)
         return {"File Name": os.path.basename(file_path), "Summary": summary, **extracted_links}
 
     return None
 
+# Function to split the machine's cores between model workers
+def plan_workers(workers=None, threads_per_worker=None):
+    cores = os.cpu_count() or 1
+    if workers is None:
+        workers = max(1, cores // (threads_per_worker or MIN_THREADS_PER_WORKER))
+    if threads_per_worker is None:
+        threads_per_worker = max(1, cores // workers)
+    return workers, threads_per_worker
+
+# Worker initializer: record the planned thread count; the model itself is
+# loaded on the first cache miss so fully cached batches never load it
+def _init_worker(n_threads):
+    global _model_threads
+    _model_threads = n_threads
+
+# Function to spread resumes across model worker processes through a bounded queue.
+# Results come back in input order: up to `queue_size` files run ahead of the oldest one.
+def run_worker_pool(files, workers, threads_per_worker, queue_size=None):
+    queue_size = queue_size or workers * 2
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(threads_per_worker,)) as executor:
+        pending = deque()
+        for file_path in files:
+            if len(pending) >= queue_size:
+                oldest_path, future = pending.popleft()
+                yield oldest_path, _collect(future, oldest_path)
+            pending.append((file_path, executor.submit(_process_in_worker, file_path)))
+
+        while pending:
+            file_path, future = pending.popleft()
+            yield file_path, _collect(future, file_path)
+
+# Function to process one file in this process, logging a failure the way _collect does
+def _process_logged(file_path):
+    try:
+        return process_resume(file_path)
+    except Exception as e:
+        print(f"Error processing file {file_path}: {e}")
+        return None
+
+# Worker side: also hand back the metrics recorded for this file (None when disabled)
+def _process_in_worker(file_path):
+    try:
+        return process_resume(file_path), metrics.drain()
+    except Exception:
+        metrics.drain()
+        raise
+
+def _collect(future, file_path):
+    try:
+        result, worker_metrics = future.result()
+        metrics.merge(worker_metrics)
+        return result
+    except Exception as e:
+        print(f"Error processing file {file_path}: {e}")
+        return None
+
+# Output formatting for one result
+CSV_FIELDS = ["File Name", "Summary", "GitHub", "LinkedIn"]
+
+def format_csv_row(result):
+    github_links = ', '.join([f"{link}: {status}" for link, status in result.get("GitHub", {}).items()])
+    linkedin_links = ', '.join([f"{link}: {status}" for link, status in result.get("LinkedIn", {}).items()])
+    return {"File Name": result["File Name"], "Summary": result["Summary"], "GitHub": github_links, "LinkedIn": linkedin_links}
+
+STRUCTURED_CSV_FIELDS = ["File Name", "Name", "Email", "Phones", "Address", "Experience", "Skills", "GitHub", "LinkedIn"]
+
+def format_structured_csv_row(result):
+    fields = result["Fields"]
+    github_links = ', '.join([f"{link}: {status}" for link, status in result.get("GitHub", {}).items()])
+    linkedin_links = ', '.join([f"{link}: {status}" for link, status in result.get("LinkedIn", {}).items()])
+    return {"File Name": result["File Name"], "Name": fields["name"], "Email": fields["email"],
+            "Phones": ', '.join(fields["phones"]), "Address": fields["address"],
+            "Experience": format_experience(fields["experience"]), "Skills": ', '.join(fields["skills"]),
+            "GitHub": github_links, "LinkedIn": linkedin_links}
+
+def format_text_record(result):
+    github_links = '\n'.join([f"{link}: {status}" for link, status in result.get("GitHub", {}).items()])
+    linkedin_links = '\n'.join([f"{link}: {status}" for link, status in result.get("LinkedIn", {}).items()])
+    return (f"File Name: {result['File Name']}\n"
+            f"Summary: {result['Summary']}\n"
+            f"GitHub Links:\n{github_links}\n"
+            f"LinkedIn Links:\n{linkedin_links}\n"
+            "\n" + "-"*50 + "\n")
+
+# Function to pick the outputs for the current EXTRACTION_MODE; returns
+# (output name, CSV fieldnames, CSV row formatter, text/JSON Lines writer).
+# `prefix` is "extracted" for batch runs and "ingested" for the ingest daemon.
+def output_layout(output_dir, prefix="extracted"):
+    if EXTRACTION_MODE == "structured":
+        # Structured results also go out as JSON Lines, one object per resume
+        output_name = f"{prefix}_fields"
+        text_writer = JsonLinesWriter(os.path.join(output_dir, f"{output_name}.jsonl"))
+        return output_name, STRUCTURED_CSV_FIELDS, format_structured_csv_row, text_writer
+    output_name = f"{prefix}_links"
+    text_writer = TextWriter(os.path.join(output_dir, f"{output_name}_summary.txt"), format_text_record)
+    return output_name, CSV_FIELDS, format_csv_row, text_writer
+
 # Process resumes in parallel
-def process_resumes(folder_or_file_path):
-    results = []
-    if os.path.isdir(folder_or_file_path):
-        files = [os.path.join(folder_or_file_path, file_name) for file_name in os.listdir(folder_or_file_path) if file_name.lower().endswith((".pdf", ".docx", ".txt"))]
-    elif os.path.isfile(folder_or_file_path) and folder_or_file_path.lower().endswith((".pdf", ".docx", ".txt")):
-        files = [folder_or_file_path]
-    else:
+def process_resumes(folder_or_file_path, workers=WORKERS, threads_per_worker=THREADS_PER_WORKER):
+    single_file = os.path.isfile(folder_or_file_path) and detect_extension(folder_or_file_path) is not None
+    if not (os.path.isdir(folder_or_file_path) or single_file):
         print("Error: The specified path is neither a valid file nor a folder containing supported files.")
         return
 
-    # Process resumes concurrently using ThreadPoolExecutor
-    with ThreadPoolExecutor() as executor:
-        results = list(executor.map(process_resume, files))
-
-    # Filter out None results (in case of any failed processing)
-    results = [result for result in results if result]
-
-    # Save results to CSV
-    output_file = os.path.join(os.path.dirname(folder_or_file_path), "extracted_links.csv")
-    with open(output_file, "w", encoding="utf-8", newline='') as csv_file:
-        fieldnames = ["File Name", "Summary", "GitHub", "LinkedIn"]
-        writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
-        writer.writeheader()
-
-        for result in results:
-            github_links = ', '.join([f"{link}: {status}" for link, status in result.get("GitHub", {}).items()])
-            linkedin_links = ', '.join([f"{link}: {status}" for link, status in result.get("LinkedIn", {}).items()])
-            writer.writerow({"File Name": result["File Name"], "Summary": result["Summary"], "GitHub": github_links, "LinkedIn": linkedin_links})
-    
-    print(f"Extraction completed! Results saved in '{output_file}'.")
+    # Each result is appended to the outputs as soon as it is ready; an
+    # interrupted run resumes after the last committed record
+    output_dir = os.path.dirname(folder_or_file_path)
+    output_name, fieldnames, format_row, text_writer = output_layout(output_dir)
+    output_text_file = text_writer.path
+    output_file = os.path.join(output_dir, f"{output_name}.csv")
+    writers = [CsvWriter(output_file, fieldnames, format_row), text_writer]
+    if WRITE_PARQUET:
+        writers.append(ParquetWriter(os.path.join(output_dir, f"{output_name}.parquet"), fieldnames, format_row))
+    if WRITE_STORE:
+        writers.append(CandidateStoreWriter(os.path.join(output_dir, DEFAULT_STORE_NAME)))
+
+    with ResultSink(writers, os.path.join(output_dir, f".{output_name}.progress")) as sink:
+        # Nested folders are walked in the background; workers start on the first file found
+        files = (file_path for file_path in stream_resumes(folder_or_file_path, exclude=[output_text_file])
+                 if not sink.is_committed(os.path.abspath(file_path)))
 
-    # Save results in a text file
-    output_text_file = os.path.join(os.path.dirname(folder_or_file_path), "extracted_links_summary.txt")
-    with open(output_text_file, "w", encoding="utf-8") as text_file:
-        for result in results:
-            text_file.write(f"File Name: {result['File Name']}\n")
-            text_file.write(f"Summary: {result['Summary']}\n")
-            github_links = '\n'.join([f"{link}: {status}" for link, status in result.get("GitHub", {}).items()])
-            linkedin_links = '\n'.join([f"{link}: {status}" for link, status in result.get("LinkedIn", {}).items()])
-            text_file.write(f"GitHub Links:\n{github_links}\n")
-            text_file.write(f"LinkedIn Links:\n{linkedin_links}\n")
-            text_file.write("\n" + "-"*50 + "\n")
+        # Process resumes in a pool of model workers, one LLaMA instance per process
+        workers, threads_per_worker = plan_workers(1 if single_file else workers, threads_per_worker)
+        print(f"Using {workers} worker(s) with {threads_per_worker} thread(s) each")
+        if workers == 1:
+            _init_worker(threads_per_worker)
+            results = ((file_path, _process_logged(file_path)) for file_path in files)
+        else:
+            results = run_worker_pool(files, workers, threads_per_worker)
 
+        # Skip None results (in case of any failed processing)
+        duplicates = 0
+        for file_path, result in results:
+            if result:
+                duplicates += "Duplicate Of" in result
+                sink.write(os.path.abspath(file_path), result)
+
+    print(f"Extraction completed! Results saved in '{output_file}'.")
     print(f"Text results saved in '{output_text_file}'.")
+    if WRITE_STORE:
+        print(f"Candidates stored in '{os.path.join(output_dir, DEFAULT_STORE_NAME)}'.")
+    if DEDUP and USE_CACHE:
+        print(f"Reused the results of a near-duplicate for {duplicates} resume(s).")
+        print_cluster_report()
 
 # Run the script
 if __name__ == "__main__":
@@ -1,9 +1,10 @@
 import os
 import re
-import csv
-import pdfplumber
-import docx2txt
+import metrics
+from resume_loader import load_document, detect_extension
+from file_discovery import stream_resumes
 from llama_cpp import Llama
+from result_writers import CsvWriter, ResultSink
 
 # Load the LLaMA model locally
 llm = Llama(model_path="E:\\LLMa\\llama-2-7b.Q2_K.gguf", n_ctx=512)
@@ -12,24 +13,17 @@ llm = Llama(model_path="E:\\LLMa\\llama-2-7b.Q2_K.gguf", n_ctx=512)
 GITHUB_PATTERN = r"https?://(?:www\.)?github\.com/[a-zA-Z0-9_-]+"
 LINKEDIN_PATTERN = r"https?://(?:www\.)?linkedin\.com/in/[a-zA-Z0-9_-]+"
 
-# Function to extract text from a PDF
+# Function to extract text from a PDF (page-parallel for large files, see pdf_text.py)
 def extract_text_from_pdf(pdf_path):
-    text = ""
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            extracted_text = page.extract_text()
-            if extracted_text:
-                text += extracted_text + "\n"
-    return text
+    return load_document(pdf_path).text
 
 # Function to extract text from a DOCX file
 def extract_text_from_docx(docx_path):
-    return docx2txt.process(docx_path)
+    return load_document(docx_path).spaced_text
 
 # Function to extract text from a TXT file
 def extract_text_from_txt(txt_path):
-    with open(txt_path, "r", encoding="utf-8") as file:
-        return file.read()
+    return load_document(txt_path).text
 
 # Function to validate extracted links
 def validate_linkedin(link):
@@ -48,42 +42,45 @@ def extract_links(text):
 
     return {"GitHub": github_results, "LinkedIn": linkedin_results}
 
-# Process a single resume or multiple resumes from a given folder
+# Function to format one result as a CSV row
+def format_csv_row(result):
+    github_links = ', '.join([f"{link}: {status}" for link, status in result.get("GitHub", {}).items()])
+    linkedin_links = ', '.join([f"{link}: {status}" for link, status in result.get("LinkedIn", {}).items()])
+    return {"File Name": result["File Name"], "GitHub": github_links, "LinkedIn": linkedin_links}
+
+# Text extractor for each supported format
+EXTRACTORS = {".pdf": extract_text_from_pdf, ".docx": extract_text_from_docx, ".txt": extract_text_from_txt}
+
+# Process a single resume or multiple resumes from a given folder (subfolders included)
 def process_resumes(folder_or_file_path):
-    results = []
-
-    if os.path.isdir(folder_or_file_path):
-        for file_name in os.listdir(folder_or_file_path):
-            file_path = os.path.join(folder_or_file_path, file_name)
-            if file_name.lower().endswith(".docx"):
-                text = extract_text_from_docx(file_path)
-                if text:
-                    extracted_links = extract_links(text)
-                    results.append({"File Name": file_name, **extracted_links})
-    elif os.path.isfile(folder_or_file_path) and folder_or_file_path.lower().endswith(".docx"):
-        file_path = folder_or_file_path
-        text = extract_text_from_docx(file_path)
-        if text:
-            extracted_links = extract_links(text)
-            results.append({"File Name": os.path.basename(file_path), **extracted_links})
-    else:
-        print("Error: The specified path is neither a valid file nor a folder containing .docx files.")
+    if not (os.path.isdir(folder_or_file_path) or
+            (os.path.isfile(folder_or_file_path) and detect_extension(folder_or_file_path))):
+        print("Error: The specified path is neither a valid file nor a folder containing supported files.")
         return
 
-    output_file = os.path.join(os.path.dirname(folder_or_file_path), "extracted_links.csv")
-    with open(output_file, "w", encoding="utf-8", newline='') as csv_file:
-        fieldnames = ["File Name", "GitHub", "LinkedIn"]
-        writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
-
-        writer.writeheader()
-        for result in results:
-            github_links = ', '.join([f"{link}: {status}" for link, status in result.get("GitHub", {}).items()])
-            linkedin_links = ', '.join([f"{link}: {status}" for link, status in result.get("LinkedIn", {}).items()])
-            writer.writerow({"File Name": result["File Name"], "GitHub": github_links, "LinkedIn": linkedin_links})
-    
+    # Each row is appended as soon as it is extracted; an interrupted run resumes after the last commit
+    output_dir = os.path.dirname(folder_or_file_path)
+    output_file = os.path.join(output_dir, "extracted_links.csv")
+    writer = CsvWriter(output_file, ["File Name", "GitHub", "LinkedIn"], format_csv_row)
+    with ResultSink([writer], os.path.join(output_dir, ".extracted_links.progress")) as sink:
+        for file_path in stream_resumes(folder_or_file_path):
+            if sink.is_committed(os.path.abspath(file_path)):
+                continue
+            with metrics.stage("file", file_path):
+                try:
+                    text = EXTRACTORS[detect_extension(file_path)](file_path)
+                    extracted_links = extract_links(text) if text else None
+                except Exception as e:
+                    # One unreadable file is logged and skipped; it never stops the walk
+                    metrics.count("errors", stage="file")
+                    print(f"Error processing file {file_path}: {e!r}")
+                    continue
+            if extracted_links:
+                sink.write(os.path.abspath(file_path), {"File Name": os.path.basename(file_path), **extracted_links})
+
     print(f"Extraction completed! Results saved in '{output_file}'.")
 
 # Run the script
 if __name__ == "__main__":
-    folder_or_file = input("Enter the full path of the folder or .docx file: ")
+    folder_or_file = input("Enter the full path of the folder or a resume file (.pdf, .docx, .txt): ")
     process_resumes(folder_or_file)
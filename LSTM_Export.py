@@ -0,0 +1,93 @@
+import os
+import sys
+import pickle
+import tempfile
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+from sklearn.model_selection import train_test_split
+from LSTM_Model import DATA_PATH, load_data
+from LSTM_Inference import (MODEL_PATH, TOKENIZER_PATH, LABELS_PATH, MAXLEN, TFLITE_PATH, VOCAB_PATH,
+                            CharTokenizer, NameOriginPredictor, LiteNameOriginPredictor, save_vocab)
+
+# Export settings
+QUANTIZATION = "float16"  # "float32", "float16" or "int8" (int8 weights, float activations)
+EXPORT_BATCH_SIZE = 1     # The converter needs a static batch; 1 keeps per-name latency lowest
+PARITY_BATCH_SIZE = 2048
+
+# Function to convert the Keras model to TFLite with a fixed [batch, MAXLEN] input
+def export_tflite(model, path=TFLITE_PATH, quantization=QUANTIZATION, batch_size=EXPORT_BATCH_SIZE):
+    # The LSTM loops only lower to TFLite builtins once every shape is static, and going
+    # through a SavedModel freezes the weights the loop body reads
+    with tempfile.TemporaryDirectory() as saved_model_dir:
+        archive = keras.export.ExportArchive()
+        archive.track(model)
+        archive.add_endpoint("serve", lambda x: model(x, training=False),
+                             input_signature=[tf.TensorSpec([batch_size, MAXLEN], tf.float32)])
+        archive.write_out(saved_model_dir, verbose=False)
+
+        converter = tf.lite.TFLiteConverter.from_saved_model(saved_model_dir)
+        if quantization != "float32":
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        if quantization == "float16":
+            converter.target_spec.supported_types = [tf.float16]
+        tflite_model = converter.convert()
+
+    with open(path, "wb") as f:
+        f.write(tflite_model)
+    return len(tflite_model)
+
+# Function to export the model and a JSON vocabulary from the artifacts LSTM_Model.py saved
+def export(quantization=QUANTIZATION, batch_size=EXPORT_BATCH_SIZE):
+    with open(TOKENIZER_PATH, "rb") as f:
+        tokenizer = pickle.load(f)
+    with open(LABELS_PATH, "rb") as f:
+        label_classes = pickle.load(f)
+    save_vocab(CharTokenizer.from_keras(tokenizer), label_classes, VOCAB_PATH)
+
+    model = keras.models.load_model(MODEL_PATH, compile=False)
+    size = export_tflite(model, TFLITE_PATH, quantization, batch_size)
+    print(f"Wrote {TFLITE_PATH} ({quantization}, batch {batch_size}): {size / 1024:.0f} KB "
+          f"vs {os.path.getsize(MODEL_PATH) / 1024:.0f} KB for {MODEL_PATH}")
+    print(f"Wrote {VOCAB_PATH}")
+
+# Function to score the held-out split with both runtimes and compare them
+def check_parity(data_path=DATA_PATH):
+    sequences, y, tokenizer, label_classes = load_data(data_path)
+    # Same split as LSTM_Model.train / train_fast
+    _, test_sequences, _, y_test = train_test_split(sequences, y, test_size=0.2, random_state=42, stratify=y)
+    # Rebuild the cleaned names so each runtime also goes through its own tokenizer
+    names = [''.join(tokenizer.index_word[index] for index in seq) for seq in test_sequences]
+    expected = [label_classes[code] for code in y_test]
+
+    keras_predictor = NameOriginPredictor()
+    lite_predictor = LiteNameOriginPredictor()
+    keras_results, lite_results = [], []
+    for start in range(0, len(names), PARITY_BATCH_SIZE):
+        batch = names[start:start + PARITY_BATCH_SIZE]
+        keras_results += keras_predictor.predict(batch)
+        lite_results += lite_predictor.predict(batch)
+
+    keras_accuracy = np.mean([origin == label for (origin, _), label in zip(keras_results, expected)])
+    lite_accuracy = np.mean([origin == label for (origin, _), label in zip(lite_results, expected)])
+    agreement = np.mean([a[0] == b[0] for a, b in zip(keras_results, lite_results)])
+    max_diff = max((abs(a[1] - b[1]) for a, b in zip(keras_results, lite_results)), default=0.0)
+    print(f"Test names:        {len(names)}")
+    print(f"Keras accuracy:    {keras_accuracy:.4f}")
+    print(f"TFLite accuracy:   {lite_accuracy:.4f}")
+    print(f"Top-1 agreement:   {agreement:.4f}")
+    print(f"Max top-1 prob diff: {max_diff:.5f}")
+    return keras_accuracy, lite_accuracy, agreement
+
+# Command line: python LSTM_Export.py export [float32|float16|int8] [batch_size]
+#               python LSTM_Export.py check [names-origin.csv]
+if __name__ == "__main__":
+    mode = sys.argv[1] if len(sys.argv) > 1 else "export"
+    if mode == "export":
+        export(sys.argv[2] if len(sys.argv) > 2 else QUANTIZATION,
+               int(sys.argv[3]) if len(sys.argv) > 3 else EXPORT_BATCH_SIZE)
+    elif mode == "check":
+        check_parity(sys.argv[2] if len(sys.argv) > 2 else DATA_PATH)
+    else:
+        print("Usage: python LSTM_Export.py [export [float32|float16|int8] [batch_size] | check [data.csv]]")
+        sys.exit(1)
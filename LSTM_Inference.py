@@ -0,0 +1,241 @@
+import sys
+import json
+import time
+import queue
+import pickle
+import threading
+from concurrent.futures import Future
+import numpy as np
+
+# Artifacts written by LSTM_Model.py
+MODEL_PATH = "name_origin_model.h5"
+TOKENIZER_PATH = "tokenizer.pkl"
+LABELS_PATH = "label_classes.pkl"
+MAXLEN = 20
+
+# Artifacts written by LSTM_Export.py; the lite path needs nothing else
+TFLITE_PATH = "name_origin_model.tflite"
+VOCAB_PATH = "name_origin_vocab.json"
+LITE_THREADS = None  # None = interpreter default
+
+# Batch sizes: offline batches from a file/stdin, and the online micro-batcher
+BATCH_SIZE = 2048
+MICRO_BATCH_SIZE = 256
+MICRO_BATCH_WAIT = 0.005  # Seconds to wait for more names before running a partial batch
+
+# Clean a name the same way training did
+def clean_name(name):
+    return ''.join([char for char in name.strip().lower() if char.isalpha()])
+
+# Function to map softmax rows back to (origin, probability) per input name
+def decode_predictions(count, valid, probabilities, label_classes):
+    results = [(None, 0.0)] * count
+    codes = probabilities.argmax(axis=1)
+    for row, (i, code) in enumerate(zip(valid, codes)):
+        origin = label_classes[code] if code < len(label_classes) else "Unknown Origin"
+        results[i] = (origin, float(probabilities[row, code]))
+    return results
+
+
+class NameOriginPredictor:
+    """Loads the model, tokenizer and label classes once and scores names in padded batches."""
+
+    def __init__(self, model_path=MODEL_PATH, tokenizer_path=TOKENIZER_PATH, labels_path=LABELS_PATH):
+        # TensorFlow is imported here so the lite path below never pays for it
+        from tensorflow import keras
+        from tensorflow.keras.preprocessing.sequence import pad_sequences
+        self.pad_sequences = pad_sequences
+        with open(tokenizer_path, "rb") as f:
+            self.tokenizer = pickle.load(f)
+        with open(labels_path, "rb") as f:
+            self.label_classes = pickle.load(f)
+        self.model = keras.models.load_model(model_path, compile=False)
+
+    # Returns (origin, probability) per name; (None, 0.0) when nothing is recognizable
+    def predict(self, names):
+        sequences = self.tokenizer.texts_to_sequences([clean_name(name) for name in names])
+        valid = [i for i, seq in enumerate(sequences) if any(seq)]
+        if not valid:
+            return [(None, 0.0)] * len(names)
+
+        X = self.pad_sequences([sequences[i] for i in valid], maxlen=MAXLEN, padding='post')
+        probabilities = np.asarray(self.model.predict_on_batch(X))
+        return decode_predictions(len(names), valid, probabilities, self.label_classes)
+
+
+class CharTokenizer:
+    """Plain-Python stand-in for the pickled Keras char-level Tokenizer.
+
+    Lower-cases, maps each character to its index (the OOV index when unseen)
+    and pads/truncates like pad_sequences(padding='post', truncating='pre').
+    """
+
+    def __init__(self, char_index, oov_index=1, maxlen=MAXLEN):
+        self.char_index = char_index
+        self.oov_index = oov_index
+        self.maxlen = maxlen
+
+    @classmethod
+    def from_keras(cls, tokenizer, maxlen=MAXLEN):
+        oov_index = tokenizer.word_index.get(tokenizer.oov_token, 0) if tokenizer.oov_token else 0
+        char_index = {char: index for char, index in tokenizer.word_index.items() if char != tokenizer.oov_token}
+        return cls(char_index, oov_index, maxlen)
+
+    def texts_to_sequences(self, texts):
+        sequences = []
+        for text in texts:
+            seq = [self.char_index.get(char, self.oov_index) for char in text.lower()]
+            sequences.append([index for index in seq if index])
+        return sequences
+
+    def encode(self, sequences):
+        X = np.zeros((len(sequences), self.maxlen), dtype=np.int32)
+        for row, seq in enumerate(sequences):
+            seq = seq[-self.maxlen:]
+            X[row, :len(seq)] = seq
+        return X
+
+
+# Function to write the tokenizer and label classes as the JSON vocabulary the lite path reads
+def save_vocab(tokenizer, label_classes, path=VOCAB_PATH):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "char_index": tokenizer.char_index,
+            "oov_index": tokenizer.oov_index,
+            "maxlen": tokenizer.maxlen,
+            "label_classes": [str(label) for label in label_classes],
+        }, f, indent=1)
+
+def load_vocab(path=VOCAB_PATH):
+    with open(path, "r", encoding="utf-8") as f:
+        vocab = json.load(f)
+    tokenizer = CharTokenizer(vocab["char_index"], vocab["oov_index"], vocab["maxlen"])
+    return tokenizer, vocab["label_classes"]
+
+# Prefer the standalone LiteRT / tflite-runtime interpreters so TensorFlow is never imported
+def load_interpreter_class():
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            from tensorflow.lite import Interpreter
+    return Interpreter
+
+
+class LiteNameOriginPredictor:
+    """Same predict() contract as NameOriginPredictor, backed by the exported TFLite model.
+
+    The exported model has a fixed batch dimension, so names are scored in
+    chunks of that size and the last chunk is zero-padded.
+    """
+
+    def __init__(self, model_path=TFLITE_PATH, vocab_path=VOCAB_PATH, num_threads=LITE_THREADS):
+        self.tokenizer, self.label_classes = load_vocab(vocab_path)
+        self.interpreter = load_interpreter_class()(model_path=model_path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self.input = self.interpreter.get_input_details()[0]
+        self.output = self.interpreter.get_output_details()[0]
+        self.batch_size = int(self.input["shape"][0])
+
+    def run(self, X):
+        rows = []
+        for start in range(0, len(X), self.batch_size):
+            chunk = X[start:start + self.batch_size]
+            if len(chunk) < self.batch_size:
+                chunk = np.concatenate([chunk, np.zeros((self.batch_size - len(chunk), X.shape[1]), X.dtype)])
+            self.interpreter.set_tensor(self.input["index"], chunk.astype(self.input["dtype"]))
+            self.interpreter.invoke()
+            rows.append(self.interpreter.get_tensor(self.output["index"]).copy())
+        return np.concatenate(rows)[:len(X)]
+
+    def predict(self, names):
+        sequences = self.tokenizer.texts_to_sequences([clean_name(name) for name in names])
+        valid = [i for i, seq in enumerate(sequences) if any(seq)]
+        if not valid:
+            return [(None, 0.0)] * len(names)
+
+        probabilities = self.run(self.tokenizer.encode([sequences[i] for i in valid]))
+        return decode_predictions(len(names), valid, probabilities, self.label_classes)
+
+
+class MicroBatcher:
+    """Collects names from many online callers and scores them together.
+
+    submit() returns a Future; a background thread runs one batch as soon as
+    MICRO_BATCH_SIZE names are queued or MICRO_BATCH_WAIT seconds have passed.
+    """
+
+    def __init__(self, predictor, max_batch=MICRO_BATCH_SIZE, max_wait=MICRO_BATCH_WAIT):
+        self.predictor = predictor
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, name):
+        future = Future()
+        self.queue.put((name, future))
+        return future
+
+    def predict(self, name):
+        return self.submit(name).result()
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                results = self.predictor.predict([name for name, _ in batch])
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+
+
+# Function to read names lazily in fixed-size batches
+def iter_batches(lines, batch_size=BATCH_SIZE):
+    batch = []
+    for line in lines:
+        name = line.strip()
+        if name:
+            batch.append(name)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+# Command line: python LSTM_Inference.py [--lite] [names.txt]  (reads stdin when no file is given)
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    lite = "--lite" in args
+    paths = [arg for arg in args if arg != "--lite"]
+
+    load_start = time.perf_counter()
+    predictor = LiteNameOriginPredictor() if lite else NameOriginPredictor()
+    print(f"Model loaded in {time.perf_counter() - load_start:.2f}s", file=sys.stderr)
+
+    source = open(paths[0], "r", encoding="utf-8") if paths else sys.stdin
+    total = 0
+    start = time.perf_counter()
+    with source:
+        for batch in iter_batches(source):
+            for name, (origin, probability) in zip(batch, predictor.predict(batch)):
+                print(f"{name}\t{origin or 'Unable to predict'}\t{probability:.4f}")
+            total += len(batch)
+
+    elapsed = time.perf_counter() - start
+    print(f"Scored {total} names in {elapsed:.2f}s ({total / elapsed if elapsed else 0:.0f} names/s)", file=sys.stderr)
@@ -1,3 +1,5 @@
+import sys
+import time
 import pandas as pd
 import numpy as np
 import tensorflow as tf
@@ -9,100 +11,198 @@ from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder
 import pickle
 
-# Load dataset
-df = pd.read_csv("E:\\Python\\LLMa\\names-origin.csv")
-
-# Data preprocessing
-df.dropna(inplace=True)
-df['name'] = df['name'].str.lower().str.replace(r'[^a-z]', '', regex=True)  # Remove non-alphabetic characters
-df = df[df['name'].str.len() > 1]  # Remove very short names
-
-# Encode target labels
-label_encoder = LabelEncoder()
-df['origin_code'] = label_encoder.fit_transform(df['origin'])
-label_classes = label_encoder.classes_  # Store label classes
-
-# Tokenization
-tokenizer = Tokenizer(char_level=True, oov_token="<OOV>")  # Handle unseen characters
-tokenizer.fit_on_texts(df['name'])
-X = tokenizer.texts_to_sequences(df['name'])
-X = pad_sequences(X, maxlen=20, padding='post')  # Pad sequences to max length
-y = df['origin_code']
-
-# Train-test split
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
-
-# Define LSTM model
-model = keras.Sequential([
-    Embedding(input_dim=len(tokenizer.word_index) + 1, output_dim=128, input_length=20),
-    Bidirectional(LSTM(128, return_sequences=True)),
-    Dropout(0.3),
-    LSTM(64),
-    Dense(64, activation='relu'),
-    Dropout(0.3),
-    Dense(len(label_classes), activation='softmax')
-])
-
-# Compile model
-model.compile(loss='sparse_categorical_crossentropy', optimizer='adam', metrics=['accuracy'])
-
-# Train model
-model.fit(X_train, y_train, epochs=20, batch_size=32, validation_data=(X_test, y_test))
-
-# Evaluate model
-loss, accuracy = model.evaluate(X_test, y_test)
-print("LSTM Model Accuracy:", accuracy)
+DATA_PATH = "E:\\Python\\LLMa\\names-origin.csv"
+MAXLEN = 20
+
+# Fast training mode settings
+FAST_BATCH_SIZE = 256
+FAST_MAX_EPOCHS = 30
+EARLY_STOPPING_PATIENCE = 3
+BUCKET_BOUNDARIES = [5, 7, 9, 11, 14]  # Names are batched with others of similar length
+CHECKPOINT_PATH = "name_origin_checkpoint.h5"
+
+# Load and preprocess the dataset; returns tokenized sequences, labels, tokenizer and label classes
+def load_data(data_path=DATA_PATH):
+    # Load dataset
+    df = pd.read_csv(data_path)
+
+    # Data preprocessing
+    df.dropna(inplace=True)
+    df['name'] = df['name'].str.lower().str.replace(r'[^a-z]', '', regex=True)  # Remove non-alphabetic characters
+    df = df[df['name'].str.len() > 1]  # Remove very short names
+
+    # Encode target labels
+    label_encoder = LabelEncoder()
+    df['origin_code'] = label_encoder.fit_transform(df['origin'])
+    label_classes = label_encoder.classes_  # Store label classes
+
+    # Tokenization
+    tokenizer = Tokenizer(char_level=True, oov_token="<OOV>")  # Handle unseen characters
+    tokenizer.fit_on_texts(df['name'])
+    sequences = tokenizer.texts_to_sequences(df['name'])
+    return sequences, df['origin_code'].to_numpy(), tokenizer, label_classes
+
+# Define LSTM model; with variable_length the input is masked instead of fixed at MAXLEN
+def build_model(vocab_size, n_classes, variable_length=False):
+    if variable_length:
+        embedding = Embedding(input_dim=vocab_size, output_dim=128, mask_zero=True)
+    else:
+        embedding = Embedding(input_dim=vocab_size, output_dim=128, input_length=MAXLEN)
+    model = keras.Sequential([
+        embedding,
+        Bidirectional(LSTM(128, return_sequences=True)),
+        Dropout(0.3),
+        LSTM(64),
+        Dense(64, activation='relu'),
+        Dropout(0.3),
+        Dense(n_classes, activation='softmax')
+    ])
+
+    # Compile model
+    model.compile(loss='sparse_categorical_crossentropy', optimizer='adam', metrics=['accuracy'])
+    return model
 
 # Save the tokenizer and model
-with open("tokenizer.pkl", "wb") as f:
-    pickle.dump(tokenizer, f)
-with open("label_classes.pkl", "wb") as f:
-    pickle.dump(label_classes, f)
-model.save("name_origin_model.h5")
+def save_artifacts(model, tokenizer, label_classes):
+    with open("tokenizer.pkl", "wb") as f:
+        pickle.dump(tokenizer, f)
+    with open("label_classes.pkl", "wb") as f:
+        pickle.dump(label_classes, f)
+    model.save("name_origin_model.h5")
+
+# Original training: every name padded to MAXLEN, fixed 20 epochs from NumPy arrays
+def train(data_path=DATA_PATH):
+    sequences, y, tokenizer, label_classes = load_data(data_path)
+    X = pad_sequences(sequences, maxlen=MAXLEN, padding='post')  # Pad sequences to max length
+
+    # Train-test split
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+
+    # Train model
+    model = build_model(len(tokenizer.word_index) + 1, len(label_classes))
+    model.fit(X_train, y_train, epochs=20, batch_size=32, validation_data=(X_test, y_test))
+
+    # Evaluate model
+    loss, accuracy = model.evaluate(X_test, y_test)
+    print("LSTM Model Accuracy:", accuracy)
+    save_artifacts(model, tokenizer, label_classes)
+
+# Build a tf.data pipeline that pads each batch only to its own bucket's length
+def make_dataset(sequences, labels, batch_size, shuffle=False):
+    padded = pad_sequences(sequences, maxlen=MAXLEN, padding='post').astype(np.int32)
+    lengths = np.array([min(len(seq), MAXLEN) for seq in sequences], dtype=np.int32)
+    dataset = tf.data.Dataset.from_tensor_slices((padded, lengths, labels.astype(np.int32)))
+    if shuffle:
+        dataset = dataset.shuffle(len(sequences), reshuffle_each_iteration=True)
+    # Trim each name back to its own length; padded_batch re-pads per bucket
+    dataset = dataset.map(lambda name, length, label: (name[:length], label), num_parallel_calls=tf.data.AUTOTUNE)
+    dataset = dataset.bucket_by_sequence_length(
+        element_length_func=lambda name, label: tf.shape(name)[0],
+        bucket_boundaries=BUCKET_BOUNDARIES,
+        bucket_batch_sizes=[batch_size] * (len(BUCKET_BOUNDARIES) + 1),
+        pad_to_bucket_boundary=False,
+    )
+    return dataset.prefetch(tf.data.AUTOTUNE)
+
+class EpochTimer(keras.callbacks.Callback):
+    """Prints wall-clock time and names/second for each epoch."""
+
+    def __init__(self, n_samples):
+        super().__init__()
+        self.n_samples = n_samples
+        self.times = []
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self.start = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        elapsed = time.perf_counter() - self.start
+        self.times.append(elapsed)
+        print(f"Epoch {epoch + 1}: {elapsed:.1f}s, {self.n_samples / elapsed:.0f} names/s")
+
+# Fast training: length-bucketed tf.data batches, larger batches, early stopping and checkpointing
+def train_fast(data_path=DATA_PATH, batch_size=FAST_BATCH_SIZE, max_epochs=FAST_MAX_EPOCHS):
+    sequences, y, tokenizer, label_classes = load_data(data_path)
+
+    # Same split as the original training so accuracies are comparable
+    train_idx, test_idx = train_test_split(np.arange(len(y)), test_size=0.2, random_state=42, stratify=y)
+    train_ds = make_dataset([sequences[i] for i in train_idx], y[train_idx], batch_size, shuffle=True)
+    test_ds = make_dataset([sequences[i] for i in test_idx], y[test_idx], batch_size)
+
+    model = build_model(len(tokenizer.word_index) + 1, len(label_classes), variable_length=True)
+    timer = EpochTimer(len(train_idx))
+    callbacks = [
+        keras.callbacks.EarlyStopping(monitor='val_accuracy', patience=EARLY_STOPPING_PATIENCE, restore_best_weights=True),
+        keras.callbacks.ModelCheckpoint(CHECKPOINT_PATH, monitor='val_accuracy', save_best_only=True),
+        timer,
+    ]
+
+    start = time.perf_counter()
+    model.fit(train_ds, epochs=max_epochs, validation_data=test_ds, callbacks=callbacks)
+    print(f"Training time: {time.perf_counter() - start:.1f}s over {len(timer.times)} epoch(s)")
+
+    # Evaluate model
+    loss, accuracy = model.evaluate(test_ds)
+    print("LSTM Model Accuracy:", accuracy)
+    save_artifacts(model, tokenizer, label_classes)
 
 # ====== PREDICTION & OUTPUT NAME-ORIGIN DATA ====== #
-# Load tokenizer and label classes
-with open("tokenizer.pkl", "rb") as f:
-    tokenizer = pickle.load(f)
-with open("label_classes.pkl", "rb") as f:
-    label_classes = pickle.load(f)
-
-# Load model
-model = keras.models.load_model("name_origin_model.h5")
-
-# Get user input name and predict origin
-while True:
-    user_input = input("Enter a name (or type 'exit' to stop): ").strip().lower()
-    if user_input == 'exit':
-        break
-    
-    # Clean input
-    user_input_clean = ''.join([char for char in user_input if char.isalpha()])
-    if not user_input_clean:
-        print("Invalid input. Please enter a valid name.")
-        continue
-    
-    # Convert name to sequences
-    user_input_seq = tokenizer.texts_to_sequences([user_input_clean])
-    
-    # Handle case where all characters are unknown
-    if not any(user_input_seq[0]):  
-        print("No recognizable characters in input. Unable to predict.")
-        continue
-
-    user_input_seq = pad_sequences(user_input_seq, maxlen=20, padding='post')
-
-    # Predict origin
-    prediction = model.predict(user_input_seq)
-    predicted_origin_code = np.argmax(prediction)
-
-    # Convert code to actual origin
-    if predicted_origin_code < len(label_classes):
-        predicted_origin = label_classes[predicted_origin_code]
+def predict_interactive():
+    # Load tokenizer and label classes
+    with open("tokenizer.pkl", "rb") as f:
+        tokenizer = pickle.load(f)
+    with open("label_classes.pkl", "rb") as f:
+        label_classes = pickle.load(f)
+
+    # Load model
+    model = keras.models.load_model("name_origin_model.h5")
+
+    # Get user input name and predict origin
+    while True:
+        user_input = input("Enter a name (or type 'exit' to stop): ").strip().lower()
+        if user_input == 'exit':
+            break
+
+        # Clean input
+        user_input_clean = ''.join([char for char in user_input if char.isalpha()])
+        if not user_input_clean:
+            print("Invalid input. Please enter a valid name.")
+            continue
+
+        # Convert name to sequences
+        user_input_seq = tokenizer.texts_to_sequences([user_input_clean])
+
+        # Handle case where all characters are unknown
+        if not any(user_input_seq[0]):
+            print("No recognizable characters in input. Unable to predict.")
+            continue
+
+        user_input_seq = pad_sequences(user_input_seq, maxlen=MAXLEN, padding='post')
+
+        # Predict origin
+        prediction = model.predict(user_input_seq)
+        predicted_origin_code = np.argmax(prediction)
+
+        # Convert code to actual origin
+        if predicted_origin_code < len(label_classes):
+            predicted_origin = label_classes[predicted_origin_code]
+        else:
+            predicted_origin = "Unknown Origin"
+
+        print(f"Predicted Origin: {predicted_origin}\n")
+
+# Usage: python LSTM_Model.py [train | train-fast | predict]
+# With no mode it trains the original way and then starts the prediction prompt.
+if __name__ == "__main__":
+    mode = sys.argv[1] if len(sys.argv) > 1 else None
+    if mode == "train":
+        train()
+    elif mode == "train-fast":
+        train_fast()
+    elif mode == "predict":
+        predict_interactive()
+    elif mode is None:
+        train()
+        predict_interactive()
     else:
-        predicted_origin = "Unknown Origin"
-    
-    print(f"Predicted Origin: {predicted_origin}\n")
-
-
-
+        print("Usage: python LSTM_Model.py [train | train-fast | predict]")
@@ -1,38 +1,82 @@
 import os
 import re
-import json
-import docx2txt
+import time
+import asyncio
+from collections import Counter
 import requests
+from deepinfra_client import DeepInfraClient, OPENAI_BASE_URL, REQUEST_TIMEOUT
+import metrics
+from resume_loader import load_document, detect_extension
+from resume_sections import index_sections
+from file_discovery import stream_resumes
+from result_cache import get_cache, lookup
+from near_duplicates import canonical_result, print_cluster_report
+from result_writers import JsonLinesWriter, ParquetWriter, ResultSink
+from candidate_store import CandidateStoreWriter, DEFAULT_STORE_NAME
+from structured_extract import (API_RESPONSE_FORMAT, STRUCTURED_MAX_TOKENS, build_api_prompt, compact,
+                                parse_fields, format_experience, select_sections, STRUCTURED_SECTIONS)
 
 # Regular expressions to detect GitHub & LinkedIn links
 GITHUB_PATTERN = r"https?://(?:www\.)?github\.com/[a-zA-Z0-9_-]+"
 LINKEDIN_PATTERN = r"https?://(?:www\.)?linkedin\.com/in/[a-zA-Z0-9_-]+"
 
 # Replace with your actual DeepInfra API Key
-OPENAI_BASE_URL = "https://api.deepinfra.com/v1/openai"
 API_KEY = "E:\\Python\\New1\\API_key"
+LLAMA_MODEL = "meta-llama/Meta-Llama-3.1-70B-Instruct"
+MAX_TOKENS = 512
 
-def extract_text_using_llama(file_path):
-    """Extracts text from a .docx file and processes it with LLaMA-3."""
+# Concurrency against the API: open requests and optional client-side rate limit
+MAX_IN_FLIGHT = 8
+REQUESTS_PER_SECOND = 4  # Client-side cap; None disables it and relies on the 429 backoff alone
+
+# Ask for the schema in structured_extract.py as a JSON object (JSON mode) instead of free text
+STRUCTURED_OUTPUT = False
+
+# Tiered mode: regex extraction runs first and only incomplete or ambiguous resumes go to the LLM,
+# as a JSON-mode call over just the sections it has to resolve
+PREFILTER = False
+ESCALATION_THRESHOLD = 1.0  # Completeness score a regex result needs to skip the LLM
+SCORED_FIELDS = ("GitHub", "LinkedIn", "Experience")
+
+# Skip the API call for files whose content was already processed
+USE_CACHE = True
+
+# Reuse the cached result of an already-processed near-duplicate resume; needs USE_CACHE
+DEDUP = True
+
+# Also write results as a Parquet dataset (requires pyarrow)
+WRITE_PARQUET = False
+PARQUET_FIELDS = ["File Name", "GitHub", "LinkedIn", "Experience", "Summary"]
+
+# Also upsert results into the indexed SQLite candidate store (query it with candidate_store.py)
+WRITE_STORE = True
+
+def ask_llama(text):
+    """Sends resume text to LLaMA-3 and returns the reply, or None if the call failed."""
     try:
-        text = docx2txt.process(file_path)
-        if not text:
-            return ""
-        
         response = requests.post(
             f"{OPENAI_BASE_URL}/chat/completions",
             headers={"Authorization": f"Bearer {API_KEY}"},
             json={
-                "model": "meta-llama/Meta-Llama-3.1-70B-Instruct",
+                "model": LLAMA_MODEL,
                 "messages": [{"role": "user", "content": text}],
-                "max_tokens": 512
-            }
+                "max_tokens": MAX_TOKENS
+            },
+            timeout=REQUEST_TIMEOUT
         )
 
-        return response.json()["choices"][0]["message"]["content"].strip() if response.status_code == 200 else text
+        return response.json()["choices"][0]["message"]["content"].strip() if response.status_code == 200 else None
     except requests.exceptions.RequestException as e:
         print(f"Request failed: {e}")
-        return text
+        return None
+
+def extract_text_using_llama(file_path):
+    """Extracts text from a .docx file and processes it with LLaMA-3."""
+    text = load_document(file_path).spaced_text
+    if not text:
+        return ""
+    reply = ask_llama(text)
+    return text if reply is None else reply
 
 def validate_link(link, pattern):
     return bool(re.fullmatch(pattern, link))
@@ -47,61 +91,282 @@ def extract_links(text):
         "LinkedIn": {link: "Valid" if validate_link(link, LINKEDIN_PATTERN) else "Invalid" for link in linkedin_links} or {"Not Available": ""}
     }
 
-def extract_experience_and_summary(text):
-    """Extracts experience and summary from text using simple heuristics."""
-    # Example: Look for keywords like "Experience" and "Summary"
-    experience = ""
-    summary = ""
+def extract_experience_and_summary(text, sections=None):
+    """Extracts experience and summary from text, sliced from its section index."""
+    if sections is None:
+        sections = index_sections(text)
+    experience = sections.get("Experience")
+    summary = sections.get("Summary")
 
-    # Split text into sections
-    sections = re.split(r'\n\s*\n', text)  # Split by double newlines
-    for section in sections:
-        if "experience" in section.lower():
-            experience = section.strip()
-        elif "summary" in section.lower():
-            summary = section.strip()
+    # Resumes without recognisable headings fall back to keyword matching over blank-line blocks
+    if not (experience and summary):
+        fallback_experience, fallback_summary = "", ""
+        for section in re.split(r'\n\s*\n', text):
+            lower = section.lower()
+            if "experience" in lower:
+                fallback_experience = section.strip()
+            elif "summary" in lower:
+                fallback_summary = section.strip()
+        experience = experience or fallback_experience
+        summary = summary or fallback_summary
 
     return {
         "Experience": experience or "Not Available",
         "Summary": summary or "Not Available"
     }
 
+def build_result(file_path, text, sections=None):
+    """Builds the output record for one resume from its (LLM-processed) text."""
+    extracted_links = extract_links(text)
+    experience_and_summary = extract_experience_and_summary(text, sections)
+
+    # Combine all extracted data
+    return {
+        "File Name": os.path.basename(file_path),
+        **extracted_links,
+        **experience_and_summary
+    }
+
+def build_structured_result(file_path, text, fields, sections=None):
+    """Builds the output record from the model's JSON fields; links still come from the raw text."""
+    return {
+        "File Name": os.path.basename(file_path),
+        **extract_links(text),
+        "Experience": format_experience(fields["experience"]) or "Not Available",
+        "Summary": extract_experience_and_summary(text, sections)["Summary"],
+        "Fields": fields
+    }
+
+async def complete_structured(client, file_path, text):
+    """Sends the resume in JSON mode; returns None when the call fails or the reply is not valid JSON."""
+    sections = index_sections(text)
+    prompt = build_api_prompt(compact(select_sections(text, sections)))
+    reply = await client.complete(prompt, API_RESPONSE_FORMAT, STRUCTURED_MAX_TOKENS)
+    fields = parse_fields(reply) if reply is not None else None
+    if reply is not None and fields is None:
+        metrics.count("errors", stage="structured_parse")
+    return None if fields is None else build_structured_result(file_path, text, fields, sections)
+
+def score_regex_result(text, result, sections):
+    """Scores how complete a regex result is (0 to 1) and returns the reasons it falls short."""
+    lower = text.lower()
+    reasons = []
+    for key in ("GitHub", "LinkedIn"):
+        # The site is mentioned but no URL matched, e.g. "github.com/name" without a scheme
+        if "Not Available" in result[key] and key.lower() in lower:
+            reasons.append(f"{key.lower()}_unmatched")
+    if "Experience" not in sections:
+        candidates = sum(1 for section in re.split(r'\n\s*\n', text) if "experience" in section.lower())
+        if not candidates:
+            reasons.append("experience_missing")
+        elif candidates > 1:
+            # Without a heading the fallback keeps the last match, which may not be the experience section
+            reasons.append("experience_ambiguous")
+    return 1 - len(reasons) / len(SCORED_FIELDS), reasons
+
+def relevant_sections(text, reasons):
+    """Returns only the parts of the resume the LLM needs to resolve `reasons`."""
+    if "experience_missing" in reasons:
+        return text  # Nothing narrower to send
+    sections = [section.strip() for section in re.split(r'\n\s*\n', text) if section.strip()]
+    wanted = []
+    if "experience_ambiguous" in reasons:
+        wanted += [section for section in sections if "experience" in section.lower()]
+    for key in ("github", "linkedin"):
+        if f"{key}_unmatched" in reasons:
+            wanted += [line.strip() for line in text.splitlines() if key in line.lower()]
+    return "\n\n".join(dict.fromkeys(wanted))
+
+def merge_llm_fields(result, fields, reasons):
+    """Fills in only what the regex tier missed from the LLM's JSON fields."""
+    merged = dict(result)
+    if "experience_missing" in reasons or "experience_ambiguous" in reasons:
+        merged["Experience"] = format_experience(fields["experience"]) or result["Experience"]
+    links = extract_links(" ".join(link if "://" in link else f"https://{link}" for link in fields["links"]))
+    for key in ("GitHub", "LinkedIn"):
+        if f"{key.lower()}_unmatched" in reasons and "Not Available" not in links[key]:
+            merged[key] = links[key]
+    return merged
+
+
+class TierStats:
+    """Per-tier resume counts, latency and token spend for the end-of-run report."""
+
+    def __init__(self):
+        self.resumes = 0
+        self.escalated = 0
+        self.seconds = {"regex": [], "llm": []}
+        self.reasons = Counter()
+        self.sent_chars = 0
+        self.full_chars = 0
+
+    def report(self, client):
+        print(f"Tiered extraction: {self.resumes} resume(s), {self.escalated} escalated to the LLM "
+              f"({self.escalated / self.resumes if self.resumes else 0:.1%})")
+        for tier, seconds in self.seconds.items():
+            seconds = sorted(seconds)
+            if seconds:
+                p95 = seconds[min(len(seconds) - 1, int(len(seconds) * 0.95))]
+                print(f"  {tier:<5} {len(seconds):>6} call(s)  mean {sum(seconds) / len(seconds) * 1000:9.2f} ms  "
+                      f"p95 {p95 * 1000:9.2f} ms")
+        print(f"  llm   tokens in {client.prompt_tokens}, out {client.completion_tokens}; regex tokens 0")
+        if self.full_chars:
+            print(f"  Sent {self.sent_chars} of {self.full_chars} chars of escalated resumes "
+                  f"({self.sent_chars / self.full_chars:.1%})")
+        if self.reasons:
+            print("  Escalation reasons: " + ", ".join(f"{reason} {count}" for reason, count in self.reasons.most_common()))
+
+
+async def process_tiered(client, file_path, text, stats):
+    """Regex tier first; escalates to the LLM only below ESCALATION_THRESHOLD. Returns (result, cacheable)."""
+    start = time.perf_counter()
+    with metrics.stage("tier.regex", file_path):
+        sections = index_sections(text)
+        result = build_result(file_path, text, sections)
+        score, reasons = score_regex_result(text, result, sections)
+    stats.seconds["regex"].append(time.perf_counter() - start)
+    stats.resumes += 1
+    if score >= ESCALATION_THRESHOLD:
+        metrics.count("tier_results", tier="regex")
+        return result, True
+
+    stats.escalated += 1
+    stats.reasons.update(reasons)
+    metrics.count("tier_results", tier="llm")
+    sections = compact(relevant_sections(text, reasons))
+    stats.sent_chars += len(sections)
+    stats.full_chars += len(text)
+
+    start = time.perf_counter()
+    with metrics.stage("tier.llm", file_path):
+        reply = await client.complete(build_api_prompt(sections), API_RESPONSE_FORMAT, STRUCTURED_MAX_TOKENS)
+    stats.seconds["llm"].append(time.perf_counter() - start)
+    fields = parse_fields(reply) if reply is not None else None
+    if fields is None:
+        # Keep the regex result, but try the LLM again on the next run
+        if reply is not None:
+            metrics.count("errors", stage="structured_parse")
+        return result, False
+    return merge_llm_fields(result, fields, reasons), True
+
+async def process_resume(client, file_path, stats=None):
+    """Processes one resume through the shared async client, reusing the cached result for unchanged files."""
+    if USE_CACHE:
+        mode = ("structured", STRUCTURED_MAX_TOKENS, STRUCTURED_SECTIONS) if STRUCTURED_OUTPUT else ()
+        if PREFILTER:
+            mode = ("tiered", ESCALATION_THRESHOLD, STRUCTURED_MAX_TOKENS)
+        key_parts = ("New_one_using_LLMa_API_For_Extract", LLAMA_MODEL, MAX_TOKENS, *mode)
+        key, content_hash, result = lookup(file_path, *key_parts)
+        if result is not None:
+            result["File Name"] = os.path.basename(file_path)
+            return result
+
+    text = await asyncio.to_thread(lambda: load_document(file_path).spaced_text)
+    if not text:
+        return build_result(file_path, "")
+    if DEDUP and USE_CACHE:
+        # Runs on the loop thread: the SQLite connections belong to it
+        result, canonical_path = canonical_result(file_path, content_hash, text, *key_parts)
+        if result is not None:
+            # Links always come from this file; the LLM fields are shared with the canonical copy
+            return {**result, "File Name": os.path.basename(file_path), **extract_links(text), "Duplicate Of": canonical_path}
+    if PREFILTER:
+        result, cacheable = await process_tiered(client, file_path, text, stats or TierStats())
+        if USE_CACHE and cacheable:
+            get_cache().put(key, content_hash, file_path, result)
+        return result
+    if STRUCTURED_OUTPUT:
+        result = await complete_structured(client, file_path, text)
+        if result is None:
+            return build_result(file_path, text)
+        if USE_CACHE:
+            get_cache().put(key, content_hash, file_path, result)
+        return result
+    reply = await client.complete(text)
+
+    # A failed API call falls back to the raw text and is never cached
+    if reply is None:
+        return build_result(file_path, text)
+    result = build_result(file_path, reply)
+    if USE_CACHE:
+        get_cache().put(key, content_hash, file_path, result)
+    return result
+
+async def process_files(files, sink):
+    """Processes resumes concurrently as they are discovered, keeping at most MAX_IN_FLIGHT API requests open."""
+    # Bound how many files are parsed and waiting at once so memory stays flat
+    limit = asyncio.Semaphore(MAX_IN_FLIGHT * 2)
+    files = iter(files)
+    stats = TierStats()
+
+    async with DeepInfraClient(API_KEY, LLAMA_MODEL, MAX_TOKENS, base_url=OPENAI_BASE_URL,
+                               max_in_flight=MAX_IN_FLIGHT, requests_per_second=REQUESTS_PER_SECOND) as client:
+        async def bounded(file_path):
+            # One bad file is logged and skipped; it never cancels the rest of the batch
+            try:
+                with metrics.stage("file", file_path):
+                    result = await process_resume(client, file_path, stats)
+                sink.write(os.path.abspath(file_path), result)
+            except Exception as e:
+                metrics.count("errors", stage="file")
+                print(f"Error processing file {file_path}: {e!r}")
+            finally:
+                limit.release()
+
+        tasks = set()
+        while True:
+            await limit.acquire()
+            # Discovery can block while it walks the tree, so wait for the next file off the event loop
+            file_path = await asyncio.to_thread(next, files, None)
+            if file_path is None:
+                limit.release()
+                break
+            task = asyncio.create_task(bounded(file_path))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        await asyncio.gather(*tasks)
+
+    if PREFILTER:
+        stats.report(client)
+
+def format_parquet_row(result):
+    """Flattens one result into string columns."""
+    return {
+        **{k: v for k, v in result.items() if k != "Fields"},
+        "GitHub": ", ".join([f"{k}: {v}" for k, v in result["GitHub"].items()]),
+        "LinkedIn": ", ".join([f"{k}: {v}" for k, v in result["LinkedIn"].items()])
+    }
+
 def process_resumes(folder_or_file_path):
-    """Processes .docx files in a folder or a single file."""
-    results = []
-    
-    if os.path.isdir(folder_or_file_path):
-        files = [os.path.join(folder_or_file_path, f) for f in os.listdir(folder_or_file_path) if f.lower().endswith(".docx")]
-    elif os.path.isfile(folder_or_file_path) and folder_or_file_path.lower().endswith(".docx"):
-        files = [folder_or_file_path]
-    else:
+    """Processes resume files in a folder tree or a single file."""
+    if not (os.path.isdir(folder_or_file_path) or
+            (os.path.isfile(folder_or_file_path) and detect_extension(folder_or_file_path))):
         print("Error: Invalid file or folder path.")
         return
 
-    for file_path in files:
-        text = extract_text_using_llama(file_path)
-        extracted_links = extract_links(text)
-        experience_and_summary = extract_experience_and_summary(text)
-        
-        # Combine all extracted data
-        result = {
-            "File Name": os.path.basename(file_path),
-            **extracted_links,
-            **experience_and_summary
-        }
-        results.append(result)
-
-    # Output results in JSON format
+    # Output results in JSON Lines format, one record appended per resume as it completes
     output_dir = os.path.dirname(folder_or_file_path) if os.path.isfile(folder_or_file_path) else folder_or_file_path
     os.makedirs(output_dir, exist_ok=True)
-    
-    json_output_file = os.path.join(output_dir, "extracted_data.json")
-    with open(json_output_file, "w", encoding="utf-8") as json_file:
-        json.dump(results, json_file, indent=4)
-    
+
+    json_output_file = os.path.join(output_dir, "extracted_data.jsonl")
+    writers = [JsonLinesWriter(json_output_file)]
+    if WRITE_PARQUET:
+        writers.append(ParquetWriter(os.path.join(output_dir, "extracted_data.parquet"), PARQUET_FIELDS, format_parquet_row))
+    if WRITE_STORE:
+        writers.append(CandidateStoreWriter(os.path.join(output_dir, DEFAULT_STORE_NAME)))
+
+    # An interrupted run resumes after the last committed record
+    with ResultSink(writers, os.path.join(output_dir, ".extracted_data.progress")) as sink:
+        # Nested folders are walked in the background while earlier files are already being processed
+        files = (f for f in stream_resumes(folder_or_file_path, exclude=[json_output_file])
+                 if not sink.is_committed(os.path.abspath(f)))
+        asyncio.run(process_files(files, sink))
+
     print(f"Extraction completed! Results saved in '{json_output_file}'")
+    if DEDUP and USE_CACHE:
+        print_cluster_report()
 
 if __name__ == "__main__":
-    folder_or_file = input("Enter the full path of the folder or .docx file: ")
+    folder_or_file = input("Enter the full path of the folder or a resume file (.pdf, .docx, .txt): ")
     process_resumes(folder_or_file)
 
@@ -1,3 +1,9 @@
+import os
+import sys
+import json
+import time
+import joblib
+from collections import OrderedDict
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
@@ -5,51 +11,124 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score, classification_report
 
-# Load dataset
-df = pd.read_csv("E:\\Python\\LLMa\\names-origin.csv")
-
-# Ensure there are no missing values
-df.dropna(inplace=True)
-
-# Convert names to lowercase
-df['name'] = df['name'].str.lower()
-
-# Encode target labels
-df['origin'] = df['origin'].astype('category')
-df['origin_code'] = df['origin'].cat.codes
-
-# Feature extraction using TF-IDF (character-level n-grams)
-vectorizer = TfidfVectorizer(analyzer='char', ngram_range=(2, 4))
-X = vectorizer.fit_transform(df['name'])
-y = df['origin_code']
-
-# Train-test split (80-20)
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
-
-# Train Random Forest
-clf = RandomForestClassifier(n_estimators=200, random_state=42)
-clf.fit(X_train, y_train)
-
-# Predict and evaluate
-y_pred = clf.predict(X_test)
-
-# Convert numeric predictions back to actual origin labels
-y_pred_origins = df['origin'].cat.categories[y_pred]
-
-# Print accuracy & classification report
-print("Random Forest Accuracy:", accuracy_score(y_test, y_pred))
-print(classification_report(y_test, y_pred, target_names=df['origin'].cat.categories))
+# Training data and saved artifacts
+DATA_PATH = "E:\\Python\\LLMa\\names-origin.csv"
+ARTIFACT_DIR = "rf_artifacts"
+MODEL_FILE = "forest.joblib"          # Uncompressed so it can be memory-mapped
+VECTORIZER_FILE = "vectorizer.joblib"
+CATEGORIES_FILE = "categories.json"
+
+# Loaded artifacts (filled by load_model)
+vectorizer = None
+clf = None
+categories = None
+
+# Bulk prediction settings: bounded LRU of recent (name, top_k) results
+CACHE_SIZE = 100000
+TOP_K = 3
+N_JOBS = -1
+_prediction_cache = OrderedDict()
+
+# Train the model and save the artifacts
+def train(data_path=DATA_PATH, artifact_dir=ARTIFACT_DIR):
+    # Load dataset
+    df = pd.read_csv(data_path)
+
+    # Ensure there are no missing values
+    df.dropna(inplace=True)
+
+    # Convert names to lowercase
+    df['name'] = df['name'].str.lower()
+
+    # Encode target labels
+    df['origin'] = df['origin'].astype('category')
+    df['origin_code'] = df['origin'].cat.codes
+
+    # Feature extraction using TF-IDF (character-level n-grams)
+    vectorizer = TfidfVectorizer(analyzer='char', ngram_range=(2, 4), dtype=np.float32)
+    X = vectorizer.fit_transform(df['name'])
+    y = df['origin_code']
+
+    # Train-test split (80-20)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+
+    # Train Random Forest
+    clf = RandomForestClassifier(n_estimators=200, random_state=42, n_jobs=-1)
+    clf.fit(X_train, y_train)
+
+    # Predict and evaluate
+    y_pred = clf.predict(X_test)
+
+    # Print accuracy & classification report
+    categories = [str(category) for category in df['origin'].cat.categories]
+    print("Random Forest Accuracy:", accuracy_score(y_test, y_pred))
+    print(classification_report(y_test, y_pred, target_names=categories))
+
+    # Save artifacts: the forest uncompressed (memory-mappable), the vectorizer and the category list
+    os.makedirs(artifact_dir, exist_ok=True)
+    clf.n_jobs = None
+    joblib.dump(clf, os.path.join(artifact_dir, MODEL_FILE))
+    joblib.dump(vectorizer, os.path.join(artifact_dir, VECTORIZER_FILE), compress=3)
+    with open(os.path.join(artifact_dir, CATEGORIES_FILE), "w", encoding="utf-8") as f:
+        json.dump(categories, f)
+    print(f"Artifacts saved in '{artifact_dir}'.")
+
+# Load the saved artifacts once. The forest file is memory-mapped, so every
+# process reads it straight from the shared OS page cache. sklearn copies each
+# tree into its own buffers, so to share those pages too, call load_model()
+# before forking worker processes: predictions never write to the trees, so
+# the pages stay shared copy-on-write.
+def load_model(artifact_dir=ARTIFACT_DIR):
+    global vectorizer, clf, categories
+    if clf is None:
+        vectorizer = joblib.load(os.path.join(artifact_dir, VECTORIZER_FILE))
+        clf = joblib.load(os.path.join(artifact_dir, MODEL_FILE), mmap_mode="r")
+        with open(os.path.join(artifact_dir, CATEGORIES_FILE), "r", encoding="utf-8") as f:
+            categories = json.load(f)
+    return vectorizer, clf, categories
+
+# Function to predict the top-k origins, with probabilities, for many names at once.
+# Repeated names are de-duplicated and served from the LRU cache; only the
+# misses go through one sparse transform and one parallel predict_proba call.
+def predict_origins(names, top_k=TOP_K, n_jobs=N_JOBS):
+    keys = [name.lower() for name in names]
+    results = {}
+    misses = []
+    for key in dict.fromkeys(keys):
+        cached = _prediction_cache.get((key, top_k))
+        if cached is None:
+            misses.append(key)
+        else:
+            _prediction_cache.move_to_end((key, top_k))
+            results[key] = cached
+
+    if misses:
+        vectorizer, clf, categories = load_model()
+        clf.n_jobs = n_jobs
+        probabilities = clf.predict_proba(vectorizer.transform(misses))
+        top = np.argsort(-probabilities, axis=1)[:, :top_k]
+        for key, row, indices in zip(misses, probabilities, top):
+            results[key] = [(categories[clf.classes_[i]], float(row[i])) for i in indices]
+            _prediction_cache[(key, top_k)] = results[key]
+        while len(_prediction_cache) > CACHE_SIZE:
+            _prediction_cache.popitem(last=False)
+
+    return [results[key] for key in keys]
 
 # Function to predict origin of a given name
 def predict_origin(name):
-    name = name.lower()
-    name_vectorized = vectorizer.transform([name])
-    predicted_code = clf.predict(name_vectorized)[0]
-    predicted_origin = df['origin'].cat.categories[predicted_code]
-    return predicted_origin
+    return predict_origins([name], top_k=1)[0][0][0]
+
+# Serve predictions interactively from the saved artifacts
+def serve(artifact_dir=ARTIFACT_DIR):
+    if not os.path.exists(os.path.join(artifact_dir, MODEL_FILE)):
+        print(f"No trained model in '{artifact_dir}'. Run: python Random_Fortest_model.py train")
+        return
+
+    start = time.perf_counter()
+    load_model(artifact_dir)
+    print(f"Model loaded in {time.perf_counter() - start:.2f}s")
 
-# Main loop to take user input and predict origin
-if __name__ == "__main__":
     while True:
         name = input("Enter a name (or type 'exit' to quit): ")
         if name.lower() == 'exit':
@@ -57,11 +136,12 @@ if __name__ == "__main__":
         predicted_origin = predict_origin(name)
         print(f"Predicted origin for '{name}': {predicted_origin}\n")
 
-
-
-
-
-
-
-
-
+# Usage: python Random_Fortest_model.py [train | serve]  (default: serve)
+if __name__ == "__main__":
+    mode = sys.argv[1] if len(sys.argv) > 1 else "serve"
+    if mode == "train":
+        train()
+    elif mode == "serve":
+        serve()
+    else:
+        print("Usage: python Random_Fortest_model.py [train | serve]")
@@ -1,38 +1,59 @@
 import os
 import re
-import csv
-import docx2txt
+import asyncio
 import requests
+from deepinfra_client import DeepInfraClient, OPENAI_BASE_URL, REQUEST_TIMEOUT
+import metrics
+from resume_loader import load_document, detect_extension
+from file_discovery import stream_resumes
+from result_cache import get_cache, lookup
+from result_writers import CsvWriter, TextWriter, ParquetWriter, ResultSink
 
 # Regular expressions to detect GitHub & LinkedIn links
 GITHUB_PATTERN = r"https?://(?:www\.)?github\.com/[a-zA-Z0-9_-]+"
 LINKEDIN_PATTERN = r"https?://(?:www\.)?linkedin\.com/in/[a-zA-Z0-9_-]+"
 
 # Replace with your actual DeepInfra API Key
-OPENAI_BASE_URL = "https://api.deepinfra.com/v1/openai"
 API_KEY = "E:\\Python\\New1\\API_key"
+LLAMA_MODEL = "meta-llama/Meta-Llama-3.1-70B-Instruct"
+MAX_TOKENS = 512
 
-def extract_text_using_llama(file_path):
-    """Extracts text from a .docx file and processes it with LLaMA-3."""
+# Concurrency against the API: open requests and optional client-side rate limit
+MAX_IN_FLIGHT = 8
+REQUESTS_PER_SECOND = 4  # Client-side cap; None disables it and relies on the 429 backoff alone
+
+# Skip the API call for files whose content was already processed
+USE_CACHE = True
+
+# Also write results as a Parquet dataset (requires pyarrow)
+WRITE_PARQUET = False
+
+def ask_llama(text):
+    """Sends resume text to LLaMA-3 and returns the reply, or None if the call failed."""
     try:
-        text = docx2txt.process(file_path)
-        if not text:
-            return ""
-        
         response = requests.post(
             f"{OPENAI_BASE_URL}/chat/completions",
             headers={"Authorization": f"Bearer {API_KEY}"},
             json={
-                "model": "meta-llama/Meta-Llama-3.1-70B-Instruct",
+                "model": LLAMA_MODEL,
                 "messages": [{"role": "user", "content": text}],
-                "max_tokens": 512
-            }
+                "max_tokens": MAX_TOKENS
+            },
+            timeout=REQUEST_TIMEOUT
         )
 
-        return response.json()["choices"][0]["message"]["content"].strip() if response.status_code == 200 else text
+        return response.json()["choices"][0]["message"]["content"].strip() if response.status_code == 200 else None
     except requests.exceptions.RequestException as e:
         print(f"Request failed: {e}")
-        return text
+        return None
+
+def extract_text_using_llama(file_path):
+    """Extracts text from a .docx file and processes it with LLaMA-3."""
+    text = load_document(file_path).spaced_text
+    if not text:
+        return ""
+    reply = ask_llama(text)
+    return text if reply is None else reply
 
 def validate_link(link, pattern):
     return bool(re.fullmatch(pattern, link))
@@ -47,44 +68,102 @@ def extract_links(text):
         "LinkedIn": {link: "Valid" if validate_link(link, LINKEDIN_PATTERN) else "Invalid" for link in linkedin_links} or {"Not Available": ""}
     }
 
+def build_result(file_path, text):
+    """Builds the output record for one resume from its (LLM-processed) text."""
+    return {"File Name": os.path.basename(file_path), **extract_links(text)}
+
+async def process_resume(client, file_path):
+    """Processes one resume through the shared async client, reusing the cached result for unchanged files."""
+    if USE_CACHE:
+        key, content_hash, result = lookup(file_path, "Using_LLaMA_API_For_extract", LLAMA_MODEL, MAX_TOKENS)
+        if result is not None:
+            result["File Name"] = os.path.basename(file_path)
+            return result
+
+    text = await asyncio.to_thread(lambda: load_document(file_path).spaced_text)
+    if not text:
+        return build_result(file_path, "")
+    reply = await client.complete(text)
+
+    # A failed API call falls back to the raw text and is never cached
+    if reply is None:
+        return build_result(file_path, text)
+    result = build_result(file_path, reply)
+    if USE_CACHE:
+        get_cache().put(key, content_hash, file_path, result)
+    return result
+
+async def process_files(files, sink):
+    """Processes resumes concurrently as they are discovered, keeping at most MAX_IN_FLIGHT API requests open."""
+    # Bound how many files are parsed and waiting at once so memory stays flat
+    limit = asyncio.Semaphore(MAX_IN_FLIGHT * 2)
+    files = iter(files)
+
+    async with DeepInfraClient(API_KEY, LLAMA_MODEL, MAX_TOKENS, base_url=OPENAI_BASE_URL,
+                               max_in_flight=MAX_IN_FLIGHT, requests_per_second=REQUESTS_PER_SECOND) as client:
+        async def bounded(file_path):
+            # One bad file is logged and skipped; it never cancels the rest of the batch
+            try:
+                with metrics.stage("file", file_path):
+                    result = await process_resume(client, file_path)
+                sink.write(os.path.abspath(file_path), result)
+            except Exception as e:
+                metrics.count("errors", stage="file")
+                print(f"Error processing file {file_path}: {e!r}")
+            finally:
+                limit.release()
+
+        tasks = set()
+        while True:
+            await limit.acquire()
+            # Discovery can block while it walks the tree, so wait for the next file off the event loop
+            file_path = await asyncio.to_thread(next, files, None)
+            if file_path is None:
+                limit.release()
+                break
+            task = asyncio.create_task(bounded(file_path))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        await asyncio.gather(*tasks)
+
+def format_csv_row(result):
+    """Formats one result as a CSV row."""
+    return {
+        "File Name": result["File Name"],
+        "GitHub": ", ".join([f"{k}: {v}" for k, v in result["GitHub"].items()]),
+        "LinkedIn": ", ".join([f"{k}: {v}" for k, v in result["LinkedIn"].items()])
+    }
+
+def format_text_record(result):
+    """Formats one result as a block of the text report."""
+    return f"File Name: {result['File Name']}\nGitHub: {', '.join([f'{k}: {v}' for k, v in result['GitHub'].items()])}\nLinkedIn: {', '.join([f'{k}: {v}' for k, v in result['LinkedIn'].items()])}\n\n"
+
 def process_resumes(folder_or_file_path):
-    """Processes .docx files in a folder or a single file."""
-    results = []
-    
-    if os.path.isdir(folder_or_file_path):
-        files = [os.path.join(folder_or_file_path, f) for f in os.listdir(folder_or_file_path) if f.lower().endswith(".docx")]
-    elif os.path.isfile(folder_or_file_path) and folder_or_file_path.lower().endswith(".docx"):
-        files = [folder_or_file_path]
-    else:
+    """Processes resume files in a folder tree or a single file."""
+    if not (os.path.isdir(folder_or_file_path) or
+            (os.path.isfile(folder_or_file_path) and detect_extension(folder_or_file_path))):
         print("Error: Invalid file or folder path.")
         return
 
-    for file_path in files:
-        text = extract_text_using_llama(file_path)
-        extracted_links = extract_links(text)
-        results.append({"File Name": os.path.basename(file_path), **extracted_links})
-
     output_dir = os.path.dirname(folder_or_file_path) if os.path.isfile(folder_or_file_path) else folder_or_file_path
     os.makedirs(output_dir, exist_ok=True)
-    
+
+    # Results are appended as they complete; an interrupted run resumes after the last commit
     csv_output_file = os.path.join(output_dir, "extracted_links.csv")
-    with open(csv_output_file, "w", encoding="utf-8", newline='') as csv_file:
-        writer = csv.DictWriter(csv_file, fieldnames=["File Name", "GitHub", "LinkedIn"])
-        writer.writeheader()
-        for result in results:
-            writer.writerow({
-                "File Name": result["File Name"],
-                "GitHub": ", ".join([f"{k}: {v}" for k, v in result["GitHub"].items()]),
-                "LinkedIn": ", ".join([f"{k}: {v}" for k, v in result["LinkedIn"].items()])
-            })
-    
     text_output_file = os.path.join(output_dir, "extracted_links.txt")
-    with open(text_output_file, "w", encoding="utf-8") as text_file:
-        for result in results:
-            text_file.write(f"File Name: {result['File Name']}\nGitHub: {', '.join([f'{k}: {v}' for k, v in result['GitHub'].items()])}\nLinkedIn: {', '.join([f'{k}: {v}' for k, v in result['LinkedIn'].items()])}\n\n")
-    
+    fieldnames = ["File Name", "GitHub", "LinkedIn"]
+    writers = [CsvWriter(csv_output_file, fieldnames, format_csv_row), TextWriter(text_output_file, format_text_record)]
+    if WRITE_PARQUET:
+        writers.append(ParquetWriter(os.path.join(output_dir, "extracted_links.parquet"), fieldnames, format_csv_row))
+
+    with ResultSink(writers, os.path.join(output_dir, ".extracted_links.progress")) as sink:
+        # Nested folders are walked in the background while earlier files are already being processed
+        files = (f for f in stream_resumes(folder_or_file_path, exclude=[text_output_file])
+                 if not sink.is_committed(os.path.abspath(f)))
+        asyncio.run(process_files(files, sink))
+
     print(f"Extraction completed! Results saved in '{csv_output_file}' and '{text_output_file}'")
 
 if __name__ == "__main__":
-    folder_or_file = input("Enter the full path of the folder or .docx file: ")
+    folder_or_file = input("Enter the full path of the folder or a resume file (.pdf, .docx, .txt): ")
     process_resumes(folder_or_file)
\ No newline at end of file
@@ -0,0 +1,199 @@
+import os
+import re
+import sys
+import random
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+from sklearn.metrics import accuracy_score, classification_report
+
+# Saved artifact (vectorizer + weights) next to this module; trained by `python address_classifier.py train`,
+# or on first use when it is missing
+ARTIFACT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "address_model.joblib")
+MIN_SCORE = 0.5
+TRAINING_SIZE = 20000
+
+# Candidate spans: one line (minus an "Address:" label) with a comma, 8-120 characters,
+# no e-mail or URL, and a digit or at least two commas
+MIN_SPAN_CHARS = 8
+MAX_SPAN_CHARS = 120
+ADDRESS_LABEL = re.compile(r"^\s*(?:(?:present|permanent|mailing|home)\s+)?address\s*[:\-]\s*", re.IGNORECASE)
+DIGIT = re.compile(r"\d")
+
+# The examples the notebook trained on for every resume; kept as part of the training set
+SEED_DATA = [
+    ("123 Main St, Springfield", 1),
+    ("456 Elm St, Somecity, CA 98765", 1),
+    ("Main Street", 0),
+    ("Apartment 23, 789 North Ave", 0),
+]
+
+STREETS = ("Main", "Elm", "Oak", "Park", "Lake", "Hill", "Maple", "Cedar", "Church", "Station", "Mirpur", "Gulshan",
+           "Banani", "Dhanmondi", "Baker", "King", "Queen", "Market", "River", "College", "Airport", "Green")
+SUFFIXES = ("St", "Street", "Ave", "Avenue", "Rd", "Road", "Lane", "Blvd", "Drive", "Way", "Court", "Place")
+CITIES = ("Springfield", "Dhaka", "Chittagong", "Sylhet", "Austin", "Berlin", "Toronto", "Bangalore", "London",
+          "Boston", "Seattle", "Karachi", "Lahore", "Mumbai", "Delhi", "Sydney", "Dublin", "Madrid", "Tokyo")
+REGIONS = ("CA", "TX", "NY", "WA", "ON", "NSW", "Dhaka Division", "Karnataka", "Bavaria")
+COUNTRIES = ("Bangladesh", "USA", "Germany", "Canada", "India", "UK", "Pakistan", "Australia", "Ireland", "Spain")
+AREAS = ("Mirpur 10", "Uttara Sector 7", "Gulshan 2", "Block C", "Sector 4", "Bashundhara R/A", "Mohammadpur")
+WORDS = ("led", "team", "built", "python", "data", "project", "reduced", "latency", "customers", "delivered",
+         "developer", "engineer", "analysis", "cloud", "university", "bsc", "gpa", "present", "skills", "sql")
+MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+# Function to make one full address in a random common layout
+def make_address(rng):
+    number, street, suffix = rng.randint(1, 9999), rng.choice(STREETS), rng.choice(SUFFIXES)
+    city, country, region = rng.choice(CITIES), rng.choice(COUNTRIES), rng.choice(REGIONS)
+    layouts = (
+        f"{number} {street} {suffix}, {city}",
+        f"{number} {street} {suffix}, {city}, {region} {rng.randint(10000, 99999)}",
+        f"House {rng.randint(1, 99)}, Road {rng.randint(1, 30)}, {city}, {country}",
+        f"House {rng.randint(1, 99)}, Road {rng.randint(1, 30)}, {rng.choice(AREAS)}, {city}-{rng.randint(1000, 1399)}",
+        f"Flat {rng.randint(1, 20)}{rng.choice('ABCD')}, {number} {street} {suffix}, {city} {rng.randint(1000, 9999)}",
+        f"{number} {street} {suffix}, Apt {rng.randint(1, 400)}, {city}, {country}",
+        f"{rng.choice(AREAS)}, {city}, {country}",
+        f"{number}/{rng.randint(1, 9)} {street} {suffix}, {city}, {country}",
+    )
+    return rng.choice(layouts)
+
+# Function to make one comma-separated line that is not a full address
+def make_non_address(rng):
+    number, street, suffix = rng.randint(1, 9999), rng.choice(STREETS), rng.choice(SUFFIXES)
+    words = lambda count: " ".join(rng.choice(WORDS) for _ in range(count)).capitalize()
+    layouts = (
+        f"{street} {suffix}",
+        f"Apartment {rng.randint(1, 99)}, {number} {street} {suffix}",
+        f"{rng.choice(CITIES)}, {rng.choice(COUNTRIES)}",
+        f"{words(4)}, {words(3)} {rng.randint(2, 50)}%, {words(2)}",
+        f"{rng.choice(MONTHS)} {rng.randint(2010, 2024)} - {rng.choice(MONTHS)} {rng.randint(2010, 2024)}, {words(2)}",
+        f"GPA {rng.randint(2, 3)}.{rng.randint(0, 99):02d}/4.00, {words(2)}, {rng.randint(2010, 2024)}",
+        f"Phone: +{rng.randint(1, 999)} {rng.randint(1000000, 99999999)}, {words(1)}",
+        f"{words(1)}, {words(1)}, {words(1)}, {words(1)}",
+        f"{words(6)} {rng.randint(1, 20)} {words(2)}, {words(3)}",
+        f"Managed {rng.randint(2, 30)} engineers across {rng.randint(2, 5)} sites, {words(3)}",
+    )
+    return rng.choice(layouts)
+
+# Function to build a labelled training set: the notebook's examples plus synthetic spans
+def make_training_data(size=TRAINING_SIZE, seed=0):
+    rng = random.Random(seed)
+    data = list(SEED_DATA)
+    for _ in range(size // 2):
+        data.append((make_address(rng), 1))
+        data.append((make_non_address(rng), 0))
+    return data
+
+# Digits all look alike to the model: "House 12" and "House 87" share features
+def normalize(span):
+    return DIGIT.sub("0", span.lower())
+
+
+# Function to list a text's candidate address spans with a cheap line scan
+def candidate_spans(text):
+    spans = []
+    for line in text.splitlines():
+        if "," not in line or "@" in line or "://" in line:
+            continue
+        span = ADDRESS_LABEL.sub("", line).strip(" \t,;.")
+        if MIN_SPAN_CHARS <= len(span) <= MAX_SPAN_CHARS and (DIGIT.search(span) or span.count(",") >= 2):
+            spans.append(span)
+    return spans
+
+
+class AddressClassifier:
+    """Scores candidate address spans with a character n-gram logistic regression.
+
+    Spans from a whole batch of resumes go through one vectorizer transform and
+    one sparse matrix-vector product against the saved weights.
+    """
+
+    def __init__(self, vectorizer, coef, intercept):
+        self.vectorizer = vectorizer
+        self.coef = coef
+        self.intercept = intercept
+
+    @classmethod
+    def train(cls, data):
+        texts, labels = zip(*data)
+        vectorizer = TfidfVectorizer(analyzer="char_wb", ngram_range=(2, 4), min_df=2, sublinear_tf=True,
+                                     dtype=np.float32)
+        model = LogisticRegression(max_iter=1000, C=4.0)
+        model.fit(vectorizer.fit_transform([normalize(text) for text in texts]), labels)
+        return cls(vectorizer, model.coef_[0].astype(np.float32), float(model.intercept_[0]))
+
+    def save(self, path=ARTIFACT_PATH):
+        joblib.dump({"vectorizer": self.vectorizer, "coef": self.coef, "intercept": self.intercept}, path, compress=3)
+
+    @classmethod
+    def load(cls, path=ARTIFACT_PATH):
+        artifact = joblib.load(path)
+        return cls(artifact["vectorizer"], artifact["coef"], artifact["intercept"])
+
+    def score_spans(self, spans):
+        """Probability that each span is a full address."""
+        if not spans:
+            return np.zeros(0, dtype=np.float32)
+        X = self.vectorizer.transform([normalize(span) for span in spans])
+        return 1.0 / (1.0 + np.exp(-(X @ self.coef + self.intercept)))
+
+    def find_addresses(self, texts, min_score=MIN_SCORE):
+        """Returns, per text, its address spans as (span, score), best first."""
+        spans, owners = [], []
+        for index, text in enumerate(texts):
+            for span in candidate_spans(text):
+                spans.append(span)
+                owners.append(index)
+        results = [[] for _ in texts]
+        for span, owner, score in zip(spans, owners, self.score_spans(spans)):
+            if score >= min_score:
+                results[owner].append((span, float(score)))
+        for found in results:
+            found.sort(key=lambda item: item[1], reverse=True)
+        return results
+
+    def has_full_address(self, texts, min_score=MIN_SCORE):
+        return [bool(found) for found in self.find_addresses(texts, min_score)]
+
+
+# Loaded once per process (see load_classifier)
+_classifier = None
+
+def load_classifier(path=ARTIFACT_PATH):
+    global _classifier
+    if _classifier is None:
+        if os.path.exists(path):
+            _classifier = AddressClassifier.load(path)
+        else:
+            print(f"No address model at '{path}'; training one (a few seconds, once).")
+            _classifier = train(path)
+    return _classifier
+
+# Function to train on the synthetic set, report held-out accuracy and save the artifact
+def train(path=ARTIFACT_PATH, size=TRAINING_SIZE):
+    data = make_training_data(size)
+    train_data, test_data = train_test_split(data, test_size=0.2, random_state=42, stratify=[label for _, label in data])
+    classifier = AddressClassifier.train(train_data)
+    texts, labels = zip(*test_data)
+    predicted = classifier.score_spans(list(texts)) >= MIN_SCORE
+    print("Address span accuracy:", accuracy_score(labels, predicted))
+    print(classification_report(labels, predicted, target_names=["other", "address"]))
+    classifier.save(path)
+    print(f"Artifact saved in '{path}'.")
+    return classifier
+
+# Command line: train [artifact] | find <resume>...
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    if command == "train":
+        train(sys.argv[2] if len(sys.argv) > 2 else ARTIFACT_PATH)
+    elif command == "find" and len(sys.argv) > 2:
+        from resume_loader import load_document
+        paths = sys.argv[2:]
+        for path, found in zip(paths, load_classifier().find_addresses([load_document(path).text for path in paths])):
+            print(f"{path}: " + ("; ".join(f"{span} ({score:.2f})" for span, score in found) or "no full address"))
+    else:
+        print("Usage: python address_classifier.py [train [artifact] | find <resume>...]")
+        sys.exit(1)
@@ -0,0 +1,165 @@
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, precision_score, recall_score
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from address_classifier import AddressClassifier, ARTIFACT_PATH, train
+from make_corpus import make_resume
+from bench_sections import render
+
+COUNT = 2000
+BATCH_SIZE = 500
+
+# Hand-written contact lines in layouts make_address / make_non_address never produce, so the
+# span model is not just scored on its own training generator
+HAND_WRITTEN_ADDRESSES = [
+    "Plot 14, Road 3/A, Nikunja-2, Khilkhet, Dhaka 1229",
+    "221B Baker Street, London NW1 6XE, United Kingdom",
+    "1600 Amphitheatre Parkway, Mountain View, CA 94043",
+    "Village: Charpara, Post: Madhupur, Upazila: Tangail Sadar, Tangail",
+    "Flat 5B, Concord Tower, 113 Kazi Nazrul Islam Avenue, Dhaka-1000",
+    "C/O Abdul Karim, 45 Station Road, Khulna 9100, Bangladesh",
+    "742 Evergreen Terrace, Springfield, OR 97403",
+    "Room 1203, Building 7, 88 Century Avenue, Pudong, Shanghai",
+    "12 Rue de Rivoli, 75004 Paris, France",
+    "Hauptstrasse 5, 10115 Berlin, Germany",
+    "3rd Floor, 27/1 Green Road, Panthapath, Dhaka 1205",
+    "B-14, Sector 62, Noida, Uttar Pradesh 201301",
+    "No. 8, 4th Cross, Indiranagar, Bengaluru 560038",
+    "Apt 4C, 350 W 42nd St, New York, NY 10036",
+    "Unit 9, 14 George Street, Sydney NSW 2000",
+    "Holding 56, Ward 4, Sadar Road, Barishal 8200",
+    "House #7, Lane 2, Block F, Banani, Dhaka-1213",
+    "Present address: 19/A Lake Circus, Kalabagan, Dhaka 1205",
+    "Permanent address: Vill. Rampur, P.O. Sonargaon, Dist. Narayanganj",
+    "Address - 55 Jubilee Road, Chattogram 4000, Bangladesh",
+]
+HAND_WRITTEN_OTHER = [
+    "B.Sc. in Computer Science, BUET, 2019, CGPA 3.62/4.00",
+    "Software Engineer, Pathao Ltd, Jan 2020 - Present",
+    "Reduced p95 latency by 40%, saving $12k per month",
+    "Mobile: +880 1712-345678, WhatsApp available",
+    "Reference: Dr. Rahman, Professor, CSE Department, University of Dhaka",
+    "HSC, Notre Dame College, 2014, GPA 5.00",
+    "Team of 6, 3 time zones, 2 product launches",
+    "IELTS 7.5, TOEFL 105, GRE 320",
+    "Date of Birth: 12 March, 1996",
+    "Nationality: Bangladeshi, Religion: Islam, Blood group: B+",
+    "Springfield, Illinois, USA",
+    "Winner, ICPC Dhaka Regional 2018, Team Lead",
+    "AWS Certified, 2022, Kubernetes CKA, 2023",
+    "Worked on 3 projects, 2 internal tools, 1 open-source library",
+    "Expected salary: 80,000 BDT, negotiable",
+    "Main Street Cafe, part-time barista, 2015",
+    "Sylhet, Bangladesh (willing to relocate)",
+    "Python, Go, SQL, Docker, 5 years",
+    "Gulshan Avenue branch, 2 years, 30 clients",
+    "Dhaka, Bangladesh",
+]
+
+
+# The notebook's approach: refit on four examples for every resume, then classify the whole text
+def train_address_model():
+    data = [
+        ("123 Main St, Springfield", 1),
+        ("456 Elm St, Somecity, CA 98765", 1),
+        ("Main Street", 0),
+        ("Apartment 23, 789 North Ave", 0)
+    ]
+    texts, labels = zip(*data)
+    vectorizer = CountVectorizer()
+    X = vectorizer.fit_transform(texts)
+    model = LogisticRegression()
+    model.fit(X, labels)
+    return vectorizer, model
+
+def check_full_address(text, vectorizer, model):
+    X = vectorizer.transform([text])
+    return bool(model.predict(X)[0])
+
+# Function to build resumes where only every other one keeps its full address; the rest keep
+# just "City, Country", the hard negative; returns (texts, labels)
+def make_labelled_resumes(count, pages, seed):
+    rng = random.Random(seed)
+    texts, labels = [], []
+    for index in range(count):
+        sections = make_resume(rng, pages)
+        has_address = index % 2 == 0
+        if not has_address:
+            heading, contact = sections[0]
+            sections[0] = (heading, [", ".join(line.split(", ")[-2:]) if line.startswith("House ") else line
+                                     for line in contact])
+        texts.append(render(sections))
+        labels.append(has_address)
+    return texts, labels
+
+# Function to build the same resumes with the contact address line swapped for a hand-written
+# address (every other resume) or a hand-written non-address line
+def make_hand_written_resumes(count, pages, seed):
+    rng = random.Random(seed)
+    texts, labels = [], []
+    for index in range(count):
+        sections = make_resume(rng, pages)
+        has_address = index % 2 == 0
+        line = rng.choice(HAND_WRITTEN_ADDRESSES if has_address else HAND_WRITTEN_OTHER)
+        heading, contact = sections[0]
+        sections[0] = (heading, [line if old.startswith("House ") else old for old in contact])
+        texts.append(render(sections))
+        labels.append(has_address)
+    return texts, labels
+
+def report(label, labels, predicted, seconds):
+    print(f"{label:<28} {len(labels) / seconds:>10.0f} {accuracy_score(labels, predicted):>9.3f} "
+          f"{precision_score(labels, predicted, zero_division=0):>10.3f} {recall_score(labels, predicted):>7.3f}")
+
+# Command line: python benchmarks/bench_address.py [--count N] [--artifact address_model.joblib]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the saved span classifier with per-resume retraining.")
+    parser.add_argument("--count", type=int, default=COUNT)
+    parser.add_argument("--pages", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--artifact", default=ARTIFACT_PATH, help="trained into a temporary file when missing")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        artifact = args.artifact
+        if not os.path.exists(artifact):
+            artifact = os.path.join(temp_dir, "address_model.joblib")
+            train(artifact)
+        classifier = AddressClassifier.load(artifact)
+
+    for title, make in (("synthetic address layouts", make_labelled_resumes),
+                        ("hand-written contact lines (held out)", make_hand_written_resumes)):
+        texts, labels = make(args.count, args.pages, args.seed)
+        print(f"\n{title}: {len(texts)} resumes, {sum(labels)} with a full address")
+        print(f"{'approach':<28} {'resumes/s':>10} {'accuracy':>9} {'precision':>10} {'recall':>7}")
+
+        start = time.perf_counter()
+        predicted = []
+        for text in texts:
+            vectorizer, model = train_address_model()
+            predicted.append(check_full_address(text, vectorizer, model))
+        report("per-resume retrain (before)", labels, predicted, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        predicted = []
+        for offset in range(0, len(texts), args.batch_size):
+            predicted += classifier.has_full_address(texts[offset:offset + args.batch_size])
+        report("saved span model, batched", labels, predicted, time.perf_counter() - start)
+
+    # Span level: each hand-written line on its own
+    lines = HAND_WRITTEN_ADDRESSES + HAND_WRITTEN_OTHER
+    line_labels = [True] * len(HAND_WRITTEN_ADDRESSES) + [False] * len(HAND_WRITTEN_OTHER)
+    predicted = classifier.has_full_address(lines)
+    print(f"\nhand-written lines: {accuracy_score(line_labels, predicted):.3f} accuracy")
+    for line, label, guess in zip(lines, line_labels, predicted):
+        if label != guess:
+            print(f"  {'missed' if label else 'false positive'}: {line}")
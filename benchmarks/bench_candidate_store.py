@@ -0,0 +1,81 @@
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from candidate_store import CandidateStore
+from make_corpus import FIRST_NAMES, LAST_NAMES, make_sentence
+
+COUNT = 100000
+BATCH_SIZE = 1000
+QUERY_REPEAT = 20
+SKILLS = ("python", "java", "sql", "react", "docker", "kubernetes", "aws", "pandas", "django", "go", "rust", "spark")
+
+
+# Function to build one synthetic record shaped like the pipelines' results
+def make_record(rng, index):
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    handle = f"{first}{last}{index}".lower()
+    return {
+        "File Name": f"resume_{index:06d}.docx",
+        "Name": f"{first} {last}",
+        "Email": f"{handle}@example.com",
+        "Phones": [f"+8801{index:09d}"],
+        "Summary": " ".join(make_sentence(rng) for _ in range(3)),
+        "Experience": " ".join(make_sentence(rng) for _ in range(5)),
+        "Skills": ", ".join(rng.sample(SKILLS, 4)),
+        "GitHub": {f"https://github.com/{handle}": "Valid"} if rng.random() < 0.4 else {"Not Available": ""},
+        "LinkedIn": {f"https://www.linkedin.com/in/{handle}": "Valid"} if rng.random() < 0.6 else {"Not Available": ""},
+    }
+
+def time_query(func, repeat=QUERY_REPEAT):
+    results = func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples), len(results)
+
+# Command line: python benchmarks/bench_candidate_store.py [--count N] [--store path]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load synthetic candidates into the store and time typical queries.")
+    parser.add_argument("--count", type=int, default=COUNT)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--store", help="keep the store at this path instead of a temporary file")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = CandidateStore(args.store or os.path.join(temp_dir, "candidates.sqlite"))
+        records = [(f"/resumes/resume_{index:06d}.docx", make_record(rng, index)) for index in range(args.count)]
+
+        start = time.perf_counter()
+        for offset in range(0, len(records), args.batch_size):
+            store.upsert_many(records[offset:offset + args.batch_size])
+        elapsed = time.perf_counter() - start
+        print(f"Upserted {len(records)} records in {elapsed:.2f}s ({len(records) / elapsed:.0f}/s, "
+              f"batches of {args.batch_size}); store is {store.stats()['bytes'] / 2**20:.1f} MB")
+
+        probe = next(record for _, record in records[len(records) // 2:] if "Not Available" not in record["LinkedIn"])
+        queries = {
+            "github + 'python' (limit 50)": lambda: store.search("python", github=True),
+            "github + 'python' ranked": lambda: store.search("python", github=True, ranked=True),
+            "github + 'python' (all)": lambda: store.search("python", github=True, limit=-1),
+            "'kubernetes AND rust'": lambda: store.search("kubernetes AND rust"),
+            "email": lambda: store.search(email=probe["Email"]),
+            "phone (local format)": lambda: store.search(phone="0" + probe["Phones"][0][4:]),
+            "link url": lambda: store.search(link=next(iter(probe["LinkedIn"]))),
+            "name": lambda: store.search(name=probe["Name"], limit=10),
+        }
+        print(f"{'query':<32} {'median ms':>10} {'rows':>8}")
+        for label, query in queries.items():
+            seconds, rows = time_query(query)
+            print(f"{label:<32} {seconds * 1000:>10.2f} {rows:>8}")
+        store.close()
@@ -0,0 +1,101 @@
+import io
+import os
+import sys
+import time
+import zlib
+import struct
+import random
+import argparse
+import tempfile
+import tracemalloc
+import docx
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import docx_stream
+from make_corpus import make_resume
+
+IMAGE_MB = (0, 1, 5, 20)
+REPEAT = 5
+
+
+# The python-docx reader resume_loader used before docx_stream: the whole package, media included, is loaded
+def iter_docx_paragraphs(parent):
+    for child in parent.iterchildren():
+        if child.tag.endswith("}p"):
+            yield Paragraph(child, None).text
+        elif child.tag.endswith("}tbl"):
+            for row in Table(child, None).rows:
+                for cell in row.cells:
+                    yield from iter_docx_paragraphs(cell._tc)
+
+def legacy_read(path):
+    document = docx.Document(path)
+    headers, footers = [], []
+    for section in document.sections:
+        if not section.header.is_linked_to_previous:
+            headers.extend(iter_docx_paragraphs(section.header._element))
+        if not section.footer.is_linked_to_previous:
+            footers.extend(iter_docx_paragraphs(section.footer._element))
+    paragraphs = headers + list(iter_docx_paragraphs(document.element.body)) + footers
+    return paragraphs, sum(1 for rel in document.part.rels.values() if "image" in rel.reltype)
+
+def streaming_read(path):
+    return docx_stream.read_paragraphs(path), docx_stream.count_images(path)
+
+# Function to build a PNG of roughly `size` bytes; random pixel data keeps it incompressible
+def make_png(size, rng):
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    header = struct.pack(">IIBBBBB", 64, 64, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", rng.randbytes(size))
+            + chunk(b"IEND", b""))
+
+# Function to write a resume .docx with one photo of `image_mb` megabytes
+def write_resume(path, image_mb, rng):
+    document = docx.Document()
+    document.sections[0].header.paragraphs[0].text = "Curriculum Vitae"
+    if image_mb:
+        document.add_picture(io.BytesIO(make_png(int(image_mb * 2**20), rng)))
+    for heading, lines in make_resume(rng, pages=2):
+        if heading:
+            document.add_heading(heading.title(), level=2)
+        for line in lines:
+            document.add_paragraph(line)
+    document.save(path)
+
+# Best wall time and the peak traced allocation of one read
+def measure(read, path, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = read(path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    read(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, result
+
+# Command line: python benchmarks/bench_docx.py [--image-mb 0,1,5,20]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare python-docx with the streaming reader as image payloads grow.")
+    parser.add_argument("--image-mb", default=",".join(map(str, IMAGE_MB)))
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'image MB':>8} {'file MB':>8} {'python-docx ms':>15} {'peak MB':>8} {'streaming ms':>13} {'peak MB':>8} {'same':>5}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for image_mb in map(float, args.image_mb.split(",")):
+            path = os.path.join(temp_dir, f"resume_{image_mb:g}mb.docx")
+            write_resume(path, image_mb, random.Random(rng.random()))
+            legacy_seconds, legacy_peak, legacy = measure(legacy_read, path, args.repeat)
+            stream_seconds, stream_peak, streamed = measure(streaming_read, path, args.repeat)
+            print(f"{image_mb:>8g} {os.path.getsize(path) / 2**20:>8.2f} {legacy_seconds * 1000:>15.2f} "
+                  f"{legacy_peak / 2**20:>8.2f} {stream_seconds * 1000:>13.2f} {stream_peak / 2**20:>8.2f} "
+                  f"{'yes' if legacy == streamed else 'NO':>5}")
@@ -0,0 +1,86 @@
+import os
+import re
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Extract_information_from_resumess import extract_info
+
+# Original per-field implementation, kept here only as the comparison baseline
+def legacy_extract_info(text):
+    name = re.search(r"([A-Z][a-z]+(?:\s[A-Z][a-z]+)+)", text)
+    address = re.search(r"[A-Za-z0-9\s,.-]+(?:,\s[A-Za-z\s]+)+", text)
+    phones = re.findall(r"(\+\d{1,4}\s?\d{7,14})", text)
+    email = re.search(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", text)
+    github = re.search(r"https?://(?:www\.)?github\.com/[a-zA-Z0-9_-]+", text)
+    linkedin = re.search(r"https?://(?:www\.)?linkedin\.com/in/[a-zA-Z0-9_-]+", text)
+    return name, address, phones, email, github, linkedin
+
+WORDS = ("python developer project team data system design delivered led built analysis "
+         "reporting cloud services customers improved performance migration api testing").split()
+
+# Function to build a resume of roughly `pages` pages (about 1800 characters each)
+def make_resume(pages, seed=0, with_address=True):
+    rng = random.Random(seed)
+    lines = ["Jane Doe"]
+    if with_address:
+        lines.append("House 12, Road 5, Dhaka, Bangladesh")
+    while sum(len(line) + 1 for line in lines) < pages * 1800:
+        lines.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 14))) + ".")
+    # Contact details at the end force both implementations to scan everything
+    lines += ["Email: jane.doe@example.com", "Phone: +880 1712345678",
+              "https://github.com/janedoe", "https://www.linkedin.com/in/jane-doe"]
+    return "\n".join(lines)
+
+def time_per_call(func, text, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(text)
+    return (time.perf_counter() - start) / repeat
+
+# Single lines the legacy patterns cannot stretch across, so both must agree field by field
+PARITY_LINES = (
+    "Dhanmondi Road, Dhaka, Bangladesh", "Baker Street, London", "Main Street 12, Springfield, IL",
+    "House 12, Road 5, Dhaka, Bangladesh", "123 Main St, Springfield", "Jane Doe, PhD", "Jane Doe",
+    "Email: jane.doe@example.com", "Phone: +880 1712345678", "https://github.com/janedoe",
+    "https://www.linkedin.com/in/jane-doe", "Python, Java, SQL",
+)
+
+# Function to report single-line inputs where the two implementations disagree
+def check_parity():
+    mismatches = 0
+    for line in PARITY_LINES:
+        name, address, phones, email, github, linkedin = legacy_extract_info(line)
+        expected = {
+            "name": name.group(1) if name else None,
+            "address": address.group(0).strip() if address else None,
+            "primary_phone": phones[0] if phones else None,
+            "email": email.group(0) if email else None,
+            "github": github.group(0) if github else None,
+            "linkedin": linkedin.group(0) if linkedin else None,
+        }
+        actual = extract_info(line)
+        for field, value in expected.items():
+            if actual[field] != value:
+                mismatches += 1
+                print(f"MISMATCH {line!r} {field}: legacy={value!r} single-pass={actual[field]!r}")
+    print(f"Parity: {len(PARITY_LINES)} lines, {mismatches} mismatches")
+    return mismatches
+
+def run(with_address, page_counts, repeat):
+    print(f"\nAddress line present: {with_address}")
+    print(f"{'pages':>5} {'chars':>8} {'legacy ms':>10} {'single-pass ms':>15} {'speedup':>8}")
+    for pages in page_counts:
+        text = make_resume(pages, with_address=with_address)
+        legacy = time_per_call(legacy_extract_info, text, repeat)
+        current = time_per_call(extract_info, text, repeat)
+        print(f"{pages:>5} {len(text):>8} {legacy * 1000:>10.3f} {current * 1000:>15.3f} {legacy / current:>7.1f}x")
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    if check_parity():
+        sys.exit(1)
+    run(True, (1, 2, 5, 10, 20), repeat)
+    # Without an address the legacy pattern backtracks quadratically, so keep this short
+    run(False, (1, 2, 5), max(1, repeat // 10))
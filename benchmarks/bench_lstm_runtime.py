@@ -0,0 +1,66 @@
+import os
+import sys
+import json
+import time
+import random
+import resource
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+NAMES = ("Rahman Hossain Smith Garcia Nakamura Muller Rossi Kowalski Ivanova Okafor "
+         "Nguyen Papadopoulos Fernandes Johansson Haddad Chowdhury Kim Tanaka").split()
+
+# Child process: load one runtime from a clean interpreter and time it
+def measure(backend, single_calls, batch_size):
+    start = time.perf_counter()
+    from LSTM_Inference import NameOriginPredictor, LiteNameOriginPredictor
+    predictor = LiteNameOriginPredictor() if backend == "lite" else NameOriginPredictor()
+    predictor.predict(["warmup"])
+    startup = time.perf_counter() - start
+
+    rng = random.Random(0)
+    latencies = []
+    for _ in range(single_calls):
+        name = rng.choice(NAMES)
+        call_start = time.perf_counter()
+        predictor.predict([name])
+        latencies.append(time.perf_counter() - call_start)
+    latencies.sort()
+
+    batch = [rng.choice(NAMES) for _ in range(batch_size)]
+    batch_start = time.perf_counter()
+    predictor.predict(batch)
+    batch_seconds = time.perf_counter() - batch_start
+
+    return {
+        "backend": backend,
+        "startup_s": startup,
+        "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+        "batch_names_per_s": batch_size / batch_seconds,
+    }
+
+def run(artifact_dir, single_calls, batch_size):
+    env = dict(os.environ, TF_CPP_MIN_LOG_LEVEL="3")
+    print(f"{'backend':>8} {'startup s':>10} {'peak RSS MB':>12} {'p50 ms':>8} {'p99 ms':>8} {'batch names/s':>14}")
+    for backend in ("keras", "lite"):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", backend, str(single_calls), str(batch_size)],
+            cwd=artifact_dir, env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        r = json.loads(output.strip().splitlines()[-1])
+        print(f"{r['backend']:>8} {r['startup_s']:>10.2f} {r['rss_mb']:>12.0f} {r['p50_ms']:>8.3f} "
+              f"{r['p99_ms']:>8.3f} {r['batch_names_per_s']:>14.0f}")
+
+# Command line: python benchmarks/bench_lstm_runtime.py [artifact_dir] [single_calls] [batch_size]
+# Run LSTM_Model.py and LSTM_Export.py export first so both sets of artifacts exist.
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        print(json.dumps(measure(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]))))
+    else:
+        run(sys.argv[1] if len(sys.argv) > 1 else ".",
+            int(sys.argv[2]) if len(sys.argv) > 2 else 500,
+            int(sys.argv[3]) if len(sys.argv) > 3 else 2048)
@@ -0,0 +1,242 @@
+import gc
+import os
+import re
+import sys
+import json
+import math
+import time
+import zlib
+import random
+import argparse
+import tempfile
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import LLMA_Prompt_Extract
+from LLMA_Prompt_Extract import extract_links, extract_summary, CSV_FIELDS, format_csv_row, format_text_record
+from Extract_information_from_resumess import extract_info
+import resume_loader
+from resume_loader import load_document
+from result_writers import CsvWriter, TextWriter, ResultSink
+from make_corpus import FORMATS, PHONE_FORMATS, generate_corpus
+
+# The baseline stores each stage relative to a fixed calibration workload timed in the same run,
+# so a faster or slower machine (a CI runner vs. a laptop) shifts both sides alike
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pipeline_baseline.json")
+TOLERANCE = 0.25  # A stage fails when it is this much slower, relative to calibration, than the baseline
+MIN_REGRESSION_MS = 0.02  # Ignore differences below timer noise for sub-millisecond stages
+REPEAT = 5
+MIN_MEASURE_SECONDS = 0.2
+
+
+class StubLlama:
+    """Stands in for llama_cpp.Llama so the summarize stage runs without model weights.
+
+    Tokens are whitespace-separated words; a completion echoes the last
+    max_tokens words of the prompt. Only the chunking and prompt plumbing
+    around the model is measured.
+    """
+
+    def __init__(self, n_ctx=LLMA_Prompt_Extract.N_CTX):
+        self._n_ctx = n_ctx
+        self.pieces = [b""]  # Token 0 is BOS
+        self.ids = {}
+
+    def n_ctx(self):
+        return self._n_ctx
+
+    def tokenize(self, data, add_bos=True):
+        tokens = [0] if add_bos else []
+        for piece in re.findall(rb"\s*\S+|\s+", data):
+            if piece not in self.ids:
+                self.ids[piece] = len(self.pieces)
+                self.pieces.append(piece)
+            tokens.append(self.ids[piece])
+        return tokens
+
+    def detokenize(self, tokens):
+        return b"".join(self.pieces[token] for token in tokens)
+
+    def __call__(self, prompt, max_tokens=16):
+        return {"choices": [{"text": " ".join(prompt.split()[-max_tokens:])}]}
+
+
+# Function to run one stage over every item; returns the best per-item seconds and the outputs.
+# Fast stages are looped until one measurement lasts MIN_MEASURE_SECONDS, as timeit's autorange does.
+def time_stage(func, items, repeat):
+    items = list(items)
+    start = time.perf_counter()
+    outputs = [func(item) for item in items]
+    number = max(1, math.ceil(MIN_MEASURE_SECONDS / max(time.perf_counter() - start, 1e-9)))
+
+    best = None
+    for _ in range(repeat):
+        # Like timeit, keep collector pauses from earlier stages out of the measurement
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(number):
+                for item in items:
+                    func(item)
+            elapsed = (time.perf_counter() - start) / (number * max(1, len(items)))
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    return best, outputs
+
+# Function to build the calibration workload: the same kinds of work as the stages (pure-Python
+# loops, regex, zlib and XML parsing) over fixed text, so it tracks interpreter and CPU speed
+def make_calibration(seed=0):
+    rng = random.Random(seed)
+    words = [f"w{rng.randint(0, 5000)}" for _ in range(4000)]
+    text = " ".join(words)
+    document = zlib.compress(("<doc>" + "".join(f"<p>{word}</p>" for word in words[:1000]) + "</doc>").encode())
+
+    def workload(_):
+        counts = {}
+        for word in re.findall(r"w\d+", text):
+            counts[word] = counts.get(word, 0) + 1
+        paragraphs = [p.text for p in ET.fromstring(zlib.decompress(document)).iter("p")]
+        return len(counts) + len(paragraphs)
+    return workload
+
+def calibrate(repeat=REPEAT):
+    seconds, _ = time_stage(make_calibration(), range(20), repeat)
+    return seconds
+
+# Function to time one stage between two calibration runs; returns (seconds, calibration, outputs),
+# keeping the faster calibration so a machine that speeds up or slows down mid-run is tracked per stage
+def calibrated(measure, repeat):
+    before = calibrate(repeat)
+    seconds, outputs = measure()
+    return seconds, min(before, calibrate(repeat)), outputs
+
+def write_results(results, output_dir):
+    writers = [CsvWriter(os.path.join(output_dir, "bench.csv"), CSV_FIELDS, format_csv_row),
+               TextWriter(os.path.join(output_dir, "bench.txt"), format_text_record)]
+    with ResultSink(writers, os.path.join(output_dir, ".bench.progress")) as sink:
+        for key, result in results:
+            sink.write(key, result)
+
+def time_writes(results, repeat):
+    best = None
+    with tempfile.TemporaryDirectory() as output_dir:
+        # Each round writes a fresh set of files
+        for round_index in range(repeat):
+            round_dir = os.path.join(output_dir, str(round_index))
+            os.makedirs(round_dir)
+            start = time.perf_counter()
+            write_results(results, round_dir)
+            elapsed = (time.perf_counter() - start) / max(1, len(results))
+            best = elapsed if best is None else min(best, elapsed)
+    return best, None
+
+# Function to time every pipeline stage; returns {stage: seconds per document} and
+# {stage: calibration seconds measured around that stage}
+def run_stages(paths, repeat=REPEAT):
+    # Parsing is what is being timed, so never serve it from the parse cache
+    resume_loader.PARSE_CACHE = False
+    timings, calibrations = {}, {}
+
+    def stage(name, func, items):
+        timings[name], calibrations[name], outputs = calibrated(lambda: time_stage(func, items, repeat), repeat)
+        return outputs
+
+    texts = []
+    for extension in sorted({os.path.splitext(path)[1] for path in paths}):
+        group = [path for path in paths if path.endswith(extension)]
+        texts += zip(group, stage(f"parse{extension}", lambda path: load_document(path).spaced_text, group))
+
+    stage("regex", lambda item: extract_info(item[1]), texts)
+    links = stage("links", lambda item: extract_links(item[1]), texts)
+
+    LLMA_Prompt_Extract.llm = StubLlama()
+    summaries = stage("summarize", lambda item: extract_summary(item[1]), texts)
+
+    results = [(path, {"File Name": os.path.basename(path), "Summary": summary, **link})
+               for (path, _), summary, link in zip(texts, summaries, links)]
+    timings["write"], calibrations["write"], _ = calibrated(lambda: time_writes(results, repeat), repeat)
+    return timings, calibrations
+
+# Function to express {stage: seconds} in units of the calibration measured around each stage
+def relative(timings, calibrations):
+    return {stage: seconds / calibrations[stage] for stage, seconds in timings.items()}
+
+# Function to list stages slower than the baseline by more than `tolerance`; both sides are in
+# calibration units, and `calibrations` converts the noise floor back to this machine's seconds
+def find_regressions(timings, baseline, calibrations, tolerance=TOLERANCE):
+    regressions = []
+    for stage, units in timings.items():
+        reference = baseline.get(stage)
+        if (reference and units > reference * (1 + tolerance)
+                and (units - reference) * calibrations[stage] * 1000 > MIN_REGRESSION_MS):
+            regressions.append((stage, reference, units))
+    return regressions
+
+# Timings are in calibration units; ms/doc and the baseline column are shown on this machine's scale
+def print_report(timings, baseline, calibrations):
+    print(f"{'stage':>12} {'ms/doc':>10} {'baseline':>10} {'change':>8} {'units':>7}")
+    for stage, units in timings.items():
+        reference, calibration = baseline.get(stage), calibrations[stage]
+        change = f"{(units / reference - 1) * 100:+7.1f}%" if reference else "       -"
+        base = f"{reference * calibration * 1000:>10.3f}" if reference else f"{'-':>10}"
+        print(f"{stage:>12} {units * calibration * 1000:>10.3f} {base} {change} {units:>7.3f}")
+
+# Command line: python benchmarks/bench_pipeline.py [--corpus DIR | --count N ...] [--save-baseline]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time each extraction stage against a stored baseline.")
+    parser.add_argument("--corpus", help="Existing resume folder; a synthetic corpus is generated when omitted")
+    parser.add_argument("--count", type=int, default=60)
+    parser.add_argument("--pages", type=float, default=2)
+    parser.add_argument("--link-density", type=float, default=2)
+    parser.add_argument("--phones", default=",".join(PHONE_FORMATS))
+    parser.add_argument("--formats", default=",".join(FORMATS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--save-baseline", action="store_true", help="Record this run as the new baseline")
+    args = parser.parse_args()
+
+    settings = {key: getattr(args, key) for key in ("corpus", "count", "pages", "link_density", "phones", "formats", "seed")}
+    with tempfile.TemporaryDirectory() as corpus_dir:
+        if args.corpus:
+            paths = sorted(os.path.join(args.corpus, name) for name in os.listdir(args.corpus)
+                           if name.lower().endswith((".pdf", ".docx", ".txt")))
+        else:
+            paths = generate_corpus(corpus_dir, args.count, args.pages, args.link_density,
+                                    tuple(args.phones.split(",")), tuple(args.formats.split(",")), args.seed)
+        print(f"Benchmarking {len(paths)} resumes, best of {args.repeat}")
+        seconds, calibrations = run_stages(paths, args.repeat)
+    timings = relative(seconds, calibrations)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"settings": settings, "relative_timings": timings}, f, indent=1)
+        print_report(timings, {}, calibrations)
+        print(f"Baseline saved to {args.baseline}")
+        sys.exit(0)
+
+    # Without a baseline there is nothing to gate on, which is a failure, not a pass
+    if not os.path.exists(args.baseline):
+        print_report(timings, {}, calibrations)
+        print(f"No baseline at {args.baseline}; rerun with --save-baseline to record one")
+        sys.exit(1)
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        stored = json.load(f)
+    if stored["settings"] != settings:
+        print("Baseline was recorded with different corpus settings; rerun with --save-baseline")
+        sys.exit(1)
+    if "relative_timings" not in stored:
+        print("Baseline holds absolute timings from one machine; rerun with --save-baseline")
+        sys.exit(1)
+    baseline = stored["relative_timings"]
+
+    print_report(timings, baseline, calibrations)
+    regressions = find_regressions(timings, baseline, calibrations, args.tolerance)
+    for stage, reference, units in regressions:
+        print(f"REGRESSION {stage}: {reference:.3f} -> {units:.3f} calibration units "
+              f"({(units / reference - 1) * 100:+.1f}%)")
+    sys.exit(1 if regressions else 0)
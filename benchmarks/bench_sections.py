@@ -0,0 +1,76 @@
+import os
+import re
+import sys
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from resume_sections import index_sections
+from make_corpus import make_resume
+from bench_pipeline import time_stage, REPEAT
+
+PAGES = (1, 5, 20, 50)
+COUNT = 20
+# Sections a full extraction pass reads, each by a separate extractor
+WANTED = ("Experience", "Summary", "Education", "Skills", "Projects", "Contact")
+
+
+# The blank-line heuristic extract_experience_and_summary used before the section index
+def legacy_experience_and_summary(text):
+    experience, summary = "", ""
+    for section in re.split(r'\n\s*\n', text):
+        if "experience" in section.lower():
+            experience = section.strip()
+        elif "summary" in section.lower():
+            summary = section.strip()
+    return experience, summary
+
+# The notebook's extract_experience scan, run once per wanted section as each extractor did
+def legacy_paragraph_scan(paragraphs, keyword):
+    found, recording = [], False
+    for para in paragraphs:
+        if keyword in para.lower():
+            recording = True
+        if recording:
+            found.append(para)
+            if para.strip() == "":
+                break
+    return "\n".join(found)
+
+def legacy_extract(text):
+    paragraphs = text.splitlines()
+    sections = {name: legacy_paragraph_scan(paragraphs, name.lower()) for name in WANTED}
+    return legacy_experience_and_summary(text), sections
+
+def indexed_extract(text):
+    sections = index_sections(text)
+    return {name: sections.get(name) for name in WANTED}
+
+# Function to render make_corpus sections the way write_txt lays them out
+def render(sections):
+    return "".join((f"\n{heading}\n" if heading else "") + "\n".join(lines) + "\n" for heading, lines in sections)
+
+# Command line: python benchmarks/bench_sections.py [--pages 1,5,20,50] [--count N]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the one-pass section index with the per-keyword scans.")
+    parser.add_argument("--pages", default=",".join(map(str, PAGES)))
+    parser.add_argument("--count", type=int, default=COUNT)
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'pages':>5} {'chars':>8} {'legacy ms':>10} {'indexed ms':>11} {'speedup':>8} {'experience kept':>16}")
+    for pages in map(int, args.pages.split(",")):
+        texts = [render(make_resume(rng, pages)) for _ in range(args.count)]
+        legacy, legacy_results = time_stage(legacy_extract, texts, args.repeat)
+        indexed, indexed_results = time_stage(indexed_extract, texts, args.repeat)
+
+        # Share of the real EXPERIENCE body each approach returns; the heuristic keeps only the last block
+        expected = sum(len(sections.get("Experience")) for sections in map(index_sections, texts))
+        kept_legacy = sum(len(experience) for (experience, _), _ in legacy_results)
+        kept_indexed = sum(len(result["Experience"]) for result in indexed_results)
+        chars = sum(map(len, texts)) // len(texts)
+        print(f"{pages:>5} {chars:>8} {legacy * 1000:>10.3f} {indexed * 1000:>11.3f} {legacy / indexed:>7.1f}x "
+              f"{kept_legacy / expected:>7.0%} / {kept_indexed / expected:.0%}")
@@ -0,0 +1,151 @@
+import os
+import random
+import argparse
+import docx
+
+# fpdf2 is only needed for .pdf output
+try:
+    from fpdf import FPDF
+except ImportError:
+    FPDF = None
+
+FORMATS = ("txt", "docx", "pdf")
+CHARS_PER_PAGE = 1800
+
+FIRST_NAMES = ("Jane John Ayesha Rahim Maria Carlos Wei Priya Ahmed Olga Kenji Fatima Lucas Nadia Omar "
+               "Sofia David Tanvir Emily Hassan").split()
+LAST_NAMES = ("Doe Smith Rahman Hossain Garcia Chen Sharma Khan Petrova Tanaka Ahmed Silva Islam Novak "
+              "Costa Brown Chowdhury Miller Ali Haque").split()
+CITIES = (("Dhaka", "Bangladesh"), ("Chittagong", "Bangladesh"), ("Austin", "USA"), ("Berlin", "Germany"),
+          ("Toronto", "Canada"), ("Bangalore", "India"))
+SECTIONS = ("PROFESSIONAL SUMMARY", "EXPERIENCE", "PROJECTS", "EDUCATION", "SKILLS", "CERTIFICATIONS")
+WORDS = ("python developer project team data system design delivered led built analysis reporting cloud "
+         "services customers improved performance migration api testing pipeline dashboard deployed "
+         "automated reduced latency scaled mentored stakeholders requirements database").split()
+
+# Phone number styles; the first two match the international pattern the extractors use
+PHONE_FORMATS = {
+    "intl": lambda rng: f"+880 17{rng.randint(10000000, 99999999)}",
+    "intl_compact": lambda rng: f"+8801{rng.randint(300000000, 999999999)}",
+    "local": lambda rng: f"01{rng.randint(3, 9)}{rng.randint(10, 99)}-{rng.randint(100000, 999999)}",
+    "us": lambda rng: f"({rng.randint(200, 999)}) {rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+    "dashed": lambda rng: f"{rng.randint(200, 999)}-{rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+}
+
+# Function to make one random profile link
+def make_link(rng, handle):
+    kind = rng.random()
+    if kind < 0.4:
+        return f"https://github.com/{handle}{rng.randint(1, 999)}"
+    if kind < 0.7:
+        return f"https://www.linkedin.com/in/{handle}-{rng.randint(1, 999)}"
+    return f"https://{handle}.dev/projects/{rng.randint(1, 99)}"
+
+def make_sentence(rng):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 18))).capitalize() + "."
+
+# Function to build one resume as (heading, lines) sections of roughly `pages` pages
+def make_resume(rng, pages=1, link_density=2, phone_formats=("intl",)):
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    handle = f"{first}{last}".lower()
+    city, country = rng.choice(CITIES)
+    contact = [
+        f"{first} {last}",
+        f"House {rng.randint(1, 99)}, Road {rng.randint(1, 30)}, {city}, {country}",
+        f"Email: {handle}@example.com",
+        f"Phone: {PHONE_FORMATS[rng.choice(phone_formats)](rng)}",
+        make_link(rng, handle),
+    ]
+    sections = [("", contact)]
+
+    # Links are spread through the body at `link_density` per page
+    budget = pages * CHARS_PER_PAGE - sum(len(line) for line in contact)
+    links = [make_link(rng, handle) for _ in range(max(0, round(pages * link_density) - 1))]
+    heading_index = 0
+    while budget > 0:
+        heading = SECTIONS[heading_index % len(SECTIONS)]
+        heading_index += 1
+        lines = []
+        for _ in range(rng.randint(3, 8)):
+            line = make_sentence(rng)
+            if links and rng.random() < 0.3:
+                line += " " + links.pop()
+            lines.append(line)
+            budget -= len(line)
+        sections.append((heading, lines))
+    if links:
+        sections.append(("LINKS", links))
+    return sections
+
+def write_txt(path, sections):
+    with open(path, "w", encoding="utf-8") as f:
+        for heading, lines in sections:
+            if heading:
+                f.write(f"\n{heading}\n")
+            f.write("\n".join(lines) + "\n")
+
+def write_docx(path, sections, rng):
+    document = docx.Document()
+    for heading, lines in sections:
+        if heading:
+            document.add_heading(heading.title(), level=2)
+        # Some resumes keep their skills in a table, which the loader must still read
+        if heading == "SKILLS" and rng.random() < 0.5:
+            table = document.add_table(rows=len(lines), cols=1)
+            for row, line in zip(table.rows, lines):
+                row.cells[0].text = line
+            continue
+        for line in lines:
+            document.add_paragraph(line)
+    document.save(path)
+
+def write_pdf(path, sections):
+    pdf = FPDF()
+    pdf.set_auto_page_break(True, margin=15)
+    pdf.add_page()
+    for heading, lines in sections:
+        if heading:
+            pdf.set_font("Helvetica", "B", 11)
+            pdf.multi_cell(0, 6, heading, new_x="LMARGIN", new_y="NEXT")
+        pdf.set_font("Helvetica", size=10)
+        for line in lines:
+            pdf.multi_cell(0, 5, line, new_x="LMARGIN", new_y="NEXT")
+    pdf.output(path)
+
+# Function to write `count` resumes, cycling through `formats`; returns the file paths
+def generate_corpus(out_dir, count=100, pages=1, link_density=2, phone_formats=("intl",),
+                    formats=FORMATS, seed=0):
+    if "pdf" in formats and FPDF is None:
+        raise ImportError("fpdf2 is required for .pdf output: pip install fpdf2")
+    os.makedirs(out_dir, exist_ok=True)
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        extension = formats[i % len(formats)]
+        path = os.path.join(out_dir, f"resume_{i:05d}.{extension}")
+        sections = make_resume(rng, pages, link_density, phone_formats)
+        if extension == "txt":
+            write_txt(path, sections)
+        elif extension == "docx":
+            write_docx(path, sections, rng)
+        else:
+            write_pdf(path, sections)
+        paths.append(path)
+    return paths
+
+# Command line: python benchmarks/make_corpus.py <out_dir> [--count N] [--pages P] [--link-density L]
+#               [--phones intl,us,...] [--formats txt,docx,pdf] [--seed S]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write synthetic resumes for benchmarking.")
+    parser.add_argument("out_dir")
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--pages", type=float, default=1)
+    parser.add_argument("--link-density", type=float, default=2, help="Profile links per page")
+    parser.add_argument("--phones", default="intl", help=f"Comma-separated: {','.join(PHONE_FORMATS)}")
+    parser.add_argument("--formats", default=",".join(FORMATS))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    paths = generate_corpus(args.out_dir, args.count, args.pages, args.link_density,
+                            tuple(args.phones.split(",")), tuple(args.formats.split(",")), args.seed)
+    print(f"Wrote {len(paths)} resumes to {args.out_dir}")
@@ -0,0 +1,328 @@
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import metrics
+from result_writers import SOURCE_PATH_FIELD
+
+DEFAULT_STORE_NAME = "candidates.sqlite"
+DEFAULT_LIMIT = 50
+LOOKUP_CHUNK = 500  # Candidate ids per IN (...) when attaching phones and links
+PHONE_MATCH_DIGITS = 10  # Phones match on their last digits, so "+880 1712-345678" finds "01712345678"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidates (
+    id INTEGER PRIMARY KEY,
+    file_key TEXT NOT NULL UNIQUE,
+    file_name TEXT,
+    name TEXT,
+    email TEXT,
+    address TEXT,
+    summary TEXT,
+    experience TEXT,
+    skills TEXT,
+    record TEXT NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS candidates_email ON candidates (email);
+CREATE INDEX IF NOT EXISTS candidates_name ON candidates (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS candidates_file_name ON candidates (file_name);
+
+CREATE TABLE IF NOT EXISTS phones (
+    candidate_id INTEGER NOT NULL,
+    digits TEXT NOT NULL,
+    PRIMARY KEY (candidate_id, digits)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS phones_digits ON phones (digits);
+
+CREATE TABLE IF NOT EXISTS links (
+    candidate_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status TEXT,
+    PRIMARY KEY (candidate_id, kind, url)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS links_kind ON links (kind, candidate_id);
+CREATE INDEX IF NOT EXISTS links_url ON links (url);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS candidates_fts USING fts5(
+    summary, experience, skills, content='candidates', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS candidates_ai AFTER INSERT ON candidates BEGIN
+    INSERT INTO candidates_fts (rowid, summary, experience, skills)
+    VALUES (new.id, new.summary, new.experience, new.skills);
+END;
+CREATE TRIGGER IF NOT EXISTS candidates_ad AFTER DELETE ON candidates BEGIN
+    INSERT INTO candidates_fts (candidates_fts, rowid, summary, experience, skills)
+    VALUES ('delete', old.id, old.summary, old.experience, old.skills);
+END;
+CREATE TRIGGER IF NOT EXISTS candidates_au AFTER UPDATE OF summary, experience, skills ON candidates BEGIN
+    INSERT INTO candidates_fts (candidates_fts, rowid, summary, experience, skills)
+    VALUES ('delete', old.id, old.summary, old.experience, old.skills);
+    INSERT INTO candidates_fts (rowid, summary, experience, skills)
+    VALUES (new.id, new.summary, new.experience, new.skills);
+END;
+"""
+
+UPSERT_CANDIDATE = """
+INSERT INTO candidates (file_key, file_name, name, email, address, summary, experience, skills, record, updated)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (file_key) DO UPDATE SET
+    file_name = excluded.file_name, name = excluded.name, email = excluded.email, address = excluded.address,
+    summary = excluded.summary, experience = excluded.experience, skills = excluded.skills,
+    record = excluded.record, updated = excluded.updated
+"""
+CANDIDATE_ID = "(SELECT id FROM candidates WHERE file_key = ?)"
+
+
+def phone_key(phone):
+    digits = re.sub(r"\D", "", phone or "")
+    return digits[-PHONE_MATCH_DIGITS:] if digits else None
+
+def _text(value):
+    if not value or value == "Not Available":
+        return None
+    return value
+
+def _links(value):
+    # {url: status}, with {"Not Available": ""} when nothing was found, or a bare URL string
+    if isinstance(value, dict):
+        return [(url, status or None) for url, status in value.items() if url and url != "Not Available"]
+    return [(value, None)] if value else []
+
+# Function to flatten any pipeline's result record into the store's columns
+def candidate_row(record):
+    """Returns (columns, phones, links) for one result from any of the extraction scripts.
+
+    Structured results carry their fields under "Fields"; regex results use
+    top-level "Name"/"Email"/"Phones"/"Address"; links are {url: status} dicts.
+    """
+    fields = record.get("Fields") or {}
+    experience = _text(record.get("Experience"))
+    if fields.get("experience") and not experience:
+        experience = "; ".join(" ".join(filter(None, (entry.get("title"), entry.get("company"))))
+                               for entry in fields["experience"])
+    skills = fields.get("skills") or record.get("Skills") or []
+    columns = {
+        "name": _text(fields.get("name") or record.get("Name")),
+        "email": (_text(fields.get("email") or record.get("Email")) or "").lower() or None,
+        "address": _text(fields.get("address") or record.get("Address")),
+        "summary": _text(record.get("Summary")),
+        "experience": experience,
+        "skills": ", ".join(skills) if isinstance(skills, list) else _text(skills),
+    }
+    phones = {phone_key(phone) for phone in (fields.get("phones") or record.get("Phones") or [])} - {None}
+    links = [("github", url, status) for url, status in _links(record.get("GitHub"))]
+    links += [("linkedin", url, status) for url, status in _links(record.get("LinkedIn"))]
+    links += [("other", url, None) for url in fields.get("links") or []
+              if url not in {link for _, link, _ in links}]
+    return columns, phones, links
+
+
+class CandidateStore:
+    """Embedded SQLite store of extracted candidates.
+
+    Summaries, experience and skills are full-text indexed (FTS5); email,
+    phone and link lookups go through B-tree indexes. Records are upserted by
+    file key, so re-running a folder updates rows in place.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_NAME):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def upsert_many(self, items):
+        """Upserts (file_key, record) pairs in one transaction."""
+        candidates, phones, links, keys = [], [], [], []
+        now = time.time()
+        for file_key, record in items:
+            columns, record_phones, record_links = candidate_row(record)
+            keys.append((file_key,))
+            candidates.append((file_key, record.get("File Name"), columns["name"], columns["email"], columns["address"],
+                               columns["summary"], columns["experience"], columns["skills"],
+                               json.dumps(record, ensure_ascii=False), now))
+            phones += [(file_key, digits) for digits in record_phones]
+            links += [(file_key, kind, url, status) for kind, url, status in record_links]
+
+        with metrics.stage("store_upsert"), self.conn:
+            self.conn.executemany(UPSERT_CANDIDATE, candidates)
+            self.conn.executemany(f"DELETE FROM phones WHERE candidate_id = {CANDIDATE_ID}", keys)
+            self.conn.executemany(f"DELETE FROM links WHERE candidate_id = {CANDIDATE_ID}", keys)
+            self.conn.executemany(f"INSERT OR IGNORE INTO phones (candidate_id, digits) VALUES ({CANDIDATE_ID}, ?)", phones)
+            self.conn.executemany(f"INSERT OR IGNORE INTO links (candidate_id, kind, url, status)"
+                                  f" VALUES ({CANDIDATE_ID}, ?, ?, ?)", links)
+        return len(candidates)
+
+    def search(self, text=None, github=False, linkedin=False, email=None, phone=None, link=None, name=None,
+               limit=DEFAULT_LIMIT, ranked=False):
+        """Returns matching candidates in insertion order, or best full-text match first with `ranked`.
+
+        `text` is an FTS5 query over summary, experience and skills ("python AND django",
+        "data*"); github/linkedin keep only candidates with such a link; the other
+        filters are exact (email case-insensitive, phone on its last digits). Ranking
+        scores every match before the limit applies, so it costs more on broad queries.
+        """
+        where, params = [], []
+        source = "candidates c"
+        order = "c.id"
+        if text:
+            source = "candidates_fts JOIN candidates c ON c.id = candidates_fts.rowid"
+            where.append("candidates_fts MATCH ?")
+            params.append(text)
+            # FTS5 yields matches in rowid order itself, so only ranking needs a sort
+            order = "candidates_fts.rank" if ranked else "candidates_fts.rowid"
+        for kind, wanted in (("github", github), ("linkedin", linkedin)):
+            if wanted:
+                where.append("EXISTS (SELECT 1 FROM links l WHERE l.candidate_id = c.id AND l.kind = ?)")
+                params.append(kind)
+        if email:
+            where.append("c.email = ?")
+            params.append(email.lower())
+        if phone:
+            where.append("c.id IN (SELECT candidate_id FROM phones WHERE digits = ?)")
+            params.append(phone_key(phone))
+        if link:
+            where.append("c.id IN (SELECT candidate_id FROM links WHERE url = ?)")
+            params.append(link)
+        if name:
+            where.append("c.name = ? COLLATE NOCASE")
+            params.append(name)
+
+        query = (f"SELECT c.id, c.file_key, c.file_name, c.name, c.email FROM {source}"
+                 + (" WHERE " + " AND ".join(where) if where else "") + f" ORDER BY {order} LIMIT ?")
+        rows = self.conn.execute(query, params + [limit]).fetchall()
+        return self._candidates(rows)
+
+    # Attach phones and links with one query per chunk of ids rather than two per candidate
+    def _candidates(self, rows):
+        candidates = {}
+        for candidate_id, file_key, file_name, name, email in rows:
+            candidates[candidate_id] = {"file": file_key, "file_name": file_name, "name": name, "email": email,
+                                        "phones": [], "links": {}}
+        ids = list(candidates)
+        for start in range(0, len(ids), LOOKUP_CHUNK):
+            chunk = ids[start:start + LOOKUP_CHUNK]
+            marks = ",".join("?" * len(chunk))
+            for candidate_id, digits in self.conn.execute(
+                    f"SELECT candidate_id, digits FROM phones WHERE candidate_id IN ({marks})", chunk):
+                candidates[candidate_id]["phones"].append(digits)
+            for candidate_id, kind, url in self.conn.execute(
+                    f"SELECT candidate_id, kind, url FROM links WHERE candidate_id IN ({marks})", chunk):
+                candidates[candidate_id]["links"][url] = kind
+        return list(candidates.values())
+
+    def get(self, file_key):
+        """The full stored result record for one file, or None."""
+        row = self.conn.execute("SELECT record FROM candidates WHERE file_key = ?", (file_key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def stats(self):
+        candidates = self.conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+        kinds = dict(self.conn.execute("SELECT kind, COUNT(DISTINCT candidate_id) FROM links GROUP BY kind").fetchall())
+        return {"candidates": candidates, "with_links": kinds, "bytes": os.path.getsize(self.path)}
+
+    def close(self):
+        self.conn.close()
+
+
+class CandidateStoreWriter:
+    """ResultSink writer: each commit upserts the pending records into the store in one transaction.
+
+    Upserts are idempotent, so a resumed run simply rewrites any rows past the
+    last checkpoint instead of truncating.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.store = None
+        self.rows = []
+        self.committed = 0
+
+    def open(self, offset=None):
+        self.store = CandidateStore(self.path)
+
+    def write(self, record, key=None):
+        self.rows.append((key or record.get("File Name"), record))
+
+    def commit(self):
+        if self.rows:
+            self.committed += self.store.upsert_many(self.rows)
+            self.rows = []
+        return self.committed
+
+    def close(self):
+        self.store.close()
+
+
+# Function to pick the file key for an imported record: the path the sink wrote it under, or for
+# older files without one, the only stored row with that file name, so live rows are updated in place
+def import_key(store, jsonl_path, record):
+    if record.get(SOURCE_PATH_FIELD):
+        return record[SOURCE_PATH_FIELD]
+    rows = store.conn.execute("SELECT file_key FROM candidates WHERE file_name = ? LIMIT 2",
+                              (record["File Name"],)).fetchall()
+    if len(rows) == 1:
+        return rows[0][0]
+    return os.path.join(os.path.dirname(os.path.abspath(jsonl_path)), record["File Name"])
+
+# Function to load existing JSON Lines results (e.g. extracted_data.jsonl) into a store
+def import_jsonl(store, paths, batch_size=1000):
+    total = 0
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as file:
+            batch = []
+            for line in file:
+                if line.strip():
+                    record = json.loads(line)
+                    batch.append((import_key(store, path, record), record))
+                    if len(batch) == batch_size:
+                        total += store.upsert_many(batch)
+                        batch = []
+            total += store.upsert_many(batch)
+    return total
+
+# Command line: python candidate_store.py <store.sqlite> search|get|stats|import ...
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the candidate store written by the extraction scripts.")
+    parser.add_argument("store")
+    commands = parser.add_subparsers(dest="command", required=True)
+    search = commands.add_parser("search", help="find candidates")
+    search.add_argument("text", nargs="?", help="FTS5 query over summary, experience and skills")
+    search.add_argument("--github", action="store_true", help="only candidates with a GitHub link")
+    search.add_argument("--linkedin", action="store_true", help="only candidates with a LinkedIn link")
+    search.add_argument("--email")
+    search.add_argument("--phone")
+    search.add_argument("--link")
+    search.add_argument("--name")
+    search.add_argument("--limit", type=int, default=DEFAULT_LIMIT, help="-1 for no limit")
+    search.add_argument("--ranked", action="store_true", help="best full-text match first")
+    get = commands.add_parser("get", help="print one file's stored record")
+    get.add_argument("file")
+    commands.add_parser("stats")
+    load = commands.add_parser("import", help="load JSON Lines results")
+    load.add_argument("paths", nargs="+")
+    args = parser.parse_args()
+
+    store = CandidateStore(args.store)
+    if args.command == "search":
+        start = time.perf_counter()
+        results = store.search(args.text, args.github, args.linkedin, args.email, args.phone, args.link, args.name,
+                               args.limit, args.ranked)
+        elapsed = time.perf_counter() - start
+        for candidate in results:
+            print(json.dumps(candidate, ensure_ascii=False))
+        print(f"{len(results)} candidate(s) in {elapsed * 1000:.1f} ms", file=sys.stderr)
+    elif args.command == "get":
+        print(json.dumps(store.get(os.path.abspath(args.file)), indent=4, ensure_ascii=False))
+    elif args.command == "stats":
+        print(json.dumps(store.stats(), indent=4))
+    else:
+        print(f"Imported {import_jsonl(store, args.paths)} record(s) into '{args.store}'.")
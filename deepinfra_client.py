@@ -0,0 +1,161 @@
+import os
+import time
+import random
+import asyncio
+import aiohttp
+import metrics
+
+# DeepInfra OpenAI-compatible endpoint (point DEEPINFRA_BASE_URL at a local stub server for tests)
+OPENAI_BASE_URL = os.environ.get("DEEPINFRA_BASE_URL", "https://api.deepinfra.com/v1/openai")
+
+# Client defaults
+MAX_IN_FLIGHT = 8
+REQUESTS_PER_SECOND = 4  # Client-side request rate; None disables it and leaves only the 429 backoff
+MAX_RETRIES = 5
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+REQUEST_TIMEOUT = 120
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Async token bucket; a 429 pauses every caller until the server's retry window passes."""
+
+    def __init__(self, rate=None, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or (rate if rate else 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        while True:
+            # Only the bookkeeping is locked; callers sleep without holding it
+            async with self.lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif not self.rate:
+                    return
+                else:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+# Function to compute a jittered exponential backoff delay ("full jitter")
+def backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_MAX):
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+def _retry_after(response):
+    try:
+        return float(response.headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+
+
+class DeepInfraClient:
+    """Async chat-completions client with a pooled session, an in-flight limit and retries."""
+
+    def __init__(self, api_key, model, max_tokens=512, base_url=OPENAI_BASE_URL,
+                 max_in_flight=MAX_IN_FLIGHT, requests_per_second=REQUESTS_PER_SECOND,
+                 max_retries=MAX_RETRIES, timeout=REQUEST_TIMEOUT):
+        self.api_key = api_key
+        self.model = model
+        self.max_tokens = max_tokens
+        self.url = f"{base_url.rstrip('/')}/chat/completions"
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.bucket = TokenBucket(requests_per_second)
+        self.semaphore = asyncio.Semaphore(max_in_flight)
+        self.session = None
+        self.prompt_tokens = 0      # Token spend across every successful call, for run reports
+        self.completion_tokens = 0
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.max_in_flight, keepalive_timeout=60)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=self.timeout,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+
+    async def complete(self, content, response_format=None, max_tokens=None):
+        """Returns the model's reply to a single user message, or None if every attempt failed.
+
+        `response_format` is passed through as-is, e.g. {"type": "json_object"} for JSON mode.
+        """
+        with metrics.stage("deepinfra"):
+            reply = await self._complete(content, response_format, max_tokens)
+        if reply is None:
+            metrics.count("errors", stage="deepinfra")
+        return reply
+
+    async def _complete(self, content, response_format=None, max_tokens=None):
+        payload = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": content}],
+            "max_tokens": max_tokens or self.max_tokens,
+        }
+        if response_format:
+            payload["response_format"] = response_format
+        async with self.semaphore:
+            for attempt in range(self.max_retries + 1):
+                await self.bucket.acquire()
+                try:
+                    async with self.session.post(self.url, json=payload) as response:
+                        metrics.count("http_responses", status=response.status)
+                        if response.status == 200:
+                            data = await response.json()
+                            try:
+                                reply = data["choices"][0]["message"]["content"].strip()
+                            except (KeyError, IndexError, TypeError, AttributeError):
+                                # A 200 without a usable reply counts as a failed call
+                                print(f"Request failed: malformed response {str(data)[:200]!r}")
+                                return None
+                            usage = data.get("usage") or {}
+                            self.prompt_tokens += usage.get("prompt_tokens", 0)
+                            self.completion_tokens += usage.get("completion_tokens", 0)
+                            metrics.count("llm_tokens", usage.get("prompt_tokens", 0), direction="in")
+                            metrics.count("llm_tokens", usage.get("completion_tokens", 0), direction="out")
+                            return reply
+                        if response.status not in RETRY_STATUSES:
+                            print(f"Request failed: HTTP {response.status}")
+                            return None
+                        delay = backoff_delay(attempt)
+                        if response.status == 429:
+                            # Hold back every in-flight caller, not just this one
+                            delay = max(delay, _retry_after(response) or 0)
+                            self.bucket.pause(delay)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    delay = backoff_delay(attempt)
+                    print(f"Request failed: {e!r}")
+                except ValueError as e:
+                    # The body was not JSON
+                    print(f"Request failed: malformed response {e!r}")
+                    return None
+
+                if attempt < self.max_retries:
+                    metrics.count("retries", stage="deepinfra")
+                    await asyncio.sleep(delay)
+
+        print(f"Request failed after {self.max_retries + 1} attempts")
+        return None
+
+    async def complete_many(self, contents):
+        """Sends many messages concurrently, returning replies in input order."""
+        return await asyncio.gather(*(self.complete(content) for content in contents))
@@ -0,0 +1,136 @@
+import sys
+import zipfile
+import posixpath
+import xml.etree.ElementTree as ET
+
+# WordprocessingML / package namespaces
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+R = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PACKAGE_RELS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+DOCUMENT_PART = "word/document.xml"
+
+PARAGRAPH, TABLE, ROW, CELL = W + "p", W + "tbl", W + "tr", W + "tc"
+RUN, HYPERLINK = W + "r", W + "hyperlink"
+PART_ROOTS = (W + "body", W + "hdr", W + "ftr")
+
+# Run children that carry text, as python-docx's Paragraph.text reads them
+TEXT_TAGS = {W + "t", W + "tab", W + "ptab", W + "br", W + "cr", W + "noBreakHyphen"}
+
+
+def _element_text(element):
+    tag = element.tag
+    if tag == W + "t":
+        return element.text or ""
+    if tag in (W + "tab", W + "ptab"):
+        return "\t"
+    if tag == W + "br":
+        # Page and column breaks have no text equivalent
+        return "\n" if element.get(W + "type", "textWrapping") == "textWrapping" else ""
+    if tag == W + "cr":
+        return "\n"
+    return "-"  # noBreakHyphen
+
+# A paragraph is read when it sits in the part's flow: directly in the body/header/footer,
+# or, with `tables`, in a table cell there (tables nest). Text boxes and content controls are skipped.
+def _in_flow(stack, tables=True):
+    tags = [element.tag for element in stack]
+    start = tags.index(W + "body") + 1 if W + "body" in tags else 1
+    if not tags or tags[start - 1] not in PART_ROOTS:
+        return False
+    rest = tags[start:]
+    if not tables:
+        return not rest
+    return len(rest) % 3 == 0 and all(tuple(rest[i:i + 3]) == (TABLE, ROW, CELL) for i in range(0, len(rest), 3))
+
+# Function to stream one part's paragraphs in document order; the tree is pruned as it goes,
+# so memory stays flat however long the part is. Section header/footer references are
+# appended to `sections` as (header rId, footer rId) when a list is passed; tables=False
+# keeps only top-level paragraphs, like python-docx's Document.paragraphs.
+def iter_part_paragraphs(stream, sections=None, tables=True):
+    stack = []
+    paragraph_depth = None
+    pieces = []
+    references = {}
+    for event, element in ET.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            if element.tag == PARAGRAPH and paragraph_depth is None and _in_flow(stack, tables):
+                paragraph_depth = len(stack)
+                pieces = []
+            stack.append(element)
+            continue
+
+        stack.pop()
+        tag = element.tag
+        if paragraph_depth is not None:
+            if tag in TEXT_TAGS and stack[-1].tag == RUN and (
+                    len(stack) == paragraph_depth + 2 or
+                    (len(stack) == paragraph_depth + 3 and stack[-2].tag == HYPERLINK)):
+                pieces.append(_element_text(element))
+            elif tag == PARAGRAPH and len(stack) == paragraph_depth:
+                paragraph_depth = None
+                yield "".join(pieces)
+
+        if sections is not None:
+            if tag in (W + "headerReference", W + "footerReference") and element.get(W + "type") == "default":
+                references[tag] = element.get(R + "id")
+            elif tag == W + "sectPr":
+                sections.append((references.get(W + "headerReference"), references.get(W + "footerReference")))
+                references = {}
+
+        # Drop finished top-level blocks so the parsed tree never grows
+        if stack and stack[-1].tag in PART_ROOTS and paragraph_depth is None:
+            stack[-1].remove(element)
+
+
+# Function to read a part's relationships as {rId: (type, target part name)}
+def read_relationships(archive, part_name=DOCUMENT_PART):
+    folder, name = posixpath.split(part_name)
+    rels_name = posixpath.join(folder, "_rels", name + ".rels")
+    try:
+        data = archive.read(rels_name)
+    except KeyError:
+        return {}
+    relationships = {}
+    for rel in ET.fromstring(data).iter(PACKAGE_RELS + "Relationship"):
+        target = rel.get("Target", "")
+        if rel.get("TargetMode") != "External":
+            target = posixpath.normpath(posixpath.join(folder, target))
+        relationships[rel.get("Id")] = (rel.get("Type", ""), target)
+    return relationships
+
+def _part_paragraphs(archive, part_name):
+    with archive.open(part_name) as stream:
+        return list(iter_part_paragraphs(stream))
+
+
+# Function to lazily yield a .docx's body paragraphs (tables included unless tables=False, in document order)
+def iter_paragraphs(path, tables=True):
+    with zipfile.ZipFile(path) as archive, archive.open(DOCUMENT_PART) as stream:
+        yield from iter_part_paragraphs(stream, tables=tables)
+
+# Function to read every paragraph: each section's own header first, then the body, then the footers
+def read_paragraphs(path):
+    with zipfile.ZipFile(path) as archive:
+        sections = []
+        with archive.open(DOCUMENT_PART) as stream:
+            body = list(iter_part_paragraphs(stream, sections))
+        relationships = read_relationships(archive)
+        headers, footers = [], []
+        for header_id, footer_id in sections:
+            if header_id in relationships:
+                headers.extend(_part_paragraphs(archive, relationships[header_id][1]))
+            if footer_id in relationships:
+                footers.extend(_part_paragraphs(archive, relationships[footer_id][1]))
+        return headers + body + footers
+
+# Function to count the document's image relationships; the media itself is never decompressed
+def count_images(path):
+    with zipfile.ZipFile(path) as archive:
+        return sum(1 for rel_type, _ in read_relationships(archive).values() if "image" in rel_type)
+
+# Command line: python docx_stream.py <file.docx>...  (prints the paragraphs and image count)
+if __name__ == "__main__":
+    for path in sys.argv[1:]:
+        for paragraph in read_paragraphs(path):
+            print(paragraph)
+        print(f"-- {path}: {count_images(path)} image(s)")
@@ -0,0 +1,99 @@
+import os
+import sys
+import queue
+import threading
+from resume_loader import SUPPORTED_EXTENSIONS, detect_extension
+
+# Paths found ahead of the consumer; the bound keeps memory flat on huge archives
+DISCOVERY_QUEUE_SIZE = 1024
+
+
+# Function to walk a folder lazily with os.scandir, yielding a DirEntry per resume file.
+# Subfolders go on an explicit stack, so very deep trees never hit the recursion limit.
+def iter_entries(root, recursive=True, sniff=True, exclude=()):
+    exclude = {os.path.abspath(path) for path in exclude}
+    stack = [root]
+    while stack:
+        folder = stack.pop()
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive:
+                                stack.append(entry.path)
+                            continue
+                        if not entry.is_file():
+                            continue
+                    except OSError:
+                        continue
+                    # Known extensions are routed by name; anything else only if its first bytes match
+                    if os.path.splitext(entry.name)[1].lower() not in SUPPORTED_EXTENSIONS:
+                        if not sniff or detect_extension(entry.path) is None:
+                            continue
+                    if exclude and os.path.abspath(entry.path) in exclude:
+                        continue
+                    yield entry
+        except OSError as e:
+            print(f"Skipping folder {folder}: {e}")
+
+# Function to yield resume paths under a folder (or the path itself when it is a resume file)
+def iter_resumes(path, recursive=True, sniff=True, exclude=()):
+    if os.path.isfile(path):
+        if detect_extension(path, sniff):
+            yield path
+        return
+    for entry in iter_entries(path, recursive, sniff, exclude):
+        yield entry.path
+
+# Function to run discovery in a background thread feeding a bounded work queue, so
+# processing starts on the first file while the rest of the tree is still being walked
+def stream_resumes(path, recursive=True, sniff=True, exclude=(), maxsize=DISCOVERY_QUEUE_SIZE):
+    work = queue.Queue(maxsize)
+    stopped = threading.Event()
+    done = object()
+
+    # Put unless the consumer has gone away; returns False once it has
+    def offer(item):
+        while not stopped.is_set():
+            try:
+                work.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for file_path in iter_resumes(path, recursive, sniff, exclude):
+                if not offer(file_path):
+                    return
+        finally:
+            offer(done)
+
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            file_path = work.get()
+            if file_path is done:
+                return
+            yield file_path
+    finally:
+        # The consumer stopped early: let the producer exit instead of blocking on a full queue
+        stopped.set()
+        while True:
+            try:
+                work.get_nowait()
+            except queue.Empty:
+                break
+
+# Command line: python file_discovery.py <folder>  (prints every resume found, then a count)
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python file_discovery.py <folder>")
+        sys.exit(1)
+    total = 0
+    for file_path in stream_resumes(sys.argv[1]):
+        print(file_path)
+        total += 1
+    print(f"{total} resume file(s) found", file=sys.stderr)
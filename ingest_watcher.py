@@ -0,0 +1,307 @@
+import os
+import sys
+import time
+import queue
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import metrics
+import LLMA_Prompt_Extract as pipeline
+from resume_loader import is_supported
+from file_discovery import iter_entries
+from result_cache import hash_file
+from result_writers import CsvWriter, ResultSink
+from candidate_store import CandidateStoreWriter, DEFAULT_STORE_NAME
+
+# watchdog delivers native change events (inotify on Linux); without it the folder is polled
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = FileSystemEventHandler = None
+
+# Ingest settings
+POLL_INTERVAL = 2.0     # Seconds between scans when polling
+SETTLE_SECONDS = 1.0    # A file must stop changing this long before it is processed (copies in progress)
+COMMIT_INTERVAL = 1.0   # Results reach the output files at most this many seconds after they finish
+LOOP_INTERVAL = 0.2
+RETRY_SECONDS = 30.0       # First retry of a failed file; doubles on every further failure
+RETRY_MAX_SECONDS = 3600.0
+MANIFEST_NAME = ".ingest_manifest.sqlite"
+# Manifest statuses that mean a file is finished; "failed" files are requeued with a backoff
+# (and once more on restart, by the watcher's initial scan)
+SETTLED_STATUSES = ("done", "empty")
+
+
+class Manifest:
+    """SQLite record of every ingested file, keyed by path, with the mtime, size and hash last processed."""
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY,"
+            " mtime_ns INTEGER NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " content_hash TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " error TEXT,"
+            " updated REAL NOT NULL)"
+        )
+        self.conn.commit()
+
+    def get(self, path):
+        return self.conn.execute(
+            "SELECT mtime_ns, size, content_hash, status FROM files WHERE path = ?", (path,)).fetchone()
+
+    def record(self, path, mtime_ns, size, content_hash, status, error=None):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO files (path, mtime_ns, size, content_hash, status, error, updated)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (path, mtime_ns, size, content_hash, status, error, time.time()),
+            )
+
+    def counts(self):
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM files GROUP BY status").fetchall())
+
+    def close(self):
+        self.conn.close()
+
+
+# Function to list every supported file under a folder; routed by extension only, since it is
+# repeated on every poll and the event watcher sees names only
+def scan_folder(folder):
+    return iter_entries(folder, sniff=False)
+
+
+class PollingWatcher(threading.Thread):
+    """Fallback watcher: rescans the folder's directory entries and reports files whose mtime or size changed."""
+
+    def __init__(self, folder, events, interval=POLL_INTERVAL):
+        super().__init__(daemon=True)
+        self.folder = folder
+        self.events = events
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.seen = {}
+
+    def run(self):
+        while not self.stopped.is_set():
+            current = {}
+            for entry in scan_folder(self.folder):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    # Deleted or renamed since the scan; the new name shows up on the next pass
+                    continue
+                current[entry.path] = (stat.st_mtime_ns, stat.st_size)
+                if self.seen.get(entry.path) != current[entry.path]:
+                    self.events.put(entry.path)
+            self.seen = current
+            self.stopped.wait(self.interval)
+
+    def stop(self):
+        self.stopped.set()
+
+
+if FileSystemEventHandler is not None:
+    class _EventHandler(FileSystemEventHandler):
+        def __init__(self, events):
+            self.events = events
+
+        def on_any_event(self, event):
+            if event.is_directory or event.event_type not in ("created", "modified", "moved", "closed"):
+                return
+            path = getattr(event, "dest_path", "") or event.src_path
+            if is_supported(path):
+                self.events.put(path)
+
+
+class EventWatcher:
+    """Native watcher: one initial scan to catch up, then only the files the OS reports as changed."""
+
+    def __init__(self, folder, events):
+        self.folder = folder
+        self.events = events
+        self.observer = Observer()
+        self.observer.schedule(_EventHandler(events), folder, recursive=True)
+
+    def start(self):
+        self.observer.start()
+        for entry in scan_folder(self.folder):
+            self.events.put(entry.path)
+
+    def stop(self):
+        self.observer.stop()
+        self.observer.join()
+
+
+class IngestDaemon:
+    """Watches a drop folder and pushes new or changed resumes through LLMA_Prompt_Extract.
+
+    Each file is processed once per distinct content: the manifest skips files
+    whose mtime and size are unchanged, and files that were touched but still
+    hash the same, unless their last attempt failed. Failed files are queued
+    again after RETRY_SECONDS, doubling per failure. At most `max_in_flight`
+    files are queued on the worker pool; results are appended to the outputs
+    as they finish and reach the manifest only once the sink has committed them.
+    """
+
+    def __init__(self, folder, output_dir=None, workers=None, threads_per_worker=None,
+                 max_in_flight=None, use_events=True, poll_interval=POLL_INTERVAL):
+        self.folder = os.path.abspath(folder)
+        self.output_dir = output_dir or os.path.dirname(self.folder)
+        self.workers, self.threads_per_worker = pipeline.plan_workers(workers, threads_per_worker)
+        self.max_in_flight = max_in_flight or self.workers * 2
+        self.use_events = use_events and Observer is not None
+        self.poll_interval = poll_interval
+        self.events = queue.Queue()
+        self.waiting = {}    # path -> time it becomes ready (pushed back on every new event)
+        self.in_flight = {}  # future -> (path, mtime_ns, size, content_hash)
+        self.uncommitted = []  # (path, mtime_ns, size, content_hash) written to the sink, not yet committed
+        self.failures = {}   # path -> consecutive failed attempts, for the retry backoff
+        self.stopped = threading.Event()
+
+    def _drain_events(self):
+        settle_until = time.monotonic() + SETTLE_SECONDS
+        while True:
+            try:
+                path = self.events.get_nowait()
+            except queue.Empty:
+                return
+            self.waiting[os.path.abspath(path)] = settle_until
+
+    # Function to decide whether a settled file needs processing; returns its fingerprint or None.
+    # Files whose last attempt failed are always processed again
+    def _fingerprint(self, manifest, path):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        record = manifest.get(path)
+        if record and record[3] not in SETTLED_STATUSES:
+            record = None
+        if record and record[0] == stat.st_mtime_ns and record[1] == stat.st_size:
+            metrics.count("ingest_skipped", reason="unchanged")
+            return None
+        content_hash = hash_file(path)
+        if record and record[2] == content_hash:
+            # Touched or copied over with the same bytes: remember the new mtime only
+            manifest.record(path, stat.st_mtime_ns, stat.st_size, content_hash, record[3])
+            metrics.count("ingest_skipped", reason="same_content")
+            return None
+        return stat.st_mtime_ns, stat.st_size, content_hash
+
+    def _submit_ready(self, executor, manifest):
+        now = time.monotonic()
+        busy = {entry[0] for entry in self.in_flight.values()}
+        for path, ready_at in list(self.waiting.items()):
+            if len(self.in_flight) >= self.max_in_flight:
+                return
+            if ready_at > now or path in busy:
+                continue
+            del self.waiting[path]
+            fingerprint = self._fingerprint(manifest, path)
+            if fingerprint:
+                future = executor.submit(pipeline._process_in_worker, path)
+                self.in_flight[future] = (path,) + fingerprint
+
+    def _collect_done(self, done, manifest, sink):
+        for future in done:
+            path, mtime_ns, size, content_hash = self.in_flight.pop(future)
+            try:
+                result, worker_metrics = future.result()
+                metrics.merge(worker_metrics)
+            except BaseException as e:
+                # Includes a KeyboardInterrupt raised in the worker
+                manifest.record(path, mtime_ns, size, content_hash, "failed", repr(e))
+                self._schedule_retry(path, e)
+                continue
+            self.failures.pop(path, None)
+            if result:
+                sink.write(path, result)
+                self.uncommitted.append((path, mtime_ns, size, content_hash))
+                print(f"Ingested {path}")
+            else:
+                manifest.record(path, mtime_ns, size, content_hash, "empty")
+        self._record_committed(manifest, sink)
+
+    # Function to queue a failed file again after a backoff; a change event for it comes sooner
+    def _schedule_retry(self, path, error):
+        attempts = self.failures[path] = self.failures.get(path, 0) + 1
+        delay = min(RETRY_MAX_SECONDS, RETRY_SECONDS * 2 ** (attempts - 1))
+        self.waiting.setdefault(path, time.monotonic() + delay)
+        metrics.count("errors", stage="ingest")
+        print(f"Error processing file {path}: {error!r}; retrying in {delay:.0f}s")
+
+    # Function to mark files "done" once the sink has committed their rows; a crash before
+    # the commit leaves them unrecorded, so they are processed again
+    def _record_committed(self, manifest, sink):
+        pending = set(sink.pending)
+        still_pending = []
+        for entry in self.uncommitted:
+            if entry[0] in pending:
+                still_pending.append(entry)
+            else:
+                manifest.record(*entry, "done")
+        self.uncommitted = still_pending
+
+    def run(self):
+        manifest = Manifest(os.path.join(self.output_dir, MANIFEST_NAME))
+        # Same outputs as LLMA_Prompt_Extract for the current EXTRACTION_MODE, under "ingested_" names
+        output_name, fieldnames, format_row, text_writer = pipeline.output_layout(self.output_dir, "ingested")
+        output_file = os.path.join(self.output_dir, f"{output_name}.csv")
+        writers = [CsvWriter(output_file, fieldnames, format_row), text_writer]
+        if pipeline.WRITE_STORE:
+            writers.append(CandidateStoreWriter(os.path.join(self.output_dir, DEFAULT_STORE_NAME)))
+        # The checkpoint is kept on shutdown, so a restarted daemon appends to the same outputs
+        sink = ResultSink(writers, os.path.join(self.output_dir, f".{output_name}.progress"),
+                          flush_interval=COMMIT_INTERVAL)
+
+        watcher = EventWatcher(self.folder, self.events) if self.use_events else \
+            PollingWatcher(self.folder, self.events, self.poll_interval)
+        print(f"Watching '{self.folder}' ({'file system events' if self.use_events else 'polling'}), "
+              f"{self.workers} worker(s); results go to '{output_file}'")
+
+        executor = ProcessPoolExecutor(max_workers=self.workers, initializer=pipeline._init_worker,
+                                       initargs=(self.threads_per_worker,))
+        watcher.start()
+        try:
+            while not self.stopped.is_set():
+                self._drain_events()
+                self._submit_ready(executor, manifest)
+                if self.in_flight:
+                    done, _ = wait(self.in_flight, timeout=LOOP_INTERVAL, return_when=FIRST_COMPLETED)
+                    self._collect_done(done, manifest, sink)
+                else:
+                    self.stopped.wait(LOOP_INTERVAL)
+                sink.commit_if_due()
+                self._record_committed(manifest, sink)
+        except KeyboardInterrupt:
+            print("Stopping; finishing files already in progress...")
+        finally:
+            watcher.stop()
+            try:
+                self._collect_done(list(self.in_flight), manifest, sink)
+            finally:
+                executor.shutdown(cancel_futures=True)
+                sink.close(keep_checkpoint=True)
+                self._record_committed(manifest, sink)
+                print(f"Manifest: {manifest.counts()}")
+                manifest.close()
+
+    def stop(self):
+        self.stopped.set()
+
+
+# Command line: python ingest_watcher.py <drop_folder> [output_dir] [--poll]
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    use_events = "--poll" not in args
+    paths = [arg for arg in args if arg != "--poll"]
+    if not paths or not os.path.isdir(paths[0]):
+        print("Usage: python ingest_watcher.py <drop_folder> [output_dir] [--poll]")
+        sys.exit(1)
+    IngestDaemon(paths[0], paths[1] if len(paths) > 1 else None, use_events=use_events).run()
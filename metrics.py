@@ -0,0 +1,280 @@
+import os
+import json
+import time
+import heapq
+import atexit
+import bisect
+import threading
+import multiprocessing
+from contextlib import nullcontext
+
+# Set RESUME_METRICS to an output path to collect metrics for a run. The format
+# follows the extension: .prom/.txt = OpenMetrics, .trace.json = Chrome trace, anything else = JSON
+METRICS_PATH = os.environ.get("RESUME_METRICS", "")
+
+# Latency histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+SLOWEST_FILES = 20
+MAX_TRACE_EVENTS = 200000
+METRIC_PREFIX = "resume_"
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (Prometheus-style, upper bounds inclusive)."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # The last bucket is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    # Upper bound of the bucket holding the q-quantile
+    def quantile(self, q):
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def merge(self, counts, total, count):
+        self.counts = [a + b for a, b in zip(self.counts, counts)]
+        self.sum += total
+        self.count += count
+
+
+class _Stage:
+    """Times one stage; records its latency, an error count on exceptions and a trace event."""
+
+    __slots__ = ("metrics", "name", "file", "start", "wall_start")
+
+    def __init__(self, metrics, name, file):
+        self.metrics = metrics
+        self.name = name
+        self.file = file
+
+    def __enter__(self):
+        self.wall_start = time.time_ns()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        duration = time.perf_counter_ns() - self.start
+        self.metrics.record_stage(self.name, self.file, self.wall_start, duration, exc_type is not None)
+        return False
+
+
+class Metrics:
+    """Counters, latency histograms, the slowest files and trace events for one process."""
+
+    def __init__(self, trace=True):
+        self.lock = threading.Lock()
+        self.counters = {}    # (name, labels) -> value
+        self.histograms = {}  # (name, labels) -> Histogram
+        self.slowest = []     # Min-heap of (seconds, file)
+        self.events = [] if trace else None
+
+    def stage(self, name, file=None):
+        return _Stage(self, name, file)
+
+    def count(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def record_stage(self, name, file, wall_start, duration_ns, failed):
+        seconds = duration_ns / 1e9
+        self.observe("stage_seconds", seconds, stage=name)
+        if failed:
+            self.count("errors", stage=name)
+        with self.lock:
+            if name == "file" and file:
+                self._push_slowest(seconds, str(file))
+            if self.events is not None and len(self.events) < MAX_TRACE_EVENTS:
+                self.events.append({
+                    "name": name, "cat": "stage", "ph": "X",
+                    "ts": wall_start // 1000, "dur": duration_ns // 1000,
+                    "pid": os.getpid(), "tid": threading.get_ident(),
+                    "args": {"file": str(file)} if file else {},
+                })
+
+    def _push_slowest(self, seconds, file):
+        if len(self.slowest) < SLOWEST_FILES:
+            heapq.heappush(self.slowest, (seconds, file))
+        else:
+            heapq.heappushpop(self.slowest, (seconds, file))
+
+    def snapshot(self):
+        """Plain-data copy of everything recorded, for JSON export or merging into another process."""
+        with self.lock:
+            return {
+                "counters": [{"name": name, "labels": dict(labels), "value": value}
+                             for (name, labels), value in self.counters.items()],
+                "histograms": [{"name": name, "labels": dict(labels), "buckets": list(h.buckets),
+                                "counts": list(h.counts), "sum": h.sum, "count": h.count}
+                               for (name, labels), h in self.histograms.items()],
+                "slowest_files": [{"file": file, "seconds": seconds} for seconds, file in sorted(self.slowest, reverse=True)],
+                "events": list(self.events or []),
+            }
+
+    def merge(self, snapshot):
+        """Adds a snapshot taken in another process (e.g. a pool worker)."""
+        for counter in snapshot["counters"]:
+            self.count(counter["name"], counter["value"], **counter["labels"])
+        with self.lock:
+            for entry in snapshot["histograms"]:
+                key = (entry["name"], tuple(sorted(entry["labels"].items())))
+                histogram = self.histograms.get(key)
+                if histogram is None:
+                    histogram = self.histograms[key] = Histogram(entry["buckets"])
+                histogram.merge(entry["counts"], entry["sum"], entry["count"])
+            for entry in snapshot["slowest_files"]:
+                self._push_slowest(entry["seconds"], entry["file"])
+            if self.events is not None:
+                self.events.extend(snapshot["events"][:MAX_TRACE_EVENTS - len(self.events)])
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.slowest.clear()
+            if self.events is not None:
+                self.events.clear()
+
+    def cache_hit_rates(self):
+        lookups = {}
+        for (name, labels), value in self.counters.items():
+            labels = dict(labels)
+            if name == "cache_lookups":
+                hits, total = lookups.get(labels.get("cache"), (0, 0))
+                lookups[labels.get("cache")] = (hits + (value if labels.get("result") == "hit" else 0), total + value)
+        return {cache: hits / total for cache, (hits, total) in lookups.items() if total}
+
+    def to_json(self):
+        snapshot = self.snapshot()
+        snapshot.pop("events")
+        for entry in snapshot["histograms"]:
+            histogram = Histogram(entry["buckets"])
+            histogram.merge(entry["counts"], entry["sum"], entry["count"])
+            entry.update(p50=histogram.quantile(0.5), p95=histogram.quantile(0.95), p99=histogram.quantile(0.99))
+        snapshot["cache_hit_rates"] = self.cache_hit_rates()
+        return json.dumps(snapshot, indent=1)
+
+    def to_openmetrics(self):
+        lines = []
+        counters, histograms = {}, {}
+        for (name, labels), value in sorted(self.counters.items()):
+            counters.setdefault(name, []).append((labels, value))
+        for (name, labels), histogram in sorted(self.histograms.items(), key=lambda item: item[0]):
+            histograms.setdefault(name, []).append((labels, histogram))
+
+        for name, samples in counters.items():
+            lines.append(f"# TYPE {METRIC_PREFIX}{name} counter")
+            for labels, value in samples:
+                lines.append(f"{METRIC_PREFIX}{name}_total{_format_labels(labels)} {value}")
+        for name, samples in histograms.items():
+            lines.append(f"# TYPE {METRIC_PREFIX}{name} histogram")
+            for labels, histogram in samples:
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(float(bound))
+                    lines.append(f"{METRIC_PREFIX}{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{METRIC_PREFIX}{name}_sum{_format_labels(labels)} {histogram.sum}")
+                lines.append(f"{METRIC_PREFIX}{name}_count{_format_labels(labels)} {histogram.count}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def to_chrome_trace(self):
+        return json.dumps({"traceEvents": self.snapshot()["events"], "displayTimeUnit": "ms"})
+
+    def export(self, path):
+        if path.endswith((".prom", ".txt")):
+            content = self.to_openmetrics()
+        elif path.endswith(".trace.json"):
+            content = self.to_chrome_trace()
+        else:
+            content = self.to_json()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in labels)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + "}"
+
+
+# Process-wide collector; None means disabled and every helper below is a no-op
+_metrics = None
+NULL_STAGE = nullcontext()
+
+def enable(trace=True):
+    global _metrics
+    if _metrics is None:
+        _metrics = Metrics(trace)
+    return _metrics
+
+def disable():
+    global _metrics
+    _metrics = None
+
+def enabled():
+    return _metrics is not None
+
+def get_metrics():
+    return _metrics
+
+def stage(name, file=None):
+    if _metrics is None:
+        return NULL_STAGE
+    return _metrics.stage(name, file)
+
+def count(name, value=1, **labels):
+    if _metrics is not None:
+        _metrics.count(name, value, **labels)
+
+def observe(name, seconds, **labels):
+    if _metrics is not None:
+        _metrics.observe(name, seconds, **labels)
+
+# Function for pool workers: hand back what this process recorded since the last call
+def drain():
+    if _metrics is None:
+        return None
+    snapshot = _metrics.snapshot()
+    _metrics.reset()
+    return snapshot
+
+def merge(snapshot):
+    if _metrics is not None and snapshot:
+        _metrics.merge(snapshot)
+
+def export(path=None):
+    path = path or METRICS_PATH
+    if _metrics is not None and path:
+        _metrics.export(path)
+        print(f"Metrics written to '{path}'")
+
+
+# Workers inherit RESUME_METRICS and collect too, but only the main process writes the file
+if METRICS_PATH:
+    enable()
+    if multiprocessing.parent_process() is None:
+        atexit.register(export)
@@ -0,0 +1,206 @@
+import os
+import re
+import sys
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+from collections import Counter
+import numpy as np
+import metrics
+from result_cache import get_cache, cache_key
+
+# MinHash / LSH settings. 16 bands of 8 rows make pairs above ~0.7 Jaccard likely candidates;
+# candidates are then confirmed against SIMILARITY_THRESHOLD on the full signature.
+SHINGLE_WORDS = 5
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SIMILARITY_THRESHOLD = 0.8
+SEED = 1
+
+# Index location (override with RESUME_DEDUP_PATH); it lives next to the result cache
+DEFAULT_INDEX_PATH = os.environ.get(
+    "RESUME_DEDUP_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "resume25", "near_duplicates.sqlite"),
+)
+
+# Universal hash family h(x) = (a * x + b) mod p; with 31-bit inputs and p = 2^31 - 1 nothing overflows uint64
+_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(SEED)
+_A = _rng.randint(1, _PRIME, size=(NUM_PERM, 1)).astype(np.uint64)
+_B = _rng.randint(0, _PRIME, size=(NUM_PERM, 1)).astype(np.uint64)
+
+WORD_PATTERN = re.compile(r"\w+")
+
+# Function to hash every run of SHINGLE_WORDS words; crc32 keeps the hashes stable across runs
+def shingles(text):
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) < SHINGLE_WORDS:
+        return {zlib.crc32(" ".join(words).encode("utf-8")) & _PRIME} if words else set()
+    return {zlib.crc32(" ".join(words[i:i + SHINGLE_WORDS]).encode("utf-8")) & _PRIME
+            for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+# Function to compute a text's MinHash signature; None when it has no words
+def minhash(text):
+    hashes = shingles(text)
+    if not hashes:
+        return None
+    values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+    return ((_A * values + _B) % _PRIME).min(axis=1).astype(np.uint32)
+
+def band_keys(signature):
+    return [int.from_bytes(hashlib.blake2b(signature[band * ROWS:(band + 1) * ROWS].tobytes(), digest_size=8).digest(),
+                           "little", signed=True) for band in range(BANDS)]
+
+def similarity(a, b):
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+class NearDuplicateIndex:
+    """Persistent LSH index of MinHash signatures, one row per distinct file content.
+
+    Only canonical documents (the first copy seen of each cluster) go into the
+    band buckets, so every later near-duplicate points straight at its canonical.
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH, threshold=SIMILARITY_THRESHOLD):
+        self.path = path
+        self.threshold = threshold
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Worker processes share the file, so wait on locks instead of failing
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            " content_hash TEXT PRIMARY KEY,"
+            " path TEXT,"
+            " signature BLOB NOT NULL,"
+            " canonical TEXT NOT NULL,"
+            " similarity REAL NOT NULL,"
+            " added REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS documents_canonical ON documents (canonical)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            " band INTEGER NOT NULL,"
+            " bucket INTEGER NOT NULL,"
+            " content_hash TEXT NOT NULL,"
+            " PRIMARY KEY (band, bucket, content_hash)) WITHOUT ROWID"
+        )
+        self.conn.commit()
+
+    # Best canonical document above the threshold as (content_hash, similarity), or None
+    def find(self, signature):
+        candidates = set()
+        for band, bucket in enumerate(band_keys(signature)):
+            candidates.update(row[0] for row in self.conn.execute(
+                "SELECT content_hash FROM buckets WHERE band = ? AND bucket = ?", (band, bucket)))
+        best = None
+        for content_hash in candidates:
+            row = self.conn.execute("SELECT signature FROM documents WHERE content_hash = ?", (content_hash,)).fetchone()
+            score = similarity(signature, np.frombuffer(row[0], dtype=np.uint32))
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (content_hash, score)
+        return best
+
+    def add(self, content_hash, path, signature):
+        """Records a document; returns (canonical content_hash, canonical path, similarity) for its cluster."""
+        row = self.conn.execute(
+            "SELECT d.canonical, c.path, d.similarity FROM documents d JOIN documents c ON c.content_hash = d.canonical"
+            " WHERE d.content_hash = ?", (content_hash,)).fetchone()
+        if row is not None:
+            return row
+
+        match = self.find(signature)
+        canonical, score = match if match else (content_hash, 1.0)
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO documents (content_hash, path, signature, canonical, similarity, added)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (content_hash, os.path.abspath(path), signature.tobytes(), canonical, score, time.time()),
+            )
+            if match is None:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO buckets (band, bucket, content_hash) VALUES (?, ?, ?)",
+                    [(band, bucket, content_hash) for band, bucket in enumerate(band_keys(signature))],
+                )
+        canonical_path = self.conn.execute("SELECT path FROM documents WHERE content_hash = ?", (canonical,)).fetchone()[0]
+        return canonical, canonical_path, score
+
+    # Cluster size -> number of clusters of that size
+    def cluster_sizes(self):
+        rows = self.conn.execute("SELECT COUNT(*) FROM documents GROUP BY canonical").fetchall()
+        return dict(sorted(Counter(size for size, in rows).items()))
+
+    def largest_clusters(self, top=10):
+        return self.conn.execute(
+            "SELECT c.path, COUNT(*) AS size FROM documents d JOIN documents c ON c.content_hash = d.canonical"
+            " GROUP BY d.canonical HAVING size > 1 ORDER BY size DESC LIMIT ?", (top,)).fetchall()
+
+    def stats(self):
+        documents, clusters = self.conn.execute("SELECT COUNT(*), COUNT(DISTINCT canonical) FROM documents").fetchone()
+        return {"documents": documents, "clusters": clusters, "duplicates": documents - clusters,
+                "cluster_sizes": self.cluster_sizes()}
+
+    def clear(self):
+        with self.conn:
+            cursor = self.conn.execute("DELETE FROM documents")
+            self.conn.execute("DELETE FROM buckets")
+        return cursor.rowcount
+
+    def close(self):
+        self.conn.close()
+
+
+# One index connection per process, opened on first use
+_index = None
+
+def get_index():
+    global _index
+    if _index is None:
+        _index = NearDuplicateIndex()
+    return _index
+
+# Function to reuse the cached result of an already-processed near-duplicate of this file.
+# Returns (result, canonical path), or (None, None) when the file is new or the canonical has no result yet.
+def canonical_result(file_path, content_hash, text, *key_parts):
+    signature = minhash(text)
+    if signature is None:
+        return None, None
+    with metrics.stage("dedup", file_path):
+        canonical, canonical_path, _ = get_index().add(content_hash, file_path, signature)
+    if canonical == content_hash:
+        metrics.count("near_duplicates", result="canonical")
+        return None, None
+
+    result = get_cache().get(cache_key(canonical, *key_parts))
+    metrics.count("near_duplicates", result="reused" if result is not None else "pending")
+    return result, canonical_path
+
+# Function to print the cluster size distribution and the largest clusters
+def print_cluster_report(index=None, top=10):
+    index = index or get_index()
+    stats = index.stats()
+    print(f"Near-duplicates: {stats['documents']} document(s) in {stats['clusters']} cluster(s), "
+          f"{stats['duplicates']} duplicate(s)")
+    sizes = {size: count for size, count in stats["cluster_sizes"].items() if size > 1}
+    if sizes:
+        print("  Cluster sizes: " + ", ".join(f"{count} x {size}" for size, count in sizes.items()))
+        for path, size in index.largest_clusters(top):
+            print(f"  {size:>5}  {path}")
+
+# Command line: stats | json | clear
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    index = get_index()
+    if command == "stats":
+        print_cluster_report(index)
+    elif command == "json":
+        print(json.dumps(index.stats(), indent=4))
+    elif command == "clear":
+        print(f"Removed {index.clear()} document(s) from '{index.path}'.")
+    else:
+        print("Usage: python near_duplicates.py [stats | json | clear]")
+        sys.exit(1)
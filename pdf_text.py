@@ -0,0 +1,71 @@
+import os
+import sys
+import time
+import pdfplumber
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# Files with at least this many pages are split across worker processes
+PARALLEL_MIN_PAGES = 16
+PDF_WORKERS = None  # None = os.cpu_count()
+
+# Function to extract one page's text; the fast path skips pdfplumber's layout analysis
+def extract_page_text(page, fast=False):
+    if fast and hasattr(page, "extract_text_simple"):
+        return page.extract_text_simple()
+    return page.extract_text()
+
+# Worker: extract a contiguous range of pages, timing each one and counting its images
+def extract_page_range(pdf_path, start, stop, fast=False):
+    pages = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for index in range(start, stop):
+            page_start = time.perf_counter()
+            page = pdf.pages[index]
+            text = extract_page_text(page, fast) or ""
+            images = len(page.images)
+            page.close()  # Drop the page's cached layout objects
+            pages.append((index, text, time.perf_counter() - page_start, images))
+    return pages
+
+def count_pages(pdf_path):
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+# Function to extract every page, in parallel for large files; returns (index, text, seconds, images) per page.
+# Inside a worker process (LLMA_Prompt_Extract's pool, the ingest daemon) pages stay serial,
+# since the cores are already shared out between the workers.
+def extract_pages(pdf_path, fast=False, workers=PDF_WORKERS):
+    page_count = count_pages(pdf_path)
+    workers = min(workers or os.cpu_count() or 1, page_count)
+    if page_count < PARALLEL_MIN_PAGES or workers <= 1 or multiprocessing.parent_process() is not None:
+        return extract_page_range(pdf_path, 0, page_count, fast)
+
+    # One contiguous range per worker so each process opens the file only once
+    step = -(-page_count // workers)
+    ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+    with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+        futures = [executor.submit(extract_page_range, pdf_path, start, stop, fast) for start, stop in ranges]
+        return [page for future in futures for page in future.result()]
+
+# Function to extract text from a PDF, assembled with a single join
+def extract_text_from_pdf(pdf_path, fast=False, workers=PDF_WORKERS):
+    return "".join(text + "\n" for _, text, _, _ in extract_pages(pdf_path, fast, workers) if text)
+
+# Function to print the slowest pages so pathological PDFs stand out
+def print_page_report(pdf_path, pages, top=10):
+    total = sum(seconds for _, _, seconds, _ in pages)
+    print(f"{pdf_path}: {len(pages)} page(s), {total:.3f}s total")
+    for index, text, seconds, _ in sorted(pages, key=lambda page: page[2], reverse=True)[:top]:
+        print(f"  page {index + 1:>4}: {seconds * 1000:9.1f} ms  {len(text):>7} chars")
+
+# Command line: python pdf_text.py [--fast] <file.pdf>...
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    fast = "--fast" in args
+    paths = [arg for arg in args if arg != "--fast"]
+    if not paths:
+        print("Usage: python pdf_text.py [--fast] <file.pdf>...")
+        sys.exit(1)
+    for path in paths:
+        print_page_report(path, extract_pages(path, fast))
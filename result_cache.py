@@ -0,0 +1,189 @@
+import os
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import metrics
+
+# Bump when extraction logic changes so old cached results stop matching
+EXTRACTOR_VERSION = "1"
+
+# Cache location and size bound (override with RESUME_CACHE_PATH / RESUME_CACHE_MAX_MB)
+DEFAULT_CACHE_PATH = os.environ.get(
+    "RESUME_CACHE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "resume25", "results.sqlite"),
+)
+DEFAULT_MAX_BYTES = int(os.environ.get("RESUME_CACHE_MAX_MB", "512")) * 1024 * 1024
+
+HASH_BLOCK_SIZE = 1024 * 1024
+HASH_MEMO_SIZE = 4096
+
+# Hashes already computed in this process, keyed by (path, mtime_ns, size), so the
+# result cache and the loader's parse cache read a file's bytes only once
+_hash_memo = {}
+
+# Function to hash the raw bytes of a resume file
+def hash_file(file_path):
+    stat = os.stat(file_path)
+    memo_key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+    if memo_key in _hash_memo:
+        return _hash_memo[memo_key]
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    if len(_hash_memo) >= HASH_MEMO_SIZE:
+        _hash_memo.clear()
+    _hash_memo[memo_key] = digest.hexdigest()
+    return _hash_memo[memo_key]
+
+# Function to build a cache key from the file content plus model/prompt settings
+def cache_key(content_hash, *parts):
+    digest = hashlib.sha256(content_hash.encode("utf-8"))
+    for part in (EXTRACTOR_VERSION,) + parts:
+        digest.update(b"\0")
+        digest.update(str(part).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """On-disk, size-bounded LRU cache of per-file extraction results.
+
+    resume_loader also keeps each file's parsed pages/paragraphs here, under a
+    key that depends only on the content, so they outlive model and prompt changes.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Worker processes share the file, so wait on locks instead of failing
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY,"
+            " content_hash TEXT NOT NULL,"
+            " path TEXT,"
+            " result TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS results_content_hash ON results (content_hash)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access)")
+        self.conn.commit()
+
+    # `label` keeps lookups from different users apart in the metrics (the loader passes "parse")
+    def get(self, key, label="result"):
+        row = self.conn.execute("SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            metrics.count("cache_lookups", cache=label, result="miss")
+            return None
+        self.hits += 1
+        metrics.count("cache_lookups", cache=label, result="hit")
+        with self.conn:
+            self.conn.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, key, content_hash, path, result):
+        payload = json.dumps(result)
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO results (key, content_hash, path, result, size, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, content_hash, os.path.abspath(path), payload, len(payload), time.time()),
+            )
+        self.evict()
+
+    # Drop least recently used entries until the cache fits in max_bytes
+    def evict(self):
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+        removed = 0
+        with self.conn:
+            for key, size in self.conn.execute("SELECT key, size FROM results ORDER BY last_access").fetchall():
+                if total <= self.max_bytes:
+                    break
+                self.conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                total -= size
+                removed += 1
+        return removed
+
+    # Remove every cached result for the given file's content (all models/prompts)
+    def invalidate(self, file_path):
+        with self.conn:
+            cursor = self.conn.execute("DELETE FROM results WHERE content_hash = ?", (hash_file(file_path),))
+        return cursor.rowcount
+
+    def clear(self):
+        with self.conn:
+            cursor = self.conn.execute("DELETE FROM results")
+        return cursor.rowcount
+
+    def stats(self):
+        count, total = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        return {"entries": count, "bytes": total, "max_bytes": self.max_bytes, "hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        self.conn.close()
+
+
+# One cache connection per thread, opened on first use: SQLite connections may only be used
+# by the thread that opened them, and the API scripts parse in asyncio.to_thread workers
+_local = threading.local()
+
+def get_cache():
+    cache = getattr(_local, "cache", None)
+    if cache is None:
+        cache = _local.cache = ResultCache(DEFAULT_CACHE_PATH)
+    return cache
+
+# Function to look up a file's result; returns (key, content_hash, result or None)
+def lookup(file_path, *key_parts):
+    content_hash = hash_file(file_path)
+    key = cache_key(content_hash, *key_parts)
+    return key, content_hash, get_cache().get(key)
+
+# Function to look up a file's result, computing and storing it on a miss
+def cached_result(file_path, compute, *key_parts):
+    key, content_hash, result = lookup(file_path, *key_parts)
+    if result is None:
+        result = compute(file_path)
+        if result is not None:
+            get_cache().put(key, content_hash, file_path, result)
+    return result
+
+
+def _iter_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for file_name in os.listdir(path):
+                file_path = os.path.join(path, file_name)
+                if os.path.isfile(file_path):
+                    yield file_path
+        elif os.path.isfile(path):
+            yield path
+        else:
+            print(f"Skipping missing path: {path}")
+
+# Command line: stats | clear | invalidate <file-or-folder>...
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    cache = get_cache()
+    if command == "stats":
+        print(json.dumps(cache.stats(), indent=4))
+    elif command == "clear":
+        print(f"Removed {cache.clear()} cached result(s) from '{cache.path}'.")
+    elif command == "invalidate" and len(sys.argv) > 2:
+        removed = sum(cache.invalidate(file_path) for file_path in _iter_files(sys.argv[2:]))
+        print(f"Removed {removed} cached result(s) from '{cache.path}'.")
+    else:
+        print("Usage: python result_cache.py [stats | clear | invalidate <file-or-folder>...]")
+        sys.exit(1)
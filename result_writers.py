@@ -0,0 +1,248 @@
+import io
+import os
+import csv
+import json
+import time
+import metrics
+from abc import ABC, abstractmethod
+
+# Parquet output is optional
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+# Commit (flush + fsync) at least every FLUSH_EVERY records or FLUSH_INTERVAL seconds
+FLUSH_EVERY = 50
+FLUSH_INTERVAL = 5.0
+
+# JSON Lines records carry the sink key (the resume's absolute path) so they can be re-imported by it
+SOURCE_PATH_FIELD = "Source Path"
+
+
+class FileWriter(ABC):
+    """Appends encoded records to one output file; resumes by truncating to a committed offset."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    def header(self):
+        return ""
+
+    @abstractmethod
+    def encode(self, record):
+        """Returns one record as the text appended to the file."""
+
+    def open(self, offset=None):
+        if offset is None or not os.path.exists(self.path):
+            self.file = open(self.path, "wb")
+            self.file.write(self.header().encode("utf-8"))
+        else:
+            # Drop anything written after the last commit (e.g. a half-written row)
+            self.file = open(self.path, "r+b")
+            self.file.truncate(offset)
+            self.file.seek(offset)
+
+    def write(self, record, key=None):
+        self.file.write(self.encode(record).encode("utf-8"))
+
+    def commit(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+class CsvWriter(FileWriter):
+    def __init__(self, path, fieldnames, format_row=None):
+        super().__init__(path)
+        self.fieldnames = fieldnames
+        self.format_row = format_row or (lambda record: record)
+
+    def _line(self, writer_call):
+        buffer = io.StringIO()
+        writer_call(csv.DictWriter(buffer, fieldnames=self.fieldnames))
+        return buffer.getvalue()
+
+    def header(self):
+        return self._line(lambda writer: writer.writeheader())
+
+    def encode(self, record):
+        return self._line(lambda writer: writer.writerow(self.format_row(record)))
+
+
+class JsonLinesWriter(FileWriter):
+    def write(self, record, key=None):
+        super().write({**record, SOURCE_PATH_FIELD: key} if key else record, key)
+
+    def encode(self, record):
+        return json.dumps(record, ensure_ascii=False) + "\n"
+
+
+class TextWriter(FileWriter):
+    def __init__(self, path, format_record):
+        super().__init__(path)
+        self.format_record = format_record
+
+    def encode(self, record):
+        return self.format_record(record)
+
+
+class ParquetWriter:
+    """Writes each commit as its own Parquet part file under a dataset directory.
+
+    Every part is closed as soon as it is written, so a crash never leaves an
+    unreadable file behind; pandas/pyarrow read the directory as one table.
+    """
+
+    def __init__(self, path, fieldnames, format_row=None):
+        if pq is None:
+            raise ImportError("Parquet output requires the 'pyarrow' package")
+        self.path = path
+        self.fieldnames = fieldnames
+        self.format_row = format_row or (lambda record: record)
+        self.schema = pa.schema([(name, pa.string()) for name in fieldnames])
+        self.rows = []
+        self.parts = 0
+
+    def open(self, offset=None):
+        os.makedirs(self.path, exist_ok=True)
+        if offset is None:
+            for file_name in os.listdir(self.path):
+                if file_name.endswith(".parquet"):
+                    os.remove(os.path.join(self.path, file_name))
+        else:
+            self.parts = offset
+            # Parts written after the last checkpoint belong to uncommitted records
+            for file_name in os.listdir(self.path):
+                if file_name.endswith(".parquet") and int(file_name[5:-8]) >= offset:
+                    os.remove(os.path.join(self.path, file_name))
+
+    def write(self, record, key=None):
+        row = self.format_row(record)
+        self.rows.append({name: None if row.get(name) is None else str(row.get(name)) for name in self.fieldnames})
+
+    def commit(self):
+        if self.rows:
+            table = pa.Table.from_pylist(self.rows, schema=self.schema)
+            pq.write_table(table, os.path.join(self.path, f"part-{self.parts:05d}.parquet"))
+            self.parts += 1
+            self.rows = []
+        return self.parts
+
+    def close(self):
+        pass
+
+
+class ResultSink:
+    """Fans records out to several writers and checkpoints them together.
+
+    A commit flushes and fsyncs every writer, appends the committed record keys
+    to a keys log and atomically rewrites a small checkpoint with each writer's
+    offset. After a crash the next run truncates the outputs back to the last
+    checkpoint and skips keys that were already committed. A clean close
+    removes the checkpoint, so the following run starts fresh. The checkpoint
+    also records each writer's type and fields; a run with different outputs
+    refuses to resume it rather than append mismatched rows.
+    """
+
+    def __init__(self, writers, checkpoint_path, flush_every=FLUSH_EVERY, flush_interval=FLUSH_INTERVAL):
+        self.writers = writers
+        self.checkpoint_path = checkpoint_path
+        self.keys_path = checkpoint_path + ".keys"
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.committed = set()
+        self.pending = []
+        self.records = 0
+        self.last_commit = time.monotonic()
+        self.layout = {writer.path: [type(writer).__name__, list(getattr(writer, "fieldnames", None) or [])]
+                       for writer in writers}
+
+        checkpoint = self._load_checkpoint()
+        if checkpoint and checkpoint.get("writers", self.layout) != self.layout:
+            raise ValueError(f"'{checkpoint_path}' was left by a run with different outputs "
+                             f"({checkpoint['writers']}); finish that run or delete the checkpoint to start over.")
+        offsets = checkpoint["offsets"] if checkpoint else {}
+        for writer in writers:
+            writer.open(offsets.get(writer.path))
+
+        if checkpoint:
+            self.keys_file = open(self.keys_path, "r+b" if os.path.exists(self.keys_path) else "wb")
+            self.keys_file.truncate(checkpoint["keys_offset"])
+            self.keys_file.seek(checkpoint["keys_offset"])
+            with open(self.keys_path, "r", encoding="utf-8") as keys:
+                self.committed.update(line.rstrip("\n") for line in keys)
+            self.records = checkpoint["records"]
+            print(f"Resuming after {self.records} committed record(s).")
+        else:
+            self.keys_file = open(self.keys_path, "wb")
+
+    def _load_checkpoint(self):
+        if not os.path.exists(self.checkpoint_path):
+            return None
+        with open(self.checkpoint_path, "r", encoding="utf-8") as file:
+            return json.load(file)
+
+    def is_committed(self, key):
+        return key in self.committed
+
+    def write(self, key, record):
+        with metrics.stage("write"):
+            for writer in self.writers:
+                writer.write(record, key)
+        self.pending.append(key)
+        if len(self.pending) >= self.flush_every:
+            self.commit()
+        else:
+            self.commit_if_due()
+
+    # Long-running callers also call this while idle so the last records never wait for the next write
+    def commit_if_due(self):
+        if self.pending and time.monotonic() - self.last_commit >= self.flush_interval:
+            self.commit()
+
+    def commit(self):
+        with metrics.stage("commit"):
+            self._commit()
+
+    def _commit(self):
+        offsets = {writer.path: writer.commit() for writer in self.writers}
+        self.keys_file.write("".join(f"{key}\n" for key in self.pending).encode("utf-8"))
+        self.keys_file.flush()
+        os.fsync(self.keys_file.fileno())
+
+        self.committed.update(self.pending)
+        self.records += len(self.pending)
+        self.pending = []
+        self.last_commit = time.monotonic()
+
+        checkpoint = {"offsets": offsets, "keys_offset": self.keys_file.tell(), "records": self.records,
+                      "writers": self.layout}
+        temp_path = self.checkpoint_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(checkpoint, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.checkpoint_path)
+
+    def close(self, keep_checkpoint=False):
+        """Commits and closes; keep_checkpoint makes the next run append after this one instead of starting fresh."""
+        self.commit()
+        for writer in self.writers:
+            writer.close()
+        self.keys_file.close()
+        if not keep_checkpoint:
+            os.remove(self.checkpoint_path)
+            os.remove(self.keys_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        # After an error keep the checkpoint so the next run resumes from the last commit
+        self.close(keep_checkpoint=exc_type is not None)
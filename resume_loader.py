@@ -0,0 +1,156 @@
+import os
+import zipfile
+from functools import cached_property
+import pdf_text
+import docx_stream
+import metrics
+from resume_sections import index_sections
+from result_cache import get_cache, cache_key, hash_file
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".txt")
+CHARS_PER_PAGE = 1800  # Rough estimate of characters per page for formats without real pages
+
+# Parsed PDF pages and .docx paragraphs are kept in the result cache by content hash, so a
+# model, prompt or script change reuses them (set RESUME_PARSE_CACHE=0 to always parse)
+PARSE_CACHE = os.environ.get("RESUME_PARSE_CACHE", "1") != "0"
+PARSER_VERSION = "1"  # Bump when parsing output changes
+
+# Leading bytes used to recognise files whose name has no supported extension
+PDF_MAGIC = b"%PDF-"
+ZIP_MAGIC = b"PK\x03\x04"
+
+
+# Function to pick a file's format from its extension, or from its first bytes when the extension is unknown
+def detect_extension(path, sniff=True):
+    extension = os.path.splitext(path)[1].lower()
+    if extension in SUPPORTED_EXTENSIONS:
+        return extension
+    if not sniff:
+        return None
+    try:
+        with open(path, "rb") as file:
+            head = file.read(len(PDF_MAGIC))
+        if head.startswith(PDF_MAGIC):
+            return ".pdf"
+        if head.startswith(ZIP_MAGIC):
+            # Only the zip's central directory is read
+            with zipfile.ZipFile(path) as archive:
+                if "word/document.xml" in archive.namelist():
+                    return ".docx"
+    except (OSError, zipfile.BadZipFile):
+        pass
+    return None
+
+
+class ResumeDocument:
+    """A resume file that is opened and parsed at most once.
+
+    Text, paragraphs, image count and page count are computed on first access
+    and cached, so every extractor reading the same document shares one parse.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file_name = os.path.basename(path)
+        self.extension = detect_extension(path)
+        if self.extension is None:
+            raise ValueError(f"Unsupported file type: {path}")
+
+    # Times the one real read of the file and counts its bytes when metrics are enabled
+    def _parse_stage(self):
+        if metrics.enabled():
+            metrics.count("bytes_read", os.path.getsize(self.path), format=self.extension.lstrip("."))
+        return metrics.stage("parse" + self.extension, self.path)
+
+    # Function to parse through the content-addressed cache; `parse` runs only on a miss
+    def _cached_parse(self, kind, parse):
+        if not PARSE_CACHE:
+            with self._parse_stage():
+                return parse()
+        content_hash = hash_file(self.path)
+        key = cache_key(content_hash, "parsed", self.extension, kind, PARSER_VERSION)
+        parsed = get_cache().get(key, label="parse")
+        if parsed is None:
+            with self._parse_stage():
+                parsed = parse()
+            get_cache().put(key, content_hash, self.path, parsed)
+        return parsed
+
+    @cached_property
+    def pdf_pages(self):
+        return self._cached_parse("pages", lambda: pdf_text.extract_pages(self.path))
+
+    @cached_property
+    def raw_text(self):
+        with self._parse_stage():
+            with open(self.path, "r", encoding="utf-8") as file:
+                return file.read()
+
+    @cached_property
+    def paragraphs(self):
+        if self.extension == ".docx":
+            # Streamed from word/document.xml; headers first and footers last, as docx2txt orders them
+            return self._cached_parse("paragraphs", lambda: docx_stream.read_paragraphs(self.path))
+        return self.text.splitlines()
+
+    @cached_property
+    def body_paragraphs(self):
+        """Top-level .docx body paragraphs only (no headers, footers or tables), as
+        python-docx's Document.paragraphs gives them; every paragraph for other formats."""
+        if self.extension == ".docx":
+            return self._cached_parse("body", lambda: list(docx_stream.iter_paragraphs(self.path, tables=False)))
+        return self.paragraphs
+
+    @cached_property
+    def body_text(self):
+        if self.extension == ".docx":
+            return "\n".join(self.body_paragraphs)
+        return self.text
+
+    @cached_property
+    def body_sections(self):
+        """Section index over `body_text`, for extractors that read the body only."""
+        return index_sections(self.body_text)
+
+    @cached_property
+    def text(self):
+        if self.extension == ".docx":
+            return "\n".join(self.paragraphs)
+        if self.extension == ".pdf":
+            return "".join(text + "\n" for _, text, _, _ in self.pdf_pages if text)
+        return self.raw_text
+
+    @cached_property
+    def spaced_text(self):
+        """Text with a blank line between .docx paragraphs, the layout docx2txt produced."""
+        if self.extension == ".docx":
+            return "\n\n".join(self.paragraphs)
+        return self.text
+
+    @cached_property
+    def sections(self):
+        """Heading -> offsets index over `text`, shared by every extractor that needs one section."""
+        return index_sections(self.text)
+
+    @cached_property
+    def image_count(self):
+        if self.extension == ".docx":
+            # Counted from the relationship part; the media is never decompressed
+            return docx_stream.count_images(self.path)
+        if self.extension == ".pdf":
+            return sum(images for _, _, _, images in self.pdf_pages)
+        return 0
+
+    @cached_property
+    def page_count(self):
+        if self.extension == ".pdf":
+            return len(self.pdf_pages)
+        return max(1, sum(len(paragraph) for paragraph in self.paragraphs) // CHARS_PER_PAGE)
+
+
+# Function to open any supported resume file
+def load_document(path):
+    return ResumeDocument(path)
+
+def is_supported(path):
+    return path.lower().endswith(SUPPORTED_EXTENSIONS)
@@ -0,0 +1,91 @@
+import sys
+
+# Heading spellings per canonical section name, matched case-insensitively on a line of their own
+# (or followed by a colon). Headings outside the first six only mark where the previous section ends.
+SECTION_ALIASES = {
+    "Experience": ("experience", "work experience", "professional experience", "relevant experience",
+                   "employment history", "work history", "career history"),
+    "Summary": ("summary", "professional summary", "career summary", "profile", "professional profile",
+                "objective", "career objective", "about me"),
+    "Education": ("education", "academic background", "academic qualifications", "education and training"),
+    "Skills": ("skills", "technical skills", "key skills", "core skills", "core competencies", "competencies"),
+    "Projects": ("projects", "personal projects", "key projects", "academic projects"),
+    "Contact": ("contact", "contact information", "contact details", "personal details", "personal information"),
+    "Certifications": ("certifications", "certificates", "licenses and certifications"),
+    "Awards": ("awards", "achievements", "honors and awards"),
+    "Languages": ("languages",),
+    "Interests": ("interests", "hobbies"),
+    "Publications": ("publications",),
+    "Links": ("links",),
+    "References": ("references",),
+}
+HEADER = "Header"  # Text before the first heading, usually the name and contact lines
+MAX_HEADING_CHARS = 40  # Longer lines are body text and skip the lookup
+
+_CANONICAL = {alias: name for name, aliases in SECTION_ALIASES.items() for alias in aliases}
+
+# Function to map a line to its canonical section name and where the section body starts, if it is a heading
+def match_heading(line):
+    head, colon, _ = line.partition(":")
+    if len(head) > MAX_HEADING_CHARS:
+        return None, 0
+    name = _CANONICAL.get(" ".join(head.strip().lstrip("#").lower().split()))
+    return name, len(head) + 1 if colon else len(line) + 1
+
+
+class SectionIndex:
+    """Section name -> character offsets for one resume text, built in a single pass.
+
+    `spans` maps each canonical name to a list of (heading_start, body_start, end)
+    offsets; a section runs until the next recognised heading. Repeated headings
+    (multi-page resumes) add another span to the same name.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.spans = {}
+        headings = []  # (name, heading_start, body_start)
+        position = 0
+        for line in text.split("\n"):
+            # A cheap length check first: most lines are body text
+            if len(line) <= MAX_HEADING_CHARS or line.find(":", 0, MAX_HEADING_CHARS + 1) != -1:
+                name, body = match_heading(line)
+                if name:
+                    headings.append((name, position, min(position + body, len(text))))
+            position += len(line) + 1
+
+        first = headings[0][1] if headings else len(text)
+        if text[:first].strip():
+            self.spans[HEADER] = [(0, 0, first)]
+        for (name, start, body), following in zip(headings, headings[1:] + [None]):
+            end = following[1] if following else len(text)
+            self.spans.setdefault(name, []).append((start, body, end))
+
+    def __contains__(self, name):
+        return name in self.spans
+
+    def names(self):
+        return list(self.spans)
+
+    def get(self, name, default=""):
+        """Body text of every span of `name`, without the headings."""
+        bodies = [self.text[body:end].strip() for _, body, end in self.spans.get(name, ())]
+        return "\n\n".join(body for body in bodies if body) or default
+
+    def slice(self, *names):
+        """Headings and bodies of the named sections, in document order, for building prompts."""
+        spans = sorted(span for name in names for span in self.spans.get(name, ()))
+        return "\n\n".join(self.text[start:end].strip() for start, _, end in spans)
+
+
+def index_sections(text):
+    return SectionIndex(text)
+
+# Command line: python resume_sections.py <resume>...  (prints each file's section map)
+if __name__ == "__main__":
+    from resume_loader import load_document
+    for path in sys.argv[1:]:
+        sections = load_document(path).sections
+        print(path)
+        for name, spans in sections.spans.items():
+            print(f"  {name:<15} " + ", ".join(f"{start}-{end}" for start, _, end in spans))
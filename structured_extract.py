@@ -0,0 +1,141 @@
+import re
+import json
+import metrics
+from resume_sections import HEADER, index_sections
+
+# JSON schema for one resume. Every list and string is bounded, so the grammar
+# itself caps how much the model can generate, on top of max_tokens.
+RESUME_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string", "maxLength": 60},
+        "email": {"type": "string", "maxLength": 80},
+        "phones": {"type": "array", "items": {"type": "string", "maxLength": 24}, "maxItems": 3},
+        "address": {"type": "string", "maxLength": 120},
+        "links": {"type": "array", "items": {"type": "string", "maxLength": 100}, "maxItems": 6},
+        "experience": {
+            "type": "array",
+            "maxItems": 6,
+            "items": {
+                "type": "object",
+                "properties": {
+                    "title": {"type": "string", "maxLength": 60},
+                    "company": {"type": "string", "maxLength": 60},
+                    "start": {"type": "string", "maxLength": 12},
+                    "end": {"type": "string", "maxLength": 12},
+                },
+                "required": ["title", "company", "start", "end"],
+            },
+        },
+        "skills": {"type": "array", "items": {"type": "string", "maxLength": 30}, "maxItems": 15},
+    },
+    "required": ["name", "email", "phones", "address", "links", "experience", "skills"],
+}
+
+EMPTY_FIELDS = {"name": "", "email": "", "phones": [], "address": "", "links": [], "experience": [], "skills": []}
+
+# Instruction prefix; it comes first so llama.cpp can reuse its evaluated KV state across resumes
+STRUCTURED_PROMPT = ("Extract the candidate's details from the resume below as JSON with the keys name, email, "
+                     "phones, address, links, experience (title, company, start, end) and skills. "
+                     "Use \"\" or [] for anything missing. Copy values exactly as written.\n\n"
+                     "Resume:\n")
+PROMPT_SUFFIX = "\n\nJSON:\n"
+STRUCTURED_MAX_TOKENS = 384
+
+# Sections the schema draws from; the rest of the resume is left out of the prompt
+STRUCTURED_SECTIONS = (HEADER, "Contact", "Experience", "Skills", "Links")
+MARGIN_TOKENS = 8
+
+# OpenAI-compatible APIs (DeepInfra) take JSON mode instead of a grammar; the schema travels in the prompt
+API_RESPONSE_FORMAT = {"type": "json_object"}
+
+_grammar = None
+
+# Function to build the llama.cpp grammar from the schema once per process
+def get_grammar():
+    global _grammar
+    if _grammar is None:
+        from llama_cpp import LlamaGrammar
+        _grammar = LlamaGrammar.from_json_schema(json.dumps(RESUME_SCHEMA), verbose=False)
+    return _grammar
+
+def build_prompt(text):
+    return STRUCTURED_PROMPT + text + PROMPT_SUFFIX
+
+def build_api_prompt(text):
+    return (STRUCTURED_PROMPT + text + "\n\nReply with only a JSON object matching this schema:\n"
+            + json.dumps(RESUME_SCHEMA, separators=(",", ":")))
+
+# Function to turn the model's JSON into a dict with every schema key; None when the JSON is unusable
+def parse_fields(reply):
+    try:
+        data = json.loads(reply)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(data, dict):
+        return None
+
+    fields = {}
+    for key, empty in EMPTY_FIELDS.items():
+        value = data.get(key, empty)
+        if isinstance(empty, str):
+            fields[key] = value.strip() if isinstance(value, str) else empty
+        else:
+            fields[key] = value if isinstance(value, list) else []
+    fields["phones"] = [str(phone).strip() for phone in fields["phones"] if str(phone).strip()]
+    fields["links"] = [str(link).strip() for link in fields["links"] if str(link).strip()]
+    fields["skills"] = [str(skill).strip() for skill in fields["skills"] if str(skill).strip()]
+    fields["experience"] = [
+        {part: str(entry.get(part, "")).strip() for part in ("title", "company", "start", "end")}
+        for entry in fields["experience"] if isinstance(entry, dict)
+    ]
+    return fields
+
+# Function to drop repeated spaces and blank lines, which cost tokens but carry nothing
+def compact(text):
+    return re.sub(r"[ \t]*\n\s*", "\n", re.sub(r"[ \t]+", " ", text)).strip()
+
+# Function to keep only the sections the schema needs; the whole text when no headings were recognised
+def select_sections(text, sections=None):
+    if sections is None:
+        sections = index_sections(text)
+    if "Experience" not in sections and "Skills" not in sections:
+        return text
+    return sections.slice(*STRUCTURED_SECTIONS)
+
+# Function to keep as much resume text as fits the context next to the prompt and the output budget
+def fit_to_context(model, text, max_tokens=STRUCTURED_MAX_TOKENS):
+    fixed = len(model.tokenize((STRUCTURED_PROMPT + PROMPT_SUFFIX).encode("utf-8"), add_bos=True))
+    budget = model.n_ctx() - fixed - max_tokens - MARGIN_TOKENS
+    tokens = model.tokenize(text.encode("utf-8"), add_bos=False)
+    if len(tokens) <= budget:
+        return text
+    metrics.count("structured_truncated")
+    return model.detokenize(tokens[:max(0, budget)]).decode("utf-8", errors="ignore")
+
+# Function to extract every field in one grammar-constrained pass of a llama.cpp model
+def extract_fields(model, text, max_tokens=STRUCTURED_MAX_TOKENS):
+    prompt = build_prompt(fit_to_context(model, compact(select_sections(text)), max_tokens))
+    with metrics.stage("llm"):
+        response = model(prompt, grammar=get_grammar(), max_tokens=max_tokens, temperature=0.0)
+    usage = response.get("usage") or {}
+    metrics.count("llm_tokens", usage.get("prompt_tokens", 0), direction="in")
+    metrics.count("llm_tokens", usage.get("completion_tokens", 0), direction="out")
+
+    choice = response["choices"][0]
+    fields = parse_fields(choice["text"])
+    if fields is None:
+        # Only possible when max_tokens cut the JSON short
+        metrics.count("errors", stage="structured_parse")
+        print(f"Structured output was not valid JSON (finish reason: {choice.get('finish_reason')})")
+        return dict(EMPTY_FIELDS)
+    return fields
+
+# Function to flatten experience entries into one readable string
+def format_experience(entries):
+    parts = []
+    for entry in entries:
+        when = f" ({entry['start']} - {entry['end']})" if entry["start"] or entry["end"] else ""
+        at = f" at {entry['company']}" if entry["company"] else ""
+        parts.append(f"{entry['title']}{at}{when}")
+    return "; ".join(parts)
@@ -0,0 +1,24 @@
+import os
+import address_classifier
+from address_classifier import ARTIFACT_PATH, candidate_spans, load_classifier
+
+
+def test_artifact_path_does_not_depend_on_the_working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert os.path.isabs(ARTIFACT_PATH)
+    assert os.path.dirname(ARTIFACT_PATH) == os.path.dirname(os.path.abspath(address_classifier.__file__))
+
+def test_missing_artifact_is_trained_and_saved_once(tmp_path, monkeypatch):
+    make_training_data = address_classifier.make_training_data
+    monkeypatch.setattr(address_classifier, "make_training_data", lambda size: make_training_data(2000))
+    monkeypatch.setattr(address_classifier, "_classifier", None)
+    path = str(tmp_path / "address_model.joblib")
+    classifier = load_classifier(path)
+    assert os.path.exists(path)
+    assert load_classifier(path) is classifier
+    assert classifier.has_full_address(["Jane Doe\nHouse 12, Road 5, Dhaka, Bangladesh", "Jane Doe\nDhaka"]) == [
+        True, False]
+
+def test_candidate_spans():
+    text = "Address: House 12, Road 5, Dhaka\njane@example.com, 2020\nMain Street\nhttps://x.com/a, 1"
+    assert candidate_spans(text) == ["House 12, Road 5, Dhaka"]
@@ -0,0 +1,69 @@
+import json
+from candidate_store import CandidateStore, candidate_row, import_jsonl, phone_key
+
+
+def test_phone_key_matches_on_last_digits():
+    assert phone_key("+880 1712-345678") == phone_key("01712345678") == "1712345678"
+    assert phone_key("(555) 123-4567") == "5551234567"
+    assert phone_key("") is None and phone_key(None) is None and phone_key("n/a") is None
+
+def test_candidate_row_regex_result():
+    record = {
+        "File Name": "a.docx", "Name": "Jane Doe", "Email": "Jane@Example.com", "Phones": ["+880 1712345678"],
+        "Summary": "Backend developer", "Experience": "Not Available", "Skills": "python, sql",
+        "GitHub": {"https://github.com/jane": "Valid"}, "LinkedIn": {"Not Available": ""},
+    }
+    columns, phones, links = candidate_row(record)
+    assert columns == {"name": "Jane Doe", "email": "jane@example.com", "address": None,
+                       "summary": "Backend developer", "experience": None, "skills": "python, sql"}
+    assert phones == {"1712345678"}
+    assert links == [("github", "https://github.com/jane", "Valid")]
+
+def test_candidate_row_structured_result():
+    record = {
+        "File Name": "b.pdf",
+        "Fields": {"name": "Ann Lee", "email": "", "phones": ["017-1234-5678", ""], "address": "Dhaka",
+                   "links": ["https://github.com/ann", "https://example.com/ann"],
+                   "experience": [{"title": "Dev", "company": "Acme"}, {"title": "Intern", "company": ""}],
+                   "skills": ["go", "rust"]},
+        "GitHub": {"https://github.com/ann": "Valid"},
+    }
+    columns, phones, links = candidate_row(record)
+    assert columns["name"] == "Ann Lee" and columns["email"] is None and columns["address"] == "Dhaka"
+    assert columns["experience"] == "Dev Acme; Intern"
+    assert columns["skills"] == "go, rust"
+    assert phones == {"1712345678"}
+    # A link already found as GitHub is not repeated as "other"
+    assert links == [("github", "https://github.com/ann", "Valid"), ("other", "https://example.com/ann", None)]
+
+def test_upsert_and_search(tmp_path):
+    store = CandidateStore(str(tmp_path / "c.sqlite"))
+    store.upsert_many([
+        ("/r/a.docx", {"File Name": "a.docx", "Name": "Jane Doe", "Email": "jane@example.com",
+                       "Phones": ["+880 1712345678"], "Summary": "python developer",
+                       "GitHub": {"https://github.com/jane": "Valid"}}),
+        ("/r/b.docx", {"File Name": "b.docx", "Name": "John Roe", "Summary": "java developer"}),
+    ])
+    assert [c["file"] for c in store.search("developer")] == ["/r/a.docx", "/r/b.docx"]
+    assert [c["file"] for c in store.search("python", github=True)] == ["/r/a.docx"]
+    assert [c["file"] for c in store.search(phone="01712345678")] == ["/r/a.docx"]
+    assert [c["file"] for c in store.search(email="JANE@example.com")] == ["/r/a.docx"]
+
+    # Re-upserting a key updates the row and its full-text entry in place
+    store.upsert_many([("/r/a.docx", {"File Name": "a.docx", "Name": "Jane Doe", "Summary": "rust developer"})])
+    assert store.stats()["candidates"] == 2
+    assert store.search("python") == []
+    assert store.search(phone="01712345678") == []
+    store.close()
+
+def test_import_jsonl_updates_live_rows(tmp_path):
+    store = CandidateStore(str(tmp_path / "c.sqlite"))
+    store.upsert_many([("/r/sub/a.docx", {"File Name": "a.docx", "Summary": "old"}),
+                       ("/r/sub/b.docx", {"File Name": "b.docx", "Summary": "old"})])
+    with open(tmp_path / "out.jsonl", "w", encoding="utf-8") as file:
+        file.write(json.dumps({"File Name": "a.docx", "Summary": "new", "Source Path": "/r/sub/a.docx"}) + "\n")
+        file.write(json.dumps({"File Name": "b.docx", "Summary": "new"}) + "\n")  # Written before Source Path existed
+    assert import_jsonl(store, [str(tmp_path / "out.jsonl")]) == 2
+    assert store.stats()["candidates"] == 2
+    assert store.get("/r/sub/a.docx")["Summary"] == store.get("/r/sub/b.docx")["Summary"] == "new"
+    store.close()
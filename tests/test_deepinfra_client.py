@@ -0,0 +1,94 @@
+import time
+import asyncio
+import pytest
+from aiohttp import web
+import deepinfra_client
+from deepinfra_client import DeepInfraClient
+
+
+def reply(text="ok"):
+    return web.json_response({"choices": [{"message": {"content": text}}],
+                              "usage": {"prompt_tokens": 3, "completion_tokens": 1}})
+
+# Function to serve `handler` as the chat-completions endpoint and run `client_calls` against it
+def run_against(handler, client_calls, **client_options):
+    async def run():
+        app = web.Application()
+        app.router.add_post("/v1/openai/chat/completions", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            options = {"requests_per_second": None, **client_options}
+            async with DeepInfraClient("key", "model", base_url=f"http://127.0.0.1:{port}/v1/openai",
+                                       **options) as client:
+                return client, await client_calls(client)
+        finally:
+            await runner.cleanup()
+    return asyncio.run(run())
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(deepinfra_client, "backoff_delay", lambda attempt: 0.0)
+
+
+def test_429_retry_after_pauses_the_bucket():
+    calls = []
+    async def handler(request):
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            return web.Response(status=429, headers={"Retry-After": "0.3"})
+        return reply("hello")
+
+    client, result = run_against(handler, lambda client: client.complete("hi"))
+    assert result == "hello"
+    assert len(calls) == 2 and calls[1] - calls[0] >= 0.3
+    assert client.bucket.paused_until >= calls[0] + 0.3
+    assert (client.prompt_tokens, client.completion_tokens) == (3, 1)
+
+def test_5xx_is_retried_up_to_the_limit():
+    calls = []
+    async def handler(request):
+        calls.append(request)
+        return web.Response(status=503)
+
+    client, result = run_against(handler, lambda client: client.complete("hi"), max_retries=2)
+    assert result is None
+    assert len(calls) == 3
+
+def test_5xx_then_success():
+    statuses = [500, 502]
+    async def handler(request):
+        return web.Response(status=statuses.pop(0)) if statuses else reply("done")
+
+    client, result = run_against(handler, lambda client: client.complete("hi"), max_retries=2)
+    assert result == "done" and statuses == []
+
+@pytest.mark.parametrize("body", ['{"choices": []}', '{"choices": [{"message": {}}]}', "not json"])
+def test_malformed_200_is_a_failure_and_not_retried(body):
+    calls = []
+    async def handler(request):
+        calls.append(request)
+        return web.Response(status=200, text=body, content_type="application/json")
+
+    client, result = run_against(handler, lambda client: client.complete("hi"))
+    assert result is None
+    assert len(calls) == 1
+    assert client.prompt_tokens == 0
+
+def test_in_flight_cap():
+    active, peak = 0, 0
+    async def handler(request):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.05)
+        active -= 1
+        return reply((await request.json())["messages"][0]["content"])
+
+    contents = [f"message {index}" for index in range(10)]
+    client, results = run_against(handler, lambda client: client.complete_many(contents), max_in_flight=3)
+    assert results == contents
+    assert peak == 3
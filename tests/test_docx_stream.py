@@ -0,0 +1,95 @@
+import io
+import zlib
+import struct
+import pytest
+import docx
+from docx.enum.section import WD_SECTION
+from docx.enum.text import WD_BREAK
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+import docx_stream
+import resume_loader
+from resume_loader import load_document
+
+
+# python-docx reference: body paragraphs and table cells in order, each section's own header and footer
+def reference_paragraphs(parent):
+    for child in parent.iterchildren():
+        if child.tag.endswith("}p"):
+            yield Paragraph(child, None).text
+        elif child.tag.endswith("}tbl"):
+            for row in Table(child, None).rows:
+                for cell in row.cells:
+                    yield from reference_paragraphs(cell._tc)
+
+def reference_read(path):
+    document = docx.Document(path)
+    headers, footers = [], []
+    for section in document.sections:
+        if not section.header.is_linked_to_previous:
+            headers.extend(reference_paragraphs(section.header._element))
+        if not section.footer.is_linked_to_previous:
+            footers.extend(reference_paragraphs(section.footer._element))
+    return headers + list(reference_paragraphs(document.element.body)) + footers
+
+def png(width=2, height=2):
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    rows = b"".join(b"\x00" + b"\xff\x00\x00" * width for _ in range(height))
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b""))
+
+@pytest.fixture
+def resume_docx(tmp_path):
+    document = docx.Document()
+    first = document.sections[0]
+    first.header.paragraphs[0].text = "Curriculum Vitae"
+    first.footer.paragraphs[0].text = "Page footer"
+    document.add_paragraph("Jane Doe")
+    document.add_picture(io.BytesIO(png()))
+    run = document.add_paragraph().add_run("Phone:\t+880 1712345678")
+    run.add_break()
+    run.add_text("Dhaka, Bangladesh")
+    run.add_break(WD_BREAK.PAGE)
+
+    table = document.add_table(rows=1, cols=2)
+    table.cell(0, 0).text = "Skills"
+    inner = table.cell(0, 1).add_table(rows=1, cols=1)
+    inner.cell(0, 0).text = "Python, SQL"
+    document.add_paragraph("Experience")
+
+    second = document.add_section(WD_SECTION.NEW_PAGE)
+    second.header.is_linked_to_previous = False
+    second.header.paragraphs[0].text = "Second section header"
+    document.add_paragraph("Engineer at Acme")
+
+    path = tmp_path / "resume.docx"
+    document.save(path)
+    return str(path)
+
+
+def test_matches_python_docx(resume_docx):
+    paragraphs = docx_stream.read_paragraphs(resume_docx)
+    assert paragraphs == reference_read(resume_docx)
+    assert paragraphs[:2] == ["Curriculum Vitae", "Second section header"]
+    assert "Phone:\t+880 1712345678\nDhaka, Bangladesh" in paragraphs
+    assert "Python, SQL" in paragraphs
+    assert paragraphs[-1] == "Page footer"
+
+def test_body_only_matches_document_paragraphs(resume_docx):
+    body = list(docx_stream.iter_paragraphs(resume_docx, tables=False))
+    assert body == [paragraph.text for paragraph in docx.Document(resume_docx).paragraphs]
+    assert "Curriculum Vitae" not in body and "Python, SQL" not in body
+
+def test_counts_images_from_relationships(resume_docx):
+    assert docx_stream.count_images(resume_docx) == 1
+
+def test_loader_text_and_body_text(resume_docx, monkeypatch):
+    monkeypatch.setattr(resume_loader, "PARSE_CACHE", False)
+    document = load_document(resume_docx)
+    # Every extractor but Extract_information reads headers, tables and footers too
+    assert document.text == "\n".join(reference_read(resume_docx))
+    assert document.body_paragraphs == [p.text for p in docx.Document(resume_docx).paragraphs]
+    assert document.body_text == "\n".join(document.body_paragraphs)
+    assert "Curriculum Vitae" not in document.body_sections.get("Header")
+    assert document.image_count == 1
@@ -0,0 +1,75 @@
+import os
+import csv
+import json
+import threading
+import pytest
+import LLMA_Prompt_Extract as pipeline
+import ingest_watcher
+from ingest_watcher import IngestDaemon, Manifest, MANIFEST_NAME
+
+LINKS = {"GitHub": {"https://github.com/jane": "Valid"}, "LinkedIn": {"Not Available": ""}}
+FIELDS = {"name": "Jane Doe", "email": "jane@example.com", "phones": [], "address": "", "links": [],
+          "experience": [], "skills": ["python"]}
+
+
+# Stands in for the model pipeline; runs in the forked pool workers
+def fake_process_resume(file_path):
+    name = file_path.rsplit("/", 1)[-1]
+    if pipeline.EXTRACTION_MODE == "structured":
+        return {"File Name": name, "Fields": FIELDS, **LINKS}
+    return {"File Name": name, "Summary": "Python developer", **LINKS}
+
+# Fails a file's first attempt only; the marker survives the forked worker
+def flaky_process_resume(file_path):
+    marker = file_path + ".failed-once"
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        raise RuntimeError("model API unavailable")
+    return fake_process_resume(file_path)
+
+def run_daemon(drop, output, seconds=3.0):
+    daemon = IngestDaemon(str(drop), str(output), workers=1, threads_per_worker=1, use_events=False,
+                          poll_interval=0.2)
+    threading.Timer(seconds, daemon.stop).start()
+    daemon.run()
+
+@pytest.fixture
+def folders(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline, "process_resume", fake_process_resume)
+    monkeypatch.setattr(pipeline, "WRITE_STORE", False)
+    monkeypatch.setattr(ingest_watcher, "SETTLE_SECONDS", 0.1)
+    drop, output = tmp_path / "drop", tmp_path / "out"
+    drop.mkdir()
+    output.mkdir()
+    for index in range(3):
+        (drop / f"resume{index}.txt").write_text(f"Resume {index}\n", encoding="utf-8")
+    return drop, output
+
+
+def test_summary_mode_outputs(folders):
+    drop, output = folders
+    run_daemon(drop, output)
+    with open(output / "ingested_links.csv", newline="", encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert sorted(row["File Name"] for row in rows) == ["resume0.txt", "resume1.txt", "resume2.txt"]
+    assert Manifest(str(output / MANIFEST_NAME)).counts() == {"done": 3}
+
+def test_structured_mode_outputs(folders, monkeypatch):
+    drop, output = folders
+    monkeypatch.setattr(pipeline, "EXTRACTION_MODE", "structured")
+    run_daemon(drop, output)
+    with open(output / "ingested_fields.csv", newline="", encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert [row["Name"] for row in rows] == ["Jane Doe"] * 3
+    lines = (output / "ingested_fields.jsonl").read_text(encoding="utf-8").splitlines()
+    assert {json.loads(line)["Fields"]["email"] for line in lines} == {"jane@example.com"}
+
+def test_failed_files_are_retried_with_backoff(folders, monkeypatch):
+    drop, output = folders
+    monkeypatch.setattr(pipeline, "process_resume", flaky_process_resume)
+    monkeypatch.setattr(ingest_watcher, "RETRY_SECONDS", 0.5)
+    run_daemon(drop, output)
+    with open(output / "ingested_links.csv", newline="", encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert sorted(row["File Name"] for row in rows) == ["resume0.txt", "resume1.txt", "resume2.txt"]
+    assert Manifest(str(output / MANIFEST_NAME)).counts() == {"done": 3}
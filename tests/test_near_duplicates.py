@@ -0,0 +1,86 @@
+import random
+import numpy as np
+from near_duplicates import (NearDuplicateIndex, NUM_PERM, SIMILARITY_THRESHOLD, band_keys, minhash, shingles,
+                             similarity)
+
+VOCABULARY = [f"word{index}" for index in range(2000)]
+
+
+def make_text(seed, words=400):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(VOCABULARY) for _ in range(words))
+
+# Function to change `fraction` of the words, spread evenly through the text
+def edit(text, fraction, seed=0):
+    rng = random.Random(seed)
+    words = text.split()
+    step = max(1, round(1 / fraction))
+    for index in range(0, len(words), step):
+        words[index] = rng.choice(VOCABULARY)
+    return " ".join(words)
+
+def jaccard(a, b):
+    a, b = shingles(a), shingles(b)
+    return len(a & b) / len(a | b)
+
+
+def test_signature_is_stable_and_case_insensitive():
+    text = make_text(1)
+    signature = minhash(text)
+    assert signature.shape == (NUM_PERM,) and signature.dtype == np.uint32
+    assert np.array_equal(signature, minhash(text.upper()))
+    assert band_keys(signature) == band_keys(minhash(text))
+
+def test_no_words_has_no_signature():
+    assert minhash("") is None
+    assert minhash(" -- , ") is None
+
+def test_similarity_estimates_jaccard():
+    original = make_text(2)
+    for fraction in (0.01, 0.05, 0.2):
+        edited = edit(original, fraction)
+        estimate = similarity(minhash(original), minhash(edited))
+        assert abs(estimate - jaccard(original, edited)) < 0.15
+
+def test_index_clusters_near_duplicates_only(tmp_path):
+    index = NearDuplicateIndex(str(tmp_path / "index.sqlite"))
+    original = make_text(3)
+    canonical, path, score = index.add("h-original", "/r/original.docx", minhash(original))
+    assert (canonical, score) == ("h-original", 1.0)
+
+    # One word in a hundred changed: well above the threshold
+    near = edit(original, 0.01)
+    assert jaccard(original, near) > SIMILARITY_THRESHOLD
+    canonical, path, score = index.add("h-near", "/r/near.docx", minhash(near))
+    assert canonical == "h-original" and path == "/r/original.docx" and score >= SIMILARITY_THRESHOLD
+
+    # A third of the words changed: well below the threshold
+    far = edit(original, 0.3)
+    assert jaccard(original, far) < 0.5
+    assert index.add("h-far", "/r/far.docx", minhash(far))[0] == "h-far"
+    assert index.add("h-other", "/r/other.docx", minhash(make_text(4)))[0] == "h-other"
+
+    stats = index.stats()
+    assert stats == {"documents": 4, "clusters": 3, "duplicates": 1, "cluster_sizes": {1: 2, 2: 1}}
+    index.close()
+
+def test_add_is_idempotent_per_content(tmp_path):
+    index = NearDuplicateIndex(str(tmp_path / "index.sqlite"))
+    signature = minhash(make_text(5))
+    first = index.add("h", "/r/a.docx", signature)
+    assert index.add("h", "/r/copy-of-a.docx", signature) == first
+    assert index.stats()["documents"] == 1
+    index.close()
+
+def test_threshold_is_configurable(tmp_path):
+    original = make_text(6)
+    edited = edit(original, 0.01)
+    score = similarity(minhash(original), minhash(edited))
+    strict = NearDuplicateIndex(str(tmp_path / "strict.sqlite"), threshold=min(1.0, score + 0.05))
+    strict.add("h-original", "/r/a.docx", minhash(original))
+    assert strict.find(minhash(edited)) is None
+    loose = NearDuplicateIndex(str(tmp_path / "loose.sqlite"), threshold=score - 0.05)
+    loose.add("h-original", "/r/a.docx", minhash(original))
+    assert loose.find(minhash(edited))[0] == "h-original"
+    strict.close()
+    loose.close()
@@ -0,0 +1,67 @@
+import asyncio
+import threading
+import pytest
+import metrics
+import docx_stream
+import result_cache
+import resume_loader
+from resume_loader import load_document
+
+
+@pytest.fixture
+def cache_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.sqlite")
+    monkeypatch.setattr(result_cache, "DEFAULT_CACHE_PATH", path)
+    monkeypatch.setattr(result_cache, "_local", threading.local())
+    monkeypatch.setattr(resume_loader, "PARSE_CACHE", True)
+    return path
+
+@pytest.fixture
+def resume_txt(tmp_path):
+    path = tmp_path / "resume.txt"
+    path.write_text("Jane Doe\nPython developer\n", encoding="utf-8")
+    return str(path)
+
+
+def test_cached_result_computes_once(cache_path, resume_txt):
+    calls = []
+    def compute(path):
+        calls.append(path)
+        return {"File Name": "resume.txt"}
+    assert result_cache.cached_result(resume_txt, compute, "model-a") == {"File Name": "resume.txt"}
+    assert result_cache.cached_result(resume_txt, compute, "model-a") == {"File Name": "resume.txt"}
+    result_cache.cached_result(resume_txt, compute, "model-b")
+    assert calls == [resume_txt, resume_txt]
+
+def test_parse_cache_returns_the_same_paragraphs(cache_path, tmp_path, monkeypatch):
+    import docx
+    document = docx.Document()
+    document.add_paragraph("Jane Doe")
+    path = str(tmp_path / "resume.docx")
+    document.save(path)
+    first = load_document(path).paragraphs
+    monkeypatch.setattr(docx_stream, "read_paragraphs", lambda path: pytest.fail("parsed twice"))
+    assert load_document(path).paragraphs == first == ["Jane Doe"]
+
+# The API scripts look results up on the event loop and parse in asyncio.to_thread
+def test_parse_cache_from_worker_threads(cache_path, resume_txt, tmp_path):
+    paths = []
+    for index in range(4):
+        path = tmp_path / f"copy{index}.txt"
+        path.write_text(f"Resume {index}\n", encoding="utf-8")
+        paths.append(str(path))
+
+    async def run():
+        result_cache.lookup(resume_txt, "script")  # Opens the loop thread's connection first
+        documents = [load_document(path) for path in paths]
+        return await asyncio.gather(*(asyncio.to_thread(lambda d=d: d._cached_parse("lines", d.text.splitlines))
+                                      for d in documents))
+
+    assert asyncio.run(run()) == [[f"Resume {index}"] for index in range(4)]
+
+def test_parse_lookups_have_their_own_label(cache_path, resume_txt, monkeypatch):
+    counted = []
+    monkeypatch.setattr(metrics, "count", lambda name, value=1, **labels: counted.append((name, labels)))
+    result_cache.lookup(resume_txt, "script")
+    load_document(resume_txt)._cached_parse("lines", lambda: ["x"])
+    assert [labels["cache"] for name, labels in counted if name == "cache_lookups"] == ["result", "parse"]
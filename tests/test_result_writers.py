@@ -0,0 +1,74 @@
+import json
+import pytest
+from result_writers import CsvWriter, JsonLinesWriter, TextWriter, FileWriter, ResultSink, SOURCE_PATH_FIELD
+
+FIELDS = ["File Name", "Summary"]
+
+
+def make_sink(tmp_path, fields=FIELDS, **kwargs):
+    writers = [CsvWriter(str(tmp_path / "out.csv"), fields),
+               TextWriter(str(tmp_path / "out.txt"), lambda r: r["File Name"] + "\n")]
+    return ResultSink(writers, str(tmp_path / ".out.progress"), **kwargs)
+
+def record(name):
+    return {"File Name": name, "Summary": f"summary of {name}"}
+
+# Simulates a crash: uncommitted writes reach the files, but close() never runs
+def crash(sink):
+    for writer in sink.writers:
+        writer.file.flush()
+        writer.close()
+    sink.keys_file.close()
+
+
+def test_file_writer_is_abstract(tmp_path):
+    with pytest.raises(TypeError):
+        FileWriter(str(tmp_path / "x"))
+
+def test_clean_close_removes_checkpoint(tmp_path):
+    with make_sink(tmp_path) as sink:
+        sink.write("/a", record("a"))
+    assert not (tmp_path / ".out.progress").exists()
+    assert (tmp_path / "out.csv").read_text().splitlines() == ["File Name,Summary", "a,summary of a"]
+
+def test_resume_truncates_uncommitted_rows(tmp_path):
+    sink = make_sink(tmp_path, flush_every=1000, flush_interval=1000)
+    sink.write("/a", record("a"))
+    sink.write("/b", record("b"))
+    sink.commit()
+    sink.write("/c", record("c"))  # Written but never committed
+    crash(sink)
+    assert "c,summary of c" in (tmp_path / "out.csv").read_text()
+
+    with make_sink(tmp_path) as resumed:
+        assert resumed.is_committed("/a") and resumed.is_committed("/b")
+        assert not resumed.is_committed("/c")
+        resumed.write("/c", record("c"))
+    assert (tmp_path / "out.csv").read_text().splitlines() == [
+        "File Name,Summary", "a,summary of a", "b,summary of b", "c,summary of c"]
+    assert (tmp_path / "out.txt").read_text() == "a\nb\nc\n"
+
+def test_crash_before_first_commit_starts_over(tmp_path):
+    sink = make_sink(tmp_path, flush_every=1000, flush_interval=1000)
+    sink.write("/a", record("a"))
+    crash(sink)
+    with make_sink(tmp_path) as resumed:
+        assert not resumed.is_committed("/a")
+    assert (tmp_path / "out.csv").read_text().splitlines() == ["File Name,Summary"]
+
+def test_refuses_checkpoint_from_other_outputs(tmp_path):
+    sink = make_sink(tmp_path)
+    sink.write("/a", record("a"))
+    sink.commit()
+    crash(sink)
+    before = (tmp_path / "out.csv").read_bytes()
+    with pytest.raises(ValueError):
+        make_sink(tmp_path, fields=["File Name", "GitHub"])
+    # Nothing was truncated or rewritten
+    assert (tmp_path / "out.csv").read_bytes() == before
+
+def test_json_lines_keep_the_sink_key(tmp_path):
+    with ResultSink([JsonLinesWriter(str(tmp_path / "out.jsonl"))], str(tmp_path / ".p")) as sink:
+        sink.write("/resumes/sub/a.docx", record("a.docx"))
+    line = json.loads((tmp_path / "out.jsonl").read_text())
+    assert line[SOURCE_PATH_FIELD] == "/resumes/sub/a.docx"
@@ -0,0 +1,60 @@
+from resume_sections import HEADER, index_sections, match_heading
+
+RESUME = """Jane Doe
+jane@example.com
+
+Professional Summary
+Backend developer.
+
+WORK EXPERIENCE:
+Engineer, Acme (2019 - 2024)
+Built the billing API.
+
+Education
+BSc, Dhaka University
+
+Experience
+Intern, Initech (2018)
+"""
+
+
+def test_match_heading_aliases_case_and_colon():
+    assert match_heading("WORK EXPERIENCE")[0] == "Experience"
+    assert match_heading("## Skills")[0] == "Skills"
+    assert match_heading("Profile: backend developer") == ("Summary", len("Profile") + 1)
+    assert match_heading("Experienced engineer who led three teams")[0] is None
+
+def test_header_is_text_before_first_heading():
+    sections = index_sections(RESUME)
+    assert sections.names()[0] == HEADER
+    assert sections.get(HEADER) == "Jane Doe\njane@example.com"
+
+def test_sections_end_at_next_heading():
+    sections = index_sections(RESUME)
+    assert sections.get("Summary") == "Backend developer."
+    assert sections.get("Education") == "BSc, Dhaka University"
+
+def test_repeated_heading_adds_a_span():
+    sections = index_sections(RESUME)
+    assert len(sections.spans["Experience"]) == 2
+    assert sections.get("Experience") == ("Engineer, Acme (2019 - 2024)\nBuilt the billing API.\n\n"
+                                          "Intern, Initech (2018)")
+
+def test_heading_offsets_point_into_text():
+    sections = index_sections(RESUME)
+    for spans in sections.spans.values():
+        for start, body, end in spans:
+            assert 0 <= start <= body <= end <= len(RESUME)
+    start, _, _ = sections.spans["Education"][0]
+    assert RESUME[start:].startswith("Education")
+
+def test_slice_keeps_headings_in_document_order():
+    sliced = index_sections(RESUME).slice("Education", "Summary")
+    assert sliced.startswith("Professional Summary\nBackend developer.")
+    assert sliced.endswith("Education\nBSc, Dhaka University")
+
+def test_missing_section_and_empty_text():
+    sections = index_sections(RESUME)
+    assert "Skills" not in sections
+    assert sections.get("Skills", None) is None
+    assert index_sections("").names() == []
@@ -0,0 +1,107 @@
+import socket
+import asyncio
+from collections import Counter, defaultdict
+from urllib.parse import urlsplit
+from aiohttp import web
+from url_validator import UrlValidator, UNKNOWN
+
+
+# Fake github.com / linkedin.com: /<host>/<path> answers 200 unless the path starts with "missing"
+class FakeProfiles:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.requests = Counter()
+        self.active = defaultdict(int)
+        self.peak = defaultdict(int)
+
+    async def handle(self, request):
+        host, path = request.match_info["host"], request.match_info["path"]
+        self.requests[f"{host}/{path}"] += 1
+        self.active[host] += 1
+        self.peak[host] = max(self.peak[host], self.active[host])
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active[host] -= 1
+        return web.Response(status=404 if path.startswith("missing") else 200)
+
+# Function to run `calls(port)` while the fake server listens on an ephemeral port
+def run_with_server(fake, calls):
+    async def run():
+        app = web.Application()
+        app.router.add_route("HEAD", "/{host}/{path:.*}", fake.handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        try:
+            return await calls(site._server.sockets[0].getsockname()[1])
+        finally:
+            await runner.cleanup()
+    return asyncio.run(run())
+
+def local_rewrite(port):
+    def rewrite(url):
+        parts = urlsplit(url)
+        return f"http://127.0.0.1:{port}/{parts.netloc}{parts.path}"
+    return rewrite
+
+
+def test_statuses_and_concurrent_duplicates_fetched_once():
+    fake = FakeProfiles(delay=0.05)
+    urls = ["https://github.com/jane", "https://github.com/missing-user", "", "https://github.com/jane"] * 5
+
+    async def calls(port):
+        return await UrlValidator(rewrite=local_rewrite(port)).validate_many(urls)
+
+    results = run_with_server(fake, calls)
+    assert results == {"https://github.com/jane": "Valid", "https://github.com/missing-user": "Invalid",
+                       "": "No URL provided"}
+    assert fake.requests == {"github.com/jane": 1, "github.com/missing-user": 1}
+
+def test_per_host_cap():
+    fake = FakeProfiles(delay=0.05)
+    urls = [f"https://{host}/user{index}" for host in ("github.com", "linkedin.com") for index in range(10)]
+
+    async def calls(port):
+        return await UrlValidator(per_host=2, rewrite=local_rewrite(port)).validate_many(urls)
+
+    results = run_with_server(fake, calls)
+    assert set(results.values()) == {"Valid"}
+    assert dict(fake.peak) == {"github.com": 2, "linkedin.com": 2}
+
+def test_ttl_hit_then_expiry():
+    fake = FakeProfiles()
+
+    async def calls(port):
+        validator = UrlValidator(ttl=0.3, rewrite=local_rewrite(port))
+        await validator.validate_many(["https://github.com/jane"])
+        hit = await validator.validate_many(["https://github.com/jane"])
+        requests_after_hit = fake.requests["github.com/jane"]
+        await asyncio.sleep(0.35)
+        assert validator.cached("https://github.com/jane") is None
+        await validator.validate_many(["https://github.com/jane"])
+        return hit, requests_after_hit
+
+    hit, requests_after_hit = run_with_server(fake, calls)
+    assert hit == {"https://github.com/jane": "Valid"}
+    assert requests_after_hit == 1
+    assert fake.requests["github.com/jane"] == 2
+
+def test_network_failures_are_unknown_and_not_cached():
+    # A port nothing listens on refuses the connection; the slow host times out
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        closed_port = sock.getsockname()[1]
+    fake = FakeProfiles(delay=1.0)
+
+    async def calls(port):
+        def rewrite(url):
+            return local_rewrite(closed_port if "refused" in url else port)(url)
+        validator = UrlValidator(timeout=0.2, rewrite=rewrite)
+        results = await validator.validate_many(["https://github.com/refused", "https://github.com/slow"])
+        return validator, results
+
+    validator, results = run_with_server(fake, calls)
+    assert results == {"https://github.com/refused": UNKNOWN, "https://github.com/slow": UNKNOWN}
+    assert validator.cache == {}
@@ -0,0 +1,95 @@
+import time
+import asyncio
+from collections import defaultdict
+from urllib.parse import urlsplit
+import aiohttp
+import metrics
+
+# Validation defaults
+MAX_CONCURRENCY = 32
+PER_HOST_CONCURRENCY = 4
+REQUEST_TIMEOUT = 5
+CACHE_TTL = 24 * 60 * 60  # Seconds a Valid/Invalid result is reused
+UNKNOWN = "Unknown"       # Network error or timeout: says nothing about the profile, so it is never cached
+
+
+class UrlValidator:
+    """Checks many URLs concurrently over one pooled session, with per-host caps and a TTL cache.
+
+    `rewrite` maps a URL to the address actually requested, so a local fake
+    HTTP server can stand in for github.com / linkedin.com during tests.
+    """
+
+    def __init__(self, max_concurrency=MAX_CONCURRENCY, per_host=PER_HOST_CONCURRENCY,
+                 timeout=REQUEST_TIMEOUT, ttl=CACHE_TTL, rewrite=None):
+        self.max_concurrency = max_concurrency
+        self.per_host = per_host
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.ttl = ttl
+        self.rewrite = rewrite or (lambda url: url)
+        self.cache = {}  # url -> (status, expires_at)
+
+    def cached(self, url):
+        entry = self.cache.get(url)
+        if entry and entry[1] > time.monotonic():
+            return entry[0]
+        return None
+
+    async def _check(self, session, host_limits, url):
+        async with host_limits[urlsplit(url).netloc.lower()]:
+            start = time.perf_counter()
+            try:
+                async with session.head(self.rewrite(url), allow_redirects=False) as response:
+                    return "Valid" if response.status == 200 else "Invalid"
+            except (aiohttp.InvalidURL, ValueError):
+                # Not a requestable URL at all
+                return "Invalid"
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                metrics.count("errors", stage="validate_url")
+                return UNKNOWN
+            finally:
+                metrics.observe("stage_seconds", time.perf_counter() - start, stage="validate_url")
+
+    async def validate_many(self, urls):
+        """Returns {url: "Valid" | "Invalid" | "Unknown" | "No URL provided"} for every distinct url."""
+        results = {}
+        pending = []
+        for url in dict.fromkeys(urls):  # Dedupe, keep order
+            if not url:
+                results[url] = "No URL provided"
+            elif self.cached(url) is not None:
+                results[url] = self.cached(url)
+                metrics.count("cache_lookups", cache="url", result="hit")
+            else:
+                pending.append(url)
+                metrics.count("cache_lookups", cache="url", result="miss")
+
+        if pending:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            host_limits = defaultdict(lambda: asyncio.Semaphore(self.per_host))
+            async with aiohttp.ClientSession(connector=connector, timeout=self.timeout) as session:
+                statuses = await asyncio.gather(*(self._check(session, host_limits, url) for url in pending))
+            expires_at = time.monotonic() + self.ttl
+            for url, status in zip(pending, statuses):
+                if status != UNKNOWN:
+                    self.cache[url] = (status, expires_at)
+                results[url] = status
+        return results
+
+    def validate(self, urls):
+        """Synchronous wrapper around validate_many."""
+        with metrics.stage("validate_urls"):
+            return asyncio.run(self.validate_many(urls))
+
+
+# Shared validator so the TTL cache carries over between batches in one process
+_validator = None
+
+def get_validator():
+    global _validator
+    if _validator is None:
+        _validator = UrlValidator()
+    return _validator
+
+def validate_urls(urls):
+    return get_validator().validate(urls)